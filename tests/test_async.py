@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Общий асинхронный поисковик контейнера остается рабочим после выхода из блока async with: пул потоков
+# останавливается только при container.shutdown_resources().
+import asyncio
+
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+from tools.obj.containers import ToolContainer  # noqa: E402
+
+MARKING = "2300-0041"
+
+
+def test_container_async_finder_used_twice():
+    container = ToolContainer()
+
+    async def search():
+        async with container.async_finder() as finder:
+            return await finder.by_marking(marking=MARKING)
+
+    first = asyncio.run(search())
+    second = asyncio.run(search())
+    assert first is not None and second is not None
+    assert first.equals(second)
+    tools = asyncio.run(container.async_lister().by_marking(marking=MARKING))
+    assert tools
+    container.shutdown_resources()
+
+
+def test_shutdown_resources_recreates_async_finder():
+    container = ToolContainer()
+    finder = container.async_finder()
+    container.shutdown_resources()
+    with pytest.raises(RuntimeError):
+        asyncio.run(finder.by_marking(marking=MARKING))
+    assert asyncio.run(container.async_finder().by_marking(marking=MARKING)) is not None
+    container.shutdown_resources()
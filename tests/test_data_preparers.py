@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Проверка подготовки данных: параметры одной записи (to_generate, как в ToolCreator.create) совпадают с параметрами
+# той же записи в таблице параметров (frame_to_params, как в ToolCreator.create_many) по всем записям поставляемой БД.
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from tools.obj.constants import PATH_DB_FOR_TOOLS
+from tools.obj.data_preparers import ToolDataPreparer
+
+
+@pytest.fixture(scope="module")
+def records() -> pd.DataFrame:
+    with sqlite3.connect(PATH_DB_FOR_TOOLS) as connection:
+        return pd.read_sql("SELECT * FROM tools", connection)
+
+
+@pytest.mark.parametrize("type_tool", list(ToolDataPreparer.SCRIPTS))
+def test_row_and_frame_params_match(records, type_tool):
+    group = records[records["Тип_инструмента"] == type_tool]
+    frame = ToolDataPreparer.frame_to_generate(group, type_tool)
+    assert len(frame) == len(group)
+    for position, params in enumerate(frame):
+        raw_data = group.iloc[position].dropna().to_dict()
+        assert ToolDataPreparer(raw_data).to_generate == params
+
+
+def test_missing_values_replaced_by_defaults():
+    raw_data = {"Тип_инструмента": "Сверло", "Обозначение": "2300-0001", "Стандарт": "ГОСТ 10902-77",
+                "D": 5.0, "gamma_": None, "z": float("nan")}
+    params = ToolDataPreparer(raw_data).to_generate
+    assert params["dia_mm"] == 5.0
+    assert params["length_mm"] == 95.0
+    assert params["front_angle_grad"] == 0.0
+    assert params["num_of_cutting_blades"] == 2
+    frame = ToolDataPreparer.frame_to_generate(pd.DataFrame([raw_data]), "Сверло")
+    assert frame == [params]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Кеш созданных инструментов на диске создается заново при изменении версии пакета (в том числе исходных файлов) и
+# контрольной суммы файла БД.
+import shutil
+
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+from tools import __version__  # noqa: E402
+from tools.obj.constants import PATH_DB_FOR_TOOLS  # noqa: E402
+from tools.obj.disk_caches import DiskToolCache, package_version  # noqa: E402
+from tools.obj.entities import DrillingCutter, MillingCutter  # noqa: E402
+
+
+class Builder:
+    """ Функция создания инструментов со счетчиком вызовов. """
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> list:
+        self.calls += 1
+        return [MillingCutter(), None, DrillingCutter()]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tools.db"
+    shutil.copyfile(PATH_DB_FOR_TOOLS, path)
+    return str(path)
+
+
+def test_cache_restores_tools(tmp_path, db_path):
+    build = Builder()
+    built = DiskToolCache(str(tmp_path / "cache"), db_path, version="1").tools(build)
+    cached = DiskToolCache(str(tmp_path / "cache"), db_path, version="1").tools(build)
+    assert build.calls == 1
+    assert [None if tool is None else (type(tool), tool.model_dump(), tool.name) for tool in cached] == \
+        [None if tool is None else (type(tool), tool.model_dump(), tool.name) for tool in built]
+
+
+def test_version_change_rebuilds(tmp_path, db_path):
+    build = Builder()
+    DiskToolCache(str(tmp_path / "cache"), db_path, version="1").tools(build)
+    DiskToolCache(str(tmp_path / "cache"), db_path, version="2").tools(build)
+    assert build.calls == 2
+    assert DiskToolCache(str(tmp_path / "cache"), db_path, version="1").load() is None
+
+
+def test_db_change_rebuilds(tmp_path, db_path):
+    build = Builder()
+    cache = DiskToolCache(str(tmp_path / "cache"), db_path, version="1")
+    cache.tools(build)
+    with open(db_path, "ab") as file:
+        file.write(b"\0")
+    assert cache.load() is None
+    cache.tools(build)
+    assert build.calls == 2
+
+
+def test_package_version_follows_sources(tmp_path):
+    module = tmp_path / "module.py"
+    module.write_text("VALUE = 1\n", encoding="utf-8")
+    before = package_version([str(module)])
+    module.write_text("VALUE = 2\n", encoding="utf-8")
+    after = package_version([str(module)])
+    assert before.startswith(f"{__version__}+") and after.startswith(f"{__version__}+")
+    assert before != after
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Проверка значений полей со словарями допустимых значений (ValueFromDict): каждая строка словаря и каждое число
+# (в том числе соответствующее строке None, например, 0 в ACCURACY_CLASS_STANDARDS) проходят проверку.
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+from service_for_my_projects import InvalidValue  # noqa: E402
+
+from tools.obj import fields_types  # noqa: E402
+from tools.obj.fields_types import ValueFromDict  # noqa: E402
+
+SUBCLASSES = [value for value in vars(fields_types).values()
+              if isinstance(value, type) and issubclass(value, ValueFromDict) and value is not ValueFromDict]
+
+
+def expected_key(cls, value: int):
+    """ Возвращает строку словаря, первой соответствующую числу value (как в исходной проверке). """
+    keys = list(cls.AVAILABLE_VALUES.keys())
+    return keys[list(cls.AVAILABLE_VALUES.values()).index(value)]
+
+
+@pytest.mark.parametrize("cls", SUBCLASSES, ids=lambda cls: cls.__name__)
+def test_keys_and_values_round_trip(cls):
+    for key, value in cls.AVAILABLE_VALUES.items():
+        if isinstance(key, str):
+            assert cls.validate(key) == key
+            assert cls.convert(key) == (True, key)
+        assert cls.validate(value) == expected_key(cls, value)
+        assert cls.convert(value) == (True, expected_key(cls, value))
+
+
+def test_none_key_is_valid():
+    cls = fields_types.InAccuracyClassStandards
+    assert None in cls.AVAILABLE_VALUES
+    assert cls.validate(0) is None
+    assert cls.convert(0) == (True, None)
+
+
+@pytest.mark.parametrize("cls", SUBCLASSES, ids=lambda cls: cls.__name__)
+def test_unknown_values_rejected(cls):
+    assert cls.convert("нет такого значения") == (False, None)
+    assert cls.convert(10 ** 6) == (False, None)
+    assert cls.convert(None) == (False, None)
+    with pytest.raises(InvalidValue):
+        cls.validate("нет такого значения")
+    with pytest.raises(InvalidValue):
+        cls.validate(10 ** 6)
+
+
+def test_model_accepts_none_key_by_value():
+    from tools.obj.entities import MillingCutter
+    assert MillingCutter(accuracy_class=0).accuracy_class is None
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Импорт констант пакета (from tools import GROUPS_TOOL) в новом процессе интерпретатора не загружает тяжелые
+# зависимости и укладывается в бюджет времени (как параметр --import-budget-ms скрипта tools/scr/benchmarks.py).
+import os
+import subprocess
+import sys
+
+# Каталог, из которого импортируется пакет tools
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Зависимости, которые не должны загружаться при импорте констант
+HEAVY_MODULES = ("pandas", "numpy", "pydantic", "dependency_injector", "service_for_my_projects")
+# Бюджет времени импорта констант (мс, лучший из REPEAT запусков)
+IMPORT_BUDGET_MS = 50
+REPEAT = 5
+STATEMENT = "from tools import GROUPS_TOOL"
+
+
+def run_import(statement: str = STATEMENT) -> tuple:
+    """ Выполняет statement в новом процессе интерпретатора. Возвращает время выполнения (мс) и список загруженных
+    тяжелых зависимостей. """
+    code = (f"import sys, time\nstart = time.perf_counter()\n{statement}\n"
+            f"print(time.perf_counter() - start)\n"
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=PACKAGE_ROOT).stdout
+    timing, loaded = output.splitlines()[-2:]
+    return float(timing) * 1000, [name for name in loaded.split(",") if name]
+
+
+def test_constants_import_does_not_load_heavy_modules():
+    _, loaded = run_import()
+    assert loaded == []
+
+
+def test_constants_import_within_budget():
+    best = min(run_import()[0] for _ in range(REPEAT))
+    assert best <= IMPORT_BUDGET_MS, f"Импорт констант: {best:.3f} мс (допустимо {IMPORT_BUDGET_MS} мс)"
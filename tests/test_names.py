@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Наименования инструментов по всем записям БД сравниваются с эталонным файлом data/tool_names.json, сохраненным
+# функцией get_name исходной версии пакета (до перехода на таблицу шаблонов NAME_TEMPLATES).
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+from tools.scr.check_names import compare_names, create_tools, load_golden  # noqa: E402
+from tools.scr.fun import get_name  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def golden():
+    return load_golden()
+
+
+@pytest.fixture(scope="module")
+def created():
+    return create_tools()
+
+
+def test_golden_covers_database(golden, created):
+    indexes, _ = created
+    assert sorted(golden) == sorted(indexes)
+
+
+def test_create_many_names_match_golden(golden, created):
+    indexes, tools = created
+    names = {index: getattr(tool, "name", None) for index, tool in zip(indexes, tools)}
+    differences = compare_names(names, golden)
+    assert not differences, f"Расхождений наименований: {len(differences)}, например: {list(differences.items())[:5]}"
+
+
+def test_get_name_matches_golden(golden, created):
+    indexes, tools = created
+    names = {}
+    for index, tool in zip(indexes, tools):
+        tool = tool.model_copy()
+        tool.name = None
+        get_name(tool)
+        names[index] = tool.name
+    differences = compare_names(names, golden)
+    assert not differences, f"Расхождений наименований: {len(differences)}, например: {list(differences.items())[:5]}"
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Чтение записей частями (iter_records) не удерживает соединения пула между частями: незавершенных генераторов может
+# быть больше, чем соединений пула, и другие запросы при этом выполняются.
+import pandas as pd
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+from tools.obj.constants import PATH_DB_FOR_TOOLS  # noqa: E402
+from tools.obj.containers import ToolContainer  # noqa: E402
+from tools.obj.requesters import ConnectionPool, ToolRecordRequester  # noqa: E402
+
+POOL_SIZE = 2
+
+
+def normalized(records: pd.DataFrame) -> pd.DataFrame:
+    """ Приводит значения таблицы к object с None вместо пропусков (типы столбцов частей зависят от их записей). """
+    records = records.astype(object)
+    return records.where(records.notna(), None)
+
+
+@pytest.fixture
+def pooled():
+    pool = ConnectionPool(PATH_DB_FOR_TOOLS, size=POOL_SIZE, timeout=5)
+    yield ToolRecordRequester(PATH_DB_FOR_TOOLS, pool=pool)
+    pool.close()
+
+
+def test_open_generators_do_not_hold_pool_connections(pooled):
+    generators = [pooled.iter_records({"Тип_инструмента": "Фреза"}, chunksize=10) for _ in range(POOL_SIZE * 2 + 1)]
+    assert [len(next(generator)) for generator in generators] == [10] * len(generators)
+    assert len(pooled.get_records({"Обозначение": "2300-0041"})) > 0
+
+
+def test_iter_records_matches_get_records(pooled):
+    keys = {"Тип_инструмента": "Фреза"}
+    parts = list(pooled.iter_records(keys, chunksize=777))
+    assert all(len(part) == 777 for part in parts[:-1])
+    records = pd.concat(parts, ignore_index=True)
+    expected = pooled.get_records(keys)
+    pd.testing.assert_frame_equal(normalized(records), normalized(expected))
+
+
+def test_pool_timeout_raises(pooled):
+    pool = ConnectionPool(PATH_DB_FOR_TOOLS, size=1, timeout=0.1)
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+    pool.close()
+
+
+def test_lister_generators_beyond_pool_size():
+    container = ToolContainer()
+    container.config.pool.size.from_value(POOL_SIZE)
+    container.config.pool.timeout.from_value(5)
+    lister = container.lister()
+    generators = [lister.iter_by_group(group="Фреза", chunksize=10) for _ in range(POOL_SIZE * 2)]
+    for generator in generators:
+        next(generator)
+    assert lister.by_marking(marking="2300-0041")
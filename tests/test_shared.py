@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Снимок в разделяемой памяти: процесс-загрузчик публикует сегмент (create), процесс, запущенный через multiprocessing
+# (spawn), подключается к нему (attach) и отключается. Подключение не должно отменять регистрацию сегмента владельцем
+# в resource_tracker: владелец удаляет сегмент без ошибок трекера, а при аварийном завершении владельца сегмент
+# удаляет трекер.
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import pytest
+
+pytest.importorskip("service_for_my_projects")
+
+# Каталог, из которого импортируется пакет tools
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OWNER = textwrap.dedent("""
+    import multiprocessing
+    import os
+    import sys
+
+    from tools.obj.constants import PATH_DB_FOR_TOOLS
+    from tools.obj.shared import SharedCatalog
+    from tools.obj.snapshots import ToolSnapshot
+
+
+    def worker(name, queue):
+        catalog = SharedCatalog.attach(name)
+        queue.put(len(catalog.snapshot))
+        catalog._snapshot = None
+        catalog.close()
+
+
+    if __name__ == "__main__":
+        name, crash = sys.argv[1], sys.argv[2] == "crash"
+        snapshot = ToolSnapshot.from_database(PATH_DB_FOR_TOOLS)
+        catalog = SharedCatalog.create(snapshot, name)
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=worker, args=(name, queue))
+        process.start()
+        print(queue.get() == len(snapshot), flush=True)
+        process.join()
+        if crash:
+            os._exit(0)
+        catalog.close()
+        catalog.unlink()
+""")
+
+
+def run_owner(tmp_path, name: str, mode: str) -> subprocess.CompletedProcess:
+    script = tmp_path / "owner.py"
+    script.write_text(OWNER, encoding="utf-8")
+    return subprocess.run([sys.executable, str(script), name, mode], capture_output=True, text=True, timeout=120,
+                          cwd=PACKAGE_ROOT, env={**os.environ, "PYTHONPATH": PACKAGE_ROOT})
+
+
+def segment_exists(name: str) -> bool:
+    try:
+        memory = shared_memory.SharedMemory(name=name, create=False)
+    except FileNotFoundError:
+        return False
+    memory.close()
+    return True
+
+
+def wait_removed(name: str, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while segment_exists(name):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def test_spawned_worker_attach_then_owner_unlink(tmp_path):
+    name = f"tools_test_{uuid.uuid4().hex[:8]}"
+    result = run_owner(tmp_path, name, "unlink")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["True"]
+    assert "KeyError" not in result.stderr
+    assert wait_removed(name)
+
+
+def test_tracker_removes_segment_after_owner_crash(tmp_path):
+    name = f"tools_test_{uuid.uuid4().hex[:8]}"
+    result = run_owner(tmp_path, name, "crash")
+    assert result.stdout.split() == ["True"]
+    assert "KeyError" not in result.stderr
+    assert wait_removed(name)
@@ -1,5 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import importlib
+
+# Версия пакета (совпадает с версией в pyproject.toml и setup.cfg)
+__version__ = "0.2.25"
+
 # Константы пакета
 # from tools.obj.constants import PATH_DB_FOR_TOOLS
 from tools.obj.constants import DEFAULT_SETTINGS_FOR_TOOL
@@ -16,21 +21,45 @@ from tools.obj.constants import TOLERANCE_FIELDS
 from tools.obj.constants import ACCURACY_CLASS_STANDARDS
 from tools.obj.constants import DECODING
 from tools.obj.constants import SAVED_FIELDS
-# Методы пакета
-from tools.scr.fun import get_name
-# Классы пакета
-from tools.obj.entities import Tool, CustomTool
-from tools.obj.containers import ToolContainer
-MillingCutter = ToolContainer.milling_cutter
-DrillingCutter = ToolContainer.drilling_cutter
-CountersinkingCutter = ToolContainer.countersinking_cutter
-DeploymentCutter = ToolContainer.deployment_cutter
-TurningCutter = ToolContainer.turning_cutter
-BroachingCutter = ToolContainer.broaching_cutter
-ToolCreator = ToolContainer.creator
-ToolLister = ToolContainer.lister
-ToolFinder = ToolContainer.finder
+# Методы и классы пакета загружаются при первом обращении (PEP 562): импорт констант не загружает pandas, pydantic,
+# dependency_injector и не настраивает логирование
+_LAZY_ATTRIBUTES = {
+    "get_name": ("tools.scr.fun", "get_name"),
+    "Tool": ("tools.obj.entities", "Tool"),
+    "CustomTool": ("tools.obj.entities", "CustomTool"),
+    "ToolContainer": ("tools.obj.containers", "ToolContainer"),
+}
+# Провайдеры контейнера ToolContainer: {имя в пакете: имя провайдера}
+_CONTAINER_PROVIDERS = {
+    "MillingCutter": "milling_cutter",
+    "DrillingCutter": "drilling_cutter",
+    "CountersinkingCutter": "countersinking_cutter",
+    "DeploymentCutter": "deployment_cutter",
+    "TurningCutter": "turning_cutter",
+    "BroachingCutter": "broaching_cutter",
+    "ToolCreator": "creator",
+    "ToolLister": "lister",
+    "ToolFinder": "finder",
+    "ToolSelector": "selector",
+}
+
+
+def __getattr__(name):
+    if name in _CONTAINER_PROVIDERS:
+        value = getattr(__getattr__("ToolContainer"), _CONTAINER_PROVIDERS[name])
+    elif name in _LAZY_ATTRIBUTES:
+        from tools.logger_settings import setup_logging
+        setup_logging()
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_name), attribute)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 
 __all__ = [
@@ -63,6 +92,7 @@ __all__ = [
     "ToolCreator",
     "ToolLister",
     "ToolFinder",
+    "ToolSelector",
     "Tool",
     "CustomTool",
     ]
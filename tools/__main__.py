@@ -1,17 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
-import logging.config
-
 from service_for_my_projects import timeit, timeit_property
 
 from tools.obj.containers import ToolContainer
-from tools.logger_settings import config
-
-logging.config.dictConfig(config)
+from tools.logger_settings import setup_logging
 
 
 def main():
+    setup_logging()
     container = ToolContainer()
 
     catalog = container.catalog()
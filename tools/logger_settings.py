@@ -1,5 +1,12 @@
+import logging.config
+import os
+import threading
+
 from service_for_my_projects.logger_settings import config
 
+_lock = threading.Lock()
+_configured = False
+
 config['loggers'] = {
     'Finder': {
         'handlers': ['consoleHandler', 'fileHandler'],
@@ -17,3 +24,16 @@ config['loggers'] = {
     }
 }
 
+
+def setup_logging() -> None:
+    """ Настраивает логирование пакета (создает каталог logs/ и применяет config). Выполняется один раз - при первом
+    обращении к классам пакета, а не при импорте. """
+    global _configured
+    if _configured:
+        return
+    with _lock:
+        if _configured:
+            return
+        os.makedirs("logs/", exist_ok=True)
+        logging.config.dictConfig(config)
+        _configured = True
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Any
+
+
+class LRUCache:
+    """ Ограниченный по размеру кеш с вытеснением давно не использованных записей и (опционально) временем жизни
+    записей. Потокобезопасен.
+
+    Parameters:
+        maxsize: int : Максимальное количество записей. 0 - кеширование отключено.
+        ttl: float : Время жизни записи в секундах. None - записи не устаревают.
+        max_rows: int : Наибольшая длина кешируемого значения (строк таблицы, элементов списка), более длинные
+            значения не кешируются. None - не ограничена.
+        timer: Callable[[], float] : Источник текущего времени в секундах.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, max_rows: Optional[int] = None,
+                 timer: Callable[[], float] = time.monotonic) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._maxsize > 0
+
+    def admits(self, value) -> bool:
+        """ Проверяет, что значение value не длиннее max_rows (значения без длины кешируются всегда). """
+        return isinstance(self._max_rows, type(None)) or not hasattr(value, "__len__") or len(value) <= self._max_rows
+
+    def get(self, key) -> tuple:
+        """ Возвращает кортеж (найдено ли значение, значение) по ключу key. """
+        with self._lock:
+            item = self._data.get(key)
+            if not isinstance(item, type(None)):
+                expires, value = item
+                if isinstance(expires, type(None)) or expires > self._timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value) -> None:
+        """ Сохраняет значение value по ключу key, вытесняя при переполнении давно не использованные записи. Значения
+        длиннее max_rows не сохраняются. """
+        if not self.enabled or not self.admits(value):
+            return
+        expires = None if isinstance(self._ttl, type(None)) else self._timer() + self._ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """ Удаляет все записи кеша (например, после изменения БД). Счетчики попаданий и промахов сохраняются. """
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def stats(self) -> dict:
+        """ Возвращает счетчики кеша: попадания, промахи, текущий и максимальный размер, наибольшую длину значения. """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self._maxsize,
+                "max_rows": self._max_rows}
+
+
+def cached(copy: Callable[[Any], Any] = lambda value: value):
+    """ Кеширует результат метода в кеше экземпляра self._cache (LRUCache или None - без кеширования) по имени метода
+    и аргументам вызова. Из кеша возвращается копия результата, полученная функцией copy. Вызовы с нехешируемыми
+    аргументами и результаты длиннее max_rows кеша не кешируются (результат возвращается без копирования)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self._cache
+            if isinstance(cache, type(None)) or not cache.enabled:
+                return func(self, *args, **kwargs)
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                found, value = cache.get(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+            if not found:
+                value = func(self, *args, **kwargs)
+                if not cache.admits(value):
+                    return value
+                cache.put(key, value)
+            return copy(value)
+        return wrapper
+    return decorator
+
+
+def copy_frame(records):
+    """ Возвращает копию таблицы pd.DataFrame (None - без изменений). """
+    return records if isinstance(records, type(None)) else records.copy()
+
+
+def copy_tool(tool):
+    """ Возвращает копию экземпляра инструмента (None и ErrorWithData - без изменений). Поля инструментов - неизменяемые
+    значения, поэтому достаточно поверхностной копии."""
+    return tool.model_copy() if hasattr(tool, "model_copy") else tool
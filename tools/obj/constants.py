@@ -1,10 +1,35 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # -------------------------------------------------------------------------------
+import os.path
 # Расположение БД
-PATH_DB_FOR_TOOLS = f"{__file__}".replace("obj\\constants.py", "data\\tools.db")
+PATH_DB_FOR_TOOLS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "tools.db")
+# Расположение столбцового снимка таблицы инструментов (см. python -m tools.scr.export)
+PATH_SNAPSHOT_FOR_TOOLS = os.path.join(os.path.dirname(PATH_DB_FOR_TOOLS), "tools_snapshot")
+# Каталог кеша созданных инструментов на диске (см. DiskToolCache)
+PATH_CACHE_FOR_TOOLS = os.path.join(os.path.dirname(PATH_DB_FOR_TOOLS), "tools_cache")
 # Тип БД
 REQUESTER_TYPE = "sqlite"
+# Столбцы таблицы БД, используемые при подготовке данных для классов инструментов
+COLUMNS_FOR_PREPARERS = ["index", "Обозначение", "Стандарт", "Тип_инструмента", "D", "d_", "L", "fi_", "gamma_",
+                         "lambda_", "type_cutter_", "type_of_cutting_part_", "z", "r_", "B", "H"]
+# Столбцы таблицы БД полнотекстового поиска (ToolSearchIndex): описательные столбцы, тип, обозначение и стандарт
+COLUMNS_FOR_SEARCH = ["Группа", "Подгруппа", "Исполнение", "Направление", "Тип_хвостовика", "type_cutter_", "Серия",
+                      "Тип_развертки", "Тип_резца", "Группа_резца", "Тип_отверстия", "Тип_инструмента", "Обозначение",
+                      "Стандарт"]
+# Столбцы конусов хвостовика: для записей с заполненным значением в полнотекстовый индекс добавляется описание
+# хвостовика
+COLUMNS_FOR_SHANK = ["Конус_Морзе", "Конус_метрический"]
+# Дополнительные столбцы таблицы БД, используемые только в условиях запросов ToolQuery и при построении
+# полнотекстового индекса (хранятся в снимке таблицы)
+COLUMNS_FOR_QUERIES = list(dict.fromkeys(["mat_", "Точность", *COLUMNS_FOR_SEARCH, *COLUMNS_FOR_SHANK]))
+# Индексы таблицы БД для поиска инструментов: {имя индекса: индексируемые столбцы}
+INDEXES_FOR_TOOLS = {"ix_tools_marking_standard": ("Обозначение", "Стандарт"),
+                     "ix_tools_standard": ("Стандарт", ),
+                     "ix_tools_type_dia": ("Тип_инструмента", "D"),
+                     "ix_tools_dia": ("D", ),
+                     "ix_tools_inner_dia": ("d_", ),
+                     }
 # =====================================================================================================================
 DEFAULT_SETTINGS_FOR_TOOL = {
     "Инструмент": {"marking": '0000-0000', "Стандарт": "ГОСТ ХХХХ-ХХ"},
@@ -88,6 +113,10 @@ TOLERANCE_FIELDS = {0: 'A', 1: 'B', 2: 'C', 3: 'CD', 4: 'D', 5: 'E', 6: 'EF', 7:
 # Классы точности инструмента
 ACCURACY_CLASS_STANDARDS = {None: 0, "AAA": 1, "AA": 2, "A": 3, "B": 4, "C": 5, "D": 6, "ААА": 7, "АА": 8, "А": 9,
                             "В": 10, "С": 11, "Д": 12}
+# Классы точности сверл (столбец 'Точность' таблицы БД) по убыванию точности: {класс: ранг}. Классы записаны
+# латинскими и русскими буквами
+ACCURACY_CLASSES_OF_DRILLS = {"A1": 0, "А1": 0, "A": 1, "А": 1, "Повышенная": 1, "B1": 2, "В1": 2, "B": 3, "В": 3,
+                              "Нормальная": 3}
 # =====================================================================================================================
 # Описание переменных классов
 DECODING = {"type_cutter": "Тип инструмента: {obj}.",
@@ -3,32 +3,144 @@
 # ----------------------------------------------------------------------------------------------------------------------
 from dependency_injector import containers, providers
 
-from service_for_my_projects import Requester, Cataloger
+from service_for_my_projects import Cataloger
 
-from tools.obj import entities, finders, creators, listers, data_preparers
+from tools.obj import entities, finders, creators, listers, data_preparers, requesters, snapshots, caches, \
+    instrumentation, selectors, shared, disk_caches, search
 from tools.obj.constants import DEFAULT_SETTINGS_FOR_TOOL as DS
 from tools.obj.constants import PATH_DB_FOR_TOOLS as DB_PATH
+from tools.obj.constants import PATH_SNAPSHOT_FOR_TOOLS as SNAPSHOT_PATH
 from tools.obj.constants import REQUESTER_TYPE as DB_TYPE
 from tools.obj.constants import TOOLS_CLASSES_BY_TYPE
 
 
 class ToolContainer(containers.DeclarativeContainer):
     default_settings = providers.Object({
-        'tools': {'path': DB_PATH, 'requester_type': DB_TYPE, 'reader_type': 'pandas_table', 'tablename': "tools"},
+        'tools': {'path': DB_PATH, 'requester_type': DB_TYPE, 'reader_type': 'pandas_table', 'tablename': "tools",
+                  'storage': "sql", 'snapshot_path': SNAPSHOT_PATH, 'shared_name': "tools_catalog"},
+        # Кеш результатов поиска и созданных инструментов (по умолчанию отключен): maxsize - количество записей
+        # (0 - отключен, например, 1024), ttl - время жизни записи в секундах (None - не ограничено), max_rows -
+        # наибольшее количество строк кешируемого результата поиска (результаты больше, например, все записи или все
+        # записи типа инструмента, не кешируются)
+        'cache': {'maxsize': 0, 'ttl': None, 'max_rows': 1000},
+        # Проверка параметров создаваемых инструментов
+        'creator': {'validate': False},
+        # Кеш всех инструментов БД на диске (ToolLister.all): path - каталог кеша (None - отключен,
+        # например, constants.PATH_CACHE_FOR_TOOLS)
+        'disk_cache': {'path': None},
+        # Списки инструментов из облегченных неизменяемых записей ToolRecord вместо моделей
+        'lister': {'slim': False},
+        # Подбор инструментов для отверстий: наибольшее отклонение диаметра инструмента от диаметра отверстия (мм)
+        'selector': {'dia_window': 0.5},
+        # Пул потоков (соединений с БД только для чтения) асинхронного поисковика
+        'async_pool': {'workers': 4},
+        # Пул соединений с БД только для чтения: size - количество соединений, mmap_size - объем отображения файла БД
+        # в память (байт), immutable - БД не изменяется во время работы, timeout - время ожидания свободного
+        # соединения в секундах (по истечении - TimeoutError)
+        'pool': {'size': 4, 'mmap_size': 64 * 1024 * 1024, 'immutable': True, 'timeout': 30.0},
+        # Сбор счетчиков и гистограмм длительностей этапов (enabled) и сообщения в лог о результатах поиска и
+        # создания списков инструментов (messages)
+        'instrumentation': {'enabled': False, 'messages': False},
     })
     config = providers.Configuration()
     config.from_dict(default_settings())
 
-    requester_container = providers.Container(
-        Requester,
-        config=config.tools,
+    # Пул соединений общий для всех поисковиков контейнера (и потоков). Статистика: connection_pool().stats
+    connection_pool = providers.Singleton(
+        requesters.ConnectionPool,
+        path=config.tools.path,
+        size=config.pool.size,
+        mmap_size=config.pool.mmap_size,
+        immutable=config.pool.immutable,
+        timeout=config.pool.timeout,
     )
 
+    # Запросы по индексированным столбцам таблицы, выбираются только столбцы, используемые подготовщиками данных
+    sql_requester = providers.Singleton(
+        requesters.ToolRecordRequester,
+        path=config.tools.path,
+        tablename=config.tools.tablename,
+        pool=connection_pool,
+    )
+
+    # Снимок таблицы в памяти: загружается один раз, общий для всех поисковиков (и потоков)
+    snapshot = providers.Singleton(
+        snapshots.ToolSnapshot.from_database,
+        path=config.tools.path,
+        tablename=config.tools.tablename,
+    )
+
+    # Столбцовый снимок, отображаемый в память из каталога config.tools.snapshot_path (выгружается из БД, если
+    # отсутствует или устарел)
+    columnar_snapshot = providers.Singleton(
+        snapshots.ToolSnapshot.from_columnar,
+        path=config.tools.snapshot_path,
+        db_path=config.tools.path,
+        tablename=config.tools.tablename,
+    )
+
+    # Снимок в разделяемой памяти, опубликованный процессом-загрузчиком (SharedCatalog.create) под именем
+    # config.tools.shared_name: процессы подключаются к сегменту без копирования массивов. Отключение:
+    # shared_catalog().close()
+    shared_catalog = providers.Singleton(
+        shared.SharedCatalog.attach,
+        name=config.tools.shared_name,
+    )
+
+    # Источник записей выбирается настройкой config.tools.storage: "sql" (по умолчанию), "snapshot", "columnar" или
+    # "shared"
+    record_requester = providers.Selector(
+        config.tools.storage,
+        sql=sql_requester,
+        snapshot=snapshot,
+        columnar=columnar_snapshot,
+        shared=shared_catalog.provided.snapshot,
+    )
+
+    # Общий для пакета сбор значений INSTRUMENTATION, настраивается по config.instrumentation один раз при
+    # инициализации ресурса: container.instrumentation.init() (или container.init_resources()), повторная настройка
+    # после изменения config - container.instrumentation.shutdown() и init(). Значения: instrumentation().stats(),
+    # instrumentation().to_prometheus()
+    instrumentation = providers.Resource(
+        instrumentation.configure,
+        enabled=config.instrumentation.enabled,
+        messages=config.instrumentation.messages,
+    )
+
+    # Кеши общие для всех поисковиков и создателей контейнера. Сброс после изменения БД: finder_cache().invalidate()
+    finder_cache = providers.Singleton(
+        caches.LRUCache,
+        maxsize=config.cache.maxsize,
+        ttl=config.cache.ttl,
+        max_rows=config.cache.max_rows,
+    )
+
+    tool_cache = providers.Singleton(
+        caches.LRUCache,
+        maxsize=config.cache.maxsize,
+        ttl=config.cache.ttl,
+    )
+
+    # Полнотекстовый индекс в памяти, общий для поисковиков (строится при первом поиске или методом
+    # ToolLister.build_search_index - с наименованиями инструментов)
+    search_index = providers.Singleton(search.ToolSearchIndex)
+
     # В record_requester положил созданный класс запросов, т.к. Finder использует методы record_requester,
     # а не создает класс запросов
     finder = providers.Factory(
         finders.ToolFinder,
-        record_requester=requester_container.requester,
+        record_requester=record_requester,
+        cache=finder_cache,
+        search_index=search_index,
+    )
+
+    # Асинхронный поисковик: запросы выполняются в пуле потоков через соединения пула connection_pool. Один на
+    # контейнер, чтобы одинаковые одновременные запросы объединялись. Пул потоков принадлежит контейнеру: выход из
+    # async with его не останавливает, остановка - container.shutdown_resources()
+    async_finder = providers.Resource(
+        finders.shared_async_finder,
+        finder=finder.provider,
+        workers=config.async_pool.workers,
     )
 
     catalog = providers.Factory(
@@ -46,12 +158,38 @@ class ToolContainer(containers.DeclarativeContainer):
         catalog=catalog,
         preparer_factory=data_preparer.provider,
         finder=finder.provider,
+        cache=tool_cache,
+        validate=config.creator.validate,
+    )
+
+    disk_cache = providers.Singleton(
+        disk_caches.DiskToolCache,
+        path=config.disk_cache.path,
+        db_path=config.tools.path,
     )
 
     lister = providers.Factory(
         listers.ToolLister,
         tool_creator=creator.provider,
         finder=finder.provider,
+        db_path=config.tools.path,
+        tablename=config.tools.tablename,
+        slim=config.lister.slim,
+        disk_cache=disk_cache,
+    )
+
+    selector = providers.Factory(
+        selectors.ToolSelector,
+        tool_creator=creator.provider,
+        finder=finder.provider,
+        dia_window=config.selector.dia_window,
+    )
+
+    async_lister = providers.Factory(
+        listers.AsyncToolLister,
+        tool_creator=creator.provider,
+        finder=async_finder,
+        slim=config.lister.slim,
     )
 
     milling_cutter = providers.Factory(
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
-from typing import Callable
+from typing import Callable, Optional
 import pandas as pd
 from pydantic import ValidationError
 
@@ -9,12 +9,15 @@ from service_for_my_projects import Cataloger
 from service_for_my_projects import logged
 from service_for_my_projects import output_debug_message_for_init_method as debug_for_init
 
+from tools.obj.caches import LRUCache, cached, copy_tool
 from tools.obj.data_preparers import ToolDataPreparer
 from tools.obj.entities import ErrorWithData
 from tools.obj.finders import ToolFinder
 from tools.obj.constants import DEFAULT_SETTINGS_FOR_TOOL
 from tools.obj.fields_types import InGroupsTool
-from tools.scr.fun import get_name
+from tools.obj.instrumentation import INSTRUMENTATION
+from tools.obj.validators import BatchValidator
+from tools.scr.fun import NAME_TEMPLATES, get_name, get_names
 
 
 def output_debug_message():
@@ -22,13 +25,36 @@ def output_debug_message():
     def decorator(func):
         def wrapper(self, *args, **kwargs):
             result = func(self, *args, **kwargs)
-            if not isinstance(result, (ErrorWithData, type(None))) and self._verbose:
+            if not isinstance(result, (ErrorWithData, type(None))) and self._verbose and INSTRUMENTATION.messages:
                 self.debug(f"Создан экземпляр класса {result.__class__.__name__}: {result.name}.")
             return result
         return wrapper
     return decorator
 
 
+def report_error(self, result: ErrorWithData) -> None:
+    """Логирует ошибку создания объекта (экземпляра модели данных) result."""
+    INSTRUMENTATION.count("errors", "construct", result.name)
+    if isinstance(result.err, ValueError):
+        self.error(f"Переданные данные не соответствуют ожидаемой схеме модели {result.name}."
+                   f"Данные, полученные из БД: {result.raw_data}."
+                   f"Данные, загружаемые в модель: {result.params}.")
+    elif isinstance(result.err, TypeError):
+        self.error(f"Данные, загружаемые в модель должны быть словарем. "
+                   f"Полученный тип данных: {type(result.params)}.")
+    elif isinstance(result.err, ValidationError):
+        self.error(f"Входные данные содержат неверные значения для полей модели {result.name}."
+                   f"Данные, полученные из БД: {result.raw_data}."
+                   f"Данные, загружаемые в модель: {result.params}.")
+    elif isinstance(result.err, AttributeError):
+        self.error(f"Входные данные содержат неверные значения для полей модели {result.name}."
+                   f"Данные, полученные из БД: {result.raw_data}."
+                   f"Данные, загружаемые в модель: {result.params}.")
+    else:
+        self.error(f"Ошибка создания экземпляра класса {result.name} с параметрами {result.params}."
+                   f"Данные, полученные из БД: {result.raw_data}.")
+
+
 def output_error_message():
     """Логирует ошибку создания объекта (экземпляра модели данных)."""
     def decorator(func):
@@ -36,24 +62,7 @@ def output_error_message():
             result = func(self, *args, **kwargs)
             if not isinstance(result, ErrorWithData):
                 return result
-            if isinstance(result.err, ValueError):
-                self.error(f"Переданные данные не соответствуют ожидаемой схеме модели {result.name}."
-                           f"Данные, полученные из БД: {result.raw_data}."
-                           f"Данные, загружаемые в модель: {result.params}.")
-            elif isinstance(result.err, TypeError):
-                self.error(f"Данные, загружаемые в модель должны быть словарем. "
-                           f"Полученный тип данных: {type(result.params)}.")
-            elif isinstance(result.err, ValidationError):
-                self.error(f"Входные данные содержат неверные значения для полей модели {result.name}."
-                           f"Данные, полученные из БД: {result.raw_data}."
-                           f"Данные, загружаемые в модель: {result.params}.")
-            elif isinstance(result.err, AttributeError):
-                self.error(f"Входные данные содержат неверные значения для полей модели {result.name}."
-                           f"Данные, полученные из БД: {result.raw_data}."
-                           f"Данные, загружаемые в модель: {result.params}.")
-            else:
-                self.error(f"Ошибка создания экземпляра класса {result.name} с параметрами {result.params}."
-                           f"Данные, полученные из БД: {result.raw_data}.")
+            report_error(self, result)
         return wrapper
     return decorator
 
@@ -65,10 +74,18 @@ class ToolCreator:
     def __init__(self,
                  catalog: Cataloger,
                  preparer_factory: Callable[..., ToolDataPreparer],
-                 finder: Callable[..., ToolFinder]) -> None:
+                 finder: Callable[..., ToolFinder],
+                 cache: Optional[LRUCache] = None,
+                 validate: bool = False) -> None:
         self._catalog = catalog
+        self._cache = cache
+        # Проверять параметры инструментов (по умолчанию инструменты создаются без проверки методом construct)
+        self._validate = validate
+        self._validators = {}
         self._preparer_factory = preparer_factory
         self._finder = finder()
+        # Класс подготовщика данных нужен для подготовки данных по столбцам таблицы (без создания экземпляра)
+        self._preparer_class = getattr(preparer_factory, "cls", ToolDataPreparer)
 
         self._verbose = True
 
@@ -77,17 +94,110 @@ class ToolCreator:
     def create(self, record: pd.Series):
         """ Создает инструмент по переданной записи pd.Series. В случае неудачи, сохранит в ErrorWithData ошибку,
         класс инструмента, данные из БД и обработанные данные."""
+        return self._create(record)
+
+    def _create(self, record: pd.Series):
+        started = INSTRUMENTATION.clock()
         raw_data = record.dropna().to_dict()
         preparer = self._preparer_factory(raw_data)
         params = preparer.to_generate
+        INSTRUMENTATION.record("prepare", "create", started)
+        started = INSTRUMENTATION.clock()
         cutter_class = self._catalog.by_type(type_tool=raw_data["Тип_инструмента"])
         try:
-            tool = cutter_class.construct(**params)
+            tool = cutter_class(**params) if self._validate else cutter_class.construct(**params)
         except Exception as error:
             return ErrorWithData(err=error, name=cutter_class.__name__, params=params, raw_data=raw_data)
+        INSTRUMENTATION.record("construct", "create", started)
+        started = INSTRUMENTATION.clock()
         get_name(tool)
+        INSTRUMENTATION.record("name", "create", started)
+        return tool
+
+    def create_many(self, records: Optional[pd.DataFrame], with_errors: bool = False) -> list:
+        """ Создает инструменты по всем записям таблицы records. Записи группируются по типу инструмента, данные
+        каждой группы подготавливаются операциями над столбцами таблицы, после чего инструменты группы создаются за
+        один проход. Порядок инструментов в списке соответствует порядку записей в таблице. Если подготовить данные
+        группы по столбцам не удалось, инструменты этой группы создаются по одной записи (методом create).
+
+        Parameters:
+            records: pd.DataFrame : Записи БД.
+            with_errors: bool : Возвращать вместо неудачно созданных инструментов ErrorWithData (по умолчанию - None,
+                как create).
+        """
+        if isinstance(records, type(None)) or records.empty:
+            return []
+        records = records.reset_index(drop=True)
+        tools = [None] * len(records)
+        for type_tool, positions in records.groupby("Тип_инструмента", sort=False).indices.items():
+            group = records.iloc[positions]
+            started = INSTRUMENTATION.clock()
+            try:
+                params_frame = self._preparer_class.frame_to_params(group, type_tool)
+            except (ValueError, TypeError):
+                for position, (_, record) in zip(positions, group.iterrows()):
+                    tools[position] = self._create_with_error(record) if with_errors else self.create(record)
+                continue
+            INSTRUMENTATION.record("prepare", "create_many", started, len(positions))
+            started = INSTRUMENTATION.clock()
+            cutter_class = self._catalog.by_type(type_tool=type_tool)
+            if self._validate:
+                checked, params_list = self._validator(cutter_class).validate(params_frame)
+            else:
+                checked, params_list = None, params_frame.to_dict("records")
+            # Наименования инструментов со стандартами из таблицы шаблонов определяются для всей группы сразу
+            unnamed = []
+            for number, (position, params) in enumerate(zip(positions, params_list)):
+                # Непрошедшие быструю проверку параметры проверяются конструктором модели
+                validate = not isinstance(checked, type(None)) and not checked[number]
+                deferred = params.get("standard") in NAME_TEMPLATES
+                tool = self._construct(cutter_class, params, records, position, with_errors, validate, not deferred)
+                if deferred and not isinstance(tool, (ErrorWithData, type(None))):
+                    unnamed.append(tool)
+                tools[position] = tool
+            INSTRUMENTATION.record("construct", "create_many", started, len(positions))
+            started = INSTRUMENTATION.clock()
+            get_names(unnamed)
+            INSTRUMENTATION.record("name", "create_many", started, len(unnamed))
+        if self._verbose and INSTRUMENTATION.messages:
+            self.debug(f"Создано экземпляров классов инструментов: {len(tools)}.")
+        return tools
+
+    def _create_with_error(self, record: pd.Series):
+        """ Создает инструмент по записи record. В случае неудачи логирует ошибку и возвращает ErrorWithData. """
+        result = self._create(record)
+        if isinstance(result, ErrorWithData):
+            report_error(self, result)
+        return result
+
+    def _validator(self, cutter_class) -> BatchValidator:
+        if cutter_class not in self._validators:
+            self._validators[cutter_class] = BatchValidator(cutter_class)
+        return self._validators[cutter_class]
+
+    def _construct(self, cutter_class, params: dict, records: pd.DataFrame, position: int, with_errors: bool = False,
+                   validate: bool = False, named: bool = True):
+        """ Создает инструмент класса cutter_class по подготовленным параметрам params (с проверкой конструктором
+        модели, если validate; с определением наименования, если named). В случае неудачи логирует ошибку (с данными
+        записи records.iloc[position]) и возвращает ErrorWithData (with_errors) или None (как create)."""
+        try:
+            tool = cutter_class(**params) if validate else cutter_class.construct(**params)
+        except Exception as error:
+            result = ErrorWithData(err=error, name=cutter_class.__name__, params=params,
+                                   raw_data=records.iloc[position].dropna().to_dict())
+            report_error(self, result)
+            return result if with_errors else None
+        if named:
+            get_name(tool)
         return tool
 
+    def invalidate(self) -> None:
+        """ Очищает кеш созданных инструментов и кеш поисковика (после изменения БД). """
+        if not isinstance(self._cache, type(None)):
+            self._cache.invalidate()
+        self._finder.invalidate()
+
+    @cached(copy_tool)
     def default(self, group: InGroupsTool = "Фреза"):
         deftool = DEFAULT_SETTINGS_FOR_TOOL[group]
         record = self._finder.by_marking_and_stand(marking=deftool["marking"], standard=deftool["Стандарт"]).iloc[0]
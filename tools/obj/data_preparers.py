@@ -1,75 +1,164 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from collections import namedtuple
 from typing import ClassVar, Optional
+import pandas as pd
+
 from tools.obj.constants import DEFAULT_SETTINGS_FOR_TOOL
 
 
-def select_data_for_milling(raw_data: dict, default_settings: dict) -> dict:
+Column = namedtuple('Column', ['name', 'default', 'convert'])   # параметр из столбца БД (пропуск - default)
+Setting = namedtuple('Setting', ['key', 'convert'])   # параметр из настроек по умолчанию для типа инструмента
+
+
+def _is_true(value) -> bool:
+    return True if value == "True" else False
+
+
+# Параметры классов инструментов: {параметр: Column, Setting или постоянное значение}. Одни и те же таблицы
+# используются для подготовки данных одной записи (select_data_for_*) и таблицы записей (select_frame_for_*)
+# TODO: Переделать выбор типа фрезы для вариантов 'Торцовая, Цилиндрическая',
+#  'Концевая (для T-образных пазов)', 'Концевая (для обработки Т-образного паза)' (параметр type_cutter)
+PARAMS_FOR_MILLING = {
+    "marking": Column('Обозначение', None, None),
+    "standard": Column('Стандарт', None, None),
+    "mat_of_cutting_part": Setting("mat_of_cutting_part", None),
+    "dia_mm": Column('D', 25, float),
+    "length_mm": Column('L', 25, float),
+    "main_angle_grad": Column('fi_', 45, float),
+    "front_angle_grad": Column('gamma_', 0, float),
+    "inclination_of_main_blade_grad": Column('lambda_', 0, float),
+    "tolerance": Setting("tolerance", None),
+    "type_cutter": Column('type_cutter_', None, None),
+    "type_of_cutting_part": Column('type_of_cutting_part_', 1, int),
+    "num_of_cutting_blades": Column('z', 2, int),
+    "radius_of_cutting_vertex": Column('r_', 1.0, float),
+    "large_tooth": Column('large_tooth', 0, None),
+    "quantity": Setting("quantity", int),
+    "accuracy_class": None,
+    "number": None,
+    "module": None,
+}
+
+PARAMS_FOR_DRILLING = {
+    "marking": Column('Обозначение', None, None),
+    "standard": Column('Стандарт', None, None),
+    "mat_of_cutting_part": Setting("mat_of_cutting_part", None),
+    "dia_mm": Column('D', 10, float),
+    "length_mm": Column('L', 95, float),
+    "main_angle_grad": Column('fi_', 60, float),
+    "front_angle_grad": Column('gamma_', 0, float),
+    "inclination_of_main_blade_grad": Column('lambda_', 0, float),
+    "num_of_cutting_blades": Column('z', 2, int),
+    "radius_of_cutting_vertex": Column('r_', 0.2, float),
+    "quantity": Setting("quantity", int),
+    "tolerance": Setting("tolerance", str),
+}
+
+PARAMS_FOR_TURNING = {
+    "marking": Column('Обозначение', None, None),
+    "standard": Column('Стандарт', None, None),
+    "mat_of_cutting_part": Setting("mat_of_cutting_part", None),
+    "length_mm": Column('L', 120, float),
+    "width_mm": Column('B', 16, float),
+    "height_mm": Column('H', 20, float),
+    "main_angle_grad": Column('fi_', 45, float),
+    "front_angle_grad": Column('gamma_', 10, float),
+    "inclination_of_main_blade_grad": Column('lambda_', 0, float),
+    "radius_of_cutting_vertex": Column('r_', 0.2, float),
+    "quantity": Setting("quantity", int),
+    "turret": Setting("turret", int),
+    "load": Setting("load", int),
+    "is_complex_profile": Setting("is_complex_profile", _is_true),
+}
+
+
+def _setting(source: Setting, default_settings: dict):
+    value = default_settings[source.key]
+    return value if isinstance(source.convert, type(None)) else source.convert(value)
+
+
+def _value(raw_data: dict, source: Column):
+    """ Возвращает значение столбца source записи raw_data, в котором пропуск (и отсутствующий столбец) заменен на
+    значение по умолчанию. """
+    value = raw_data.get(source.name)
+    if isinstance(value, type(None)) or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        value = source.default
+    if source.convert is int:
+        return int(float(value))
+    return value if isinstance(source.convert, type(None)) else source.convert(value)
+
+
+def _column(records: pd.DataFrame, name: str, default=None) -> pd.Series:
+    """ Возвращает столбец таблицы records, в котором пропуски (и отсутствующий столбец) заменены на default. """
+    if name not in records:
+        return pd.Series([default] * len(records), index=records.index, dtype=object)
+    column = records[name]
+    return column.astype(object).where(column.notna(), default)
+
+
+def _values(records: pd.DataFrame, source: Column) -> pd.Series:
+    """ Возвращает столбец source таблицы records, преобразованный целиком. """
+    column = _column(records, source.name, source.default)
+    if source.convert is int:
+        return column.astype(float).astype(int)
+    return column if isinstance(source.convert, type(None)) else column.astype(source.convert)
+
+
+def select_data(raw_data: dict, default_settings: dict, params: dict) -> dict:
+    """ Из словаря данных, полученных из БД (сырых), выбирает данные по таблице параметров params. """
     param = dict()
-    # param["group"] = raw_data.get('Тип_инструмента')
-    param["marking"] = raw_data.get('Обозначение')
-    param["standard"] = raw_data.get('Стандарт')
-    param["mat_of_cutting_part"] = default_settings["mat_of_cutting_part"]
-    param["dia_mm"] = float(raw_data.get('D', 25))
-    param["length_mm"] = float(raw_data.get('L', 25))
-    param["main_angle_grad"] = float(raw_data.get('fi_', 45))
-    param["front_angle_grad"] = float(raw_data.get('gamma_', 0))
-    param["inclination_of_main_blade_grad"] = float(raw_data.get('lambda_', 0))
-    param["tolerance"] = default_settings["tolerance"]
-
-    # TODO: Переделать выбор типа фрезы для вариантов 'Торцовая, Цилиндрическая', 
-    #  'Концевая (для T-образных пазов)', 'Концевая (для обработки Т-образного паза)'
-    param["type_cutter"] = raw_data.get('type_cutter_')
-
-    param["type_of_cutting_part"] = int(raw_data.get('type_of_cutting_part_', 1))
-    param["num_of_cutting_blades"] = int(raw_data.get('z', 2))
-    param["radius_of_cutting_vertex"] = float(raw_data.get('r_', 1.0))
-    param["large_tooth"] = raw_data.get('large_tooth', 0)
-    param["quantity"] = int(default_settings["quantity"])
-    param["accuracy_class"] = None
-    param["number"] = None
-    param["module"] = None
+    for name, source in params.items():
+        if isinstance(source, Column):
+            param[name] = _value(raw_data, source)
+        elif isinstance(source, Setting):
+            param[name] = _setting(source, default_settings)
+        else:
+            param[name] = source
     return param
 
 
+def select_frame(records: pd.DataFrame, default_settings: dict, params: dict) -> pd.DataFrame:
+    """ Из таблицы данных, полученных из БД (сырых), выбирает данные по таблице параметров params (по столбцам). """
+    param = pd.DataFrame(index=records.index)
+    for name, source in params.items():
+        if isinstance(source, Column):
+            param[name] = _values(records, source)
+        elif isinstance(source, Setting):
+            param[name] = _setting(source, default_settings)
+        else:
+            param[name] = source
+    return param
+
+
+def select_data_for_milling(raw_data: dict, default_settings: dict) -> dict:
+    """ Из словаря данных, полученных из БД (сырых), выбирает данные для класса 'Фреза'. """
+    return select_data(raw_data, default_settings, PARAMS_FOR_MILLING)
+
+
 def select_data_for_drilling(raw_data: dict, default_settings: dict) -> dict:
     """ Из словаря данных, полученных из БД (сырых), выбирает данные для класса 'Сверло'. """
-    param = dict()
-    # param["group"] = raw_data.get('Тип_инструмента')
-    param["marking"] = raw_data.get('Обозначение')
-    param["standard"] = raw_data.get('Стандарт')
-    param["mat_of_cutting_part"] = default_settings["mat_of_cutting_part"]
-    param["dia_mm"] = float(raw_data.get('D', 10))
-    param["length_mm"] = float(raw_data.get('L', 95))
-    param["main_angle_grad"] = float(raw_data.get('fi_', 60))
-    param["front_angle_grad"] = float(raw_data.get('gamma_', 0))
-    param["inclination_of_main_blade_grad"] = float(raw_data.get('lambda_', 0))
-    param["num_of_cutting_blades"] = int(raw_data.get('z', 2))
-    param["radius_of_cutting_vertex"] = float(raw_data.get('r_', 0.2))
-    param["quantity"] = int(default_settings["quantity"])
-    param["tolerance"] = str(default_settings["tolerance"])
-    return param
+    return select_data(raw_data, default_settings, PARAMS_FOR_DRILLING)
 
 
 def select_data_for_turning(raw_data: dict, default_settings: dict) -> dict:
     """ Из словаря данных, полученных из БД (сырых), выбирает данные для класса 'Резец'. """
-    param = dict()
-    # param["group"] = raw_data.get('Тип_инструмента')
-    param["marking"] = raw_data.get('Обозначение')
-    param["standard"] = raw_data.get('Стандарт')
-    param["mat_of_cutting_part"] = default_settings["mat_of_cutting_part"]
-    param["length_mm"] = float(raw_data.get('L', 120))
-    param["width_mm"] = float(raw_data.get('B', 16))
-    param["height_mm"] = float(raw_data.get('H', 20))
-    param["main_angle_grad"] = float(raw_data.get('fi_', 45))
-    param["front_angle_grad"] = float(raw_data.get('gamma_', 10))
-    param["inclination_of_main_blade_grad"] = float(raw_data.get('lambda_', 0))
-    param["radius_of_cutting_vertex"] = float(raw_data.get('r_', 0.2))
-    param["quantity"] = int(default_settings["quantity"])
-    param["turret"] = int(default_settings["turret"])
-    param["load"] = int(default_settings["load"])
-    param["is_complex_profile"] = True if default_settings["is_complex_profile"] == "True" else False
-    return param
+    return select_data(raw_data, default_settings, PARAMS_FOR_TURNING)
+
+
+def select_frame_for_milling(records: pd.DataFrame, default_settings: dict) -> pd.DataFrame:
+    """ Из таблицы данных, полученных из БД (сырых), выбирает данные для класса 'Фреза' (по столбцам). """
+    return select_frame(records, default_settings, PARAMS_FOR_MILLING)
+
+
+def select_frame_for_drilling(records: pd.DataFrame, default_settings: dict) -> pd.DataFrame:
+    """ Из таблицы данных, полученных из БД (сырых), выбирает данные для класса 'Сверло' (по столбцам). """
+    return select_frame(records, default_settings, PARAMS_FOR_DRILLING)
+
+
+def select_frame_for_turning(records: pd.DataFrame, default_settings: dict) -> pd.DataFrame:
+    """ Из таблицы данных, полученных из БД (сырых), выбирает данные для класса 'Резец' (по столбцам). """
+    return select_frame(records, default_settings, PARAMS_FOR_TURNING)
 
 
 class ToolDataPreparer:
@@ -79,6 +168,12 @@ class ToolDataPreparer:
                                'Развертка': select_data_for_drilling,
                                'Резец': select_data_for_turning, 
                                }
+    FRAME_SCRIPTS: ClassVar[dict] = {'Фреза': select_frame_for_milling,
+                                     'Сверло': select_frame_for_drilling,
+                                     'Зенкер': select_frame_for_drilling,
+                                     'Развертка': select_frame_for_drilling,
+                                     'Резец': select_frame_for_turning,
+                                     }
     DEFAULT_SETTINGS: ClassVar[dict] = DEFAULT_SETTINGS_FOR_TOOL
 
     def __init__(self, raw_data: Optional[dict]):
@@ -91,3 +186,17 @@ class ToolDataPreparer:
         assert self._raw_data['Тип_инструмента'] in self.DEFAULT_SETTINGS
         param = script(self._raw_data, self.DEFAULT_SETTINGS[self._raw_data['Тип_инструмента']])
         return param
+
+    @classmethod
+    def frame_to_params(cls, records: pd.DataFrame, type_tool: str) -> pd.DataFrame:
+        """ Возвращает таблицу параметров (столбец - параметр) для всех записей таблицы records одного типа
+        инструмента. Преобразования выполняются над столбцами таблицы, а не над каждой записью в отдельности."""
+        assert type_tool in cls.FRAME_SCRIPTS
+        script = cls.FRAME_SCRIPTS[type_tool]
+        assert type_tool in cls.DEFAULT_SETTINGS
+        return script(records, cls.DEFAULT_SETTINGS[type_tool])
+
+    @classmethod
+    def frame_to_generate(cls, records: pd.DataFrame, type_tool: str) -> list:
+        """ Возвращает список словарей параметров для всех записей таблицы records одного типа инструмента. """
+        return cls.frame_to_params(records, type_tool).to_dict("records")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import hashlib
+import os
+import pickle
+from typing import Callable, ClassVar, Iterable, Optional
+
+from service_for_my_projects import logged
+
+from tools import __version__
+from tools.obj import entities
+
+# Каталог пакета tools
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Модули пакета, определяющие параметры и наименования создаваемых инструментов
+SOURCE_MODULES = ("obj/constants.py", "obj/creators.py", "obj/data_preparers.py", "obj/entities.py",
+                  "obj/fields_types.py", "scr/fun.py")
+
+
+def package_version(modules: Iterable[str] = SOURCE_MODULES) -> str:
+    """ Возвращает версию пакета tools (__version__) с контрольной суммой исходных файлов modules: кеш создается
+    заново и при изменении кода без изменения номера версии (например, в рабочей копии репозитория). """
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(os.path.join(PACKAGE_DIR, module), "rb") as file:
+            digest.update(file.read())
+    return f"{__version__}+{digest.hexdigest()[:16]}"
+
+
+def file_checksum(path: str, chunksize: int = 1 << 20) -> str:
+    """ Возвращает контрольную сумму SHA-256 содержимого файла path. """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunksize), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@logged
+class DiskToolCache:
+    """ Кеш созданных инструментов всей БД на диске. Для каждого инструмента сохраняются имя класса, параметры
+    модели и наименование, по которым инструмент восстанавливается без подготовки данных, создания модели и
+    определения наименования. Имена параметров хранятся один раз для каждого набора (класс модели и поля),
+    значения параметров инструментов - кортежами.
+
+    Кеш действителен для контрольной суммы содержимого БД и версии пакета, с которыми он создан; при изменении любой
+    из них кеш создается заново. Контрольная сумма БД вычисляется, только если изменились размер или время изменения
+    файла БД.
+
+    Parameters:
+        path: str : Каталог кеша (None - кеш отключен).
+        db_path: str : Путь к файлу БД.
+        version: str : Версия пакета (по умолчанию - __version__ пакета tools с контрольной суммой исходных файлов,
+            см. package_version).
+    """
+    # Версия формата файла кеша
+    FORMAT_VERSION: ClassVar[int] = 1
+    FILENAME: ClassVar[str] = "tools.pickle"
+
+    def __init__(self, path: Optional[str], db_path: str, version: Optional[str] = None) -> None:
+        self._path = path
+        self._db_path = db_path
+        self._version = package_version() if isinstance(version, type(None)) else version
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self._path, type(None))
+
+    @property
+    def filename(self) -> Optional[str]:
+        """ Возвращает путь к файлу кеша (None - кеш отключен). """
+        return os.path.join(self._path, self.FILENAME) if self.enabled else None
+
+    def _header(self) -> Optional[dict]:
+        """ Возвращает заголовок файла кеша (None - файл отсутствует или поврежден). """
+        try:
+            with open(self.filename, "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def key(self, header: Optional[dict] = None) -> dict:
+        """ Возвращает ключ кеша для текущих БД и версии пакета. Контрольная сумма БД берется из заголовка header,
+        если размер и время изменения файла БД совпадают с сохраненными в нем. """
+        stat = os.stat(self._db_path)
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        stored = {} if isinstance(header, type(None)) else header.get("key", {})
+        checksum = stored.get("checksum") if stored.get("source") == source else None
+        return {"format": self.FORMAT_VERSION, "version": self._version, "source": source,
+                "checksum": checksum or file_checksum(self._db_path)}
+
+    @staticmethod
+    def _valid(header: Optional[dict], key: dict) -> bool:
+        if isinstance(header, type(None)):
+            return False
+        stored = header.get("key", {})
+        return all(stored.get(name) == key[name] for name in ("format", "version", "checksum"))
+
+    def load(self) -> Optional[list]:
+        """ Возвращает инструменты из кеша (None - кеш отключен, отсутствует или недействителен). """
+        if not self.enabled:
+            return None
+        header = self._header()
+        return self._read() if self._valid(header, self.key(header)) else None
+
+    def _read(self) -> list:
+        with open(self.filename, "rb") as file:
+            pickle.load(file)
+            layouts, fields_sets, rows = pickle.load(file)
+        models = [(getattr(entities, class_name), fields, extra, private)
+                  for class_name, fields, extra, private in layouts]
+        tools = []
+        for row in rows:
+            if isinstance(row, type(None)):
+                tools.append(None)
+                continue
+            number, values, extra_values, private_values, fields_set = row
+            model, fields, extra, private = models[number]
+            # Экземпляр восстанавливается как при распаковке pickle: без проверки, значений по умолчанию и
+            # определения наименования
+            tool = model.__new__(model)
+            tool.__setstate__({"__dict__": dict(zip(fields, values)),
+                               "__pydantic_extra__": dict(zip(extra, extra_values)),
+                               "__pydantic_fields_set__": set(fields_sets[fields_set]),
+                               "__pydantic_private__": dict(zip(private, private_values))})
+            tools.append(tool)
+        self.debug(f"Загружены инструменты из кеша {self.filename}: {len(tools)}.")
+        return tools
+
+    def save(self, tools: list) -> None:
+        """ Сохраняет инструменты tools (None - неудачно созданные) в кеш с ключом текущих БД и версии пакета. """
+        if self.enabled:
+            self._write(tools, self.key(self._header()))
+
+    def _write(self, tools: list, key: dict) -> None:
+        layouts, fields_sets, rows = [], [], []
+        numbers, fields_numbers = {}, {}
+        for tool in tools:
+            if isinstance(tool, type(None)):
+                rows.append(None)
+                continue
+            state = tool.__getstate__()
+            extra = state["__pydantic_extra__"] or {}
+            private = state["__pydantic_private__"] or {}
+            layout = (tool.__class__.__name__, tuple(state["__dict__"]), tuple(extra), tuple(private))
+            if layout not in numbers:
+                numbers[layout] = len(layouts)
+                layouts.append(layout)
+            fields_set = tuple(sorted(state["__pydantic_fields_set__"]))
+            if fields_set not in fields_numbers:
+                fields_numbers[fields_set] = len(fields_sets)
+                fields_sets.append(fields_set)
+            rows.append((numbers[layout], tuple(state["__dict__"].values()), tuple(extra.values()),
+                         tuple(private.values()), fields_numbers[fields_set]))
+        os.makedirs(self._path, exist_ok=True)
+        # Файл записывается во временный и заменяется целиком, чтобы другие процессы не прочитали его частично
+        temporary = f"{self.filename}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump({"key": key}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((layouts, fields_sets, rows), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.filename)
+        self.debug(f"Сохранены инструменты в кеш {self.filename}: {len(tools)}.")
+
+    def tools(self, build: Callable[[], list]) -> list:
+        """ Возвращает инструменты из кеша. Если кеш отключен, отсутствует или недействителен, создает инструменты
+        функцией build (и сохраняет их в кеш, если он не отключен). """
+        if not self.enabled:
+            return build()
+        header = self._header()
+        key = self.key(header)
+        if self._valid(header, key):
+            return self._read()
+        tools = build()
+        self._write(tools, key)
+        return tools
+
+    def invalidate(self) -> None:
+        """ Удаляет файл кеша. """
+        if self.enabled and os.path.exists(self.filename):
+            os.remove(self.filename)
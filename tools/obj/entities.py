@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
-import re
 from typing import Optional
 from pydantic import BaseModel, field_validator, model_validator, confloat, conint, Field
 from collections import namedtuple
@@ -13,7 +12,7 @@ from service_for_my_projects import Dictionarer
 from tools.obj.constants import TYPES_STANDARD, HARD_ALLOYS
 from tools.obj.fields_types import InGroupsTool, StringValue, MarkingForSpecialTool, InMaterialsOfCuttingPart, \
     InAccuracyStandards, InToleranceField, InTypesOfMillingCutter, InTypesOfCuttingPart, InTypesOfLargeTooth, \
-    InAccuracyClassStandards
+    InAccuracyClassStandards, parse_tolerance
 from tools.obj.abstract_classes import Size
 
 
@@ -225,16 +224,22 @@ class Tolerance(Base, Dictionarer):
 
     @tolerance.setter
     def tolerance(self, any_tolerance) -> None:
-        self.accuracy = re.findall(r'\d+', any_tolerance)[0]
-        self.tolerance_field = any_tolerance.replace(re.findall(r'\d+', any_tolerance)[0], "")
+        self.set_tolerance(*parse_tolerance(any_tolerance))
+
+    def set_tolerance(self, tolerance_field, accuracy) -> None:
+        """ Устанавливает поле допуска и квалитет одним присваиванием: значения проверяются типами полей один раз,
+        без проверки модели при присваивании каждого поля в отдельности. """
+        values = {"tolerance_field": InToleranceField.validate(tolerance_field),
+                  "accuracy": InAccuracyStandards.validate(accuracy)}
+        self.__dict__.update(values)
+        self.__pydantic_fields_set__.update(values)
 
     def _parameters(self) -> dict:
         return {"accuracy": self.accuracy, "tolerance_field": self.tolerance_field, "tolerance": self.tolerance}
 
     def __setattr__(self, name, value):
         if name == 'tolerance':
-            self.accuracy = re.findall(r'\d+', value)[0]
-            self.tolerance_field = value.replace(re.findall(r'\d+', value)[0], "")
+            self.set_tolerance(*parse_tolerance(value))
         else:
             super().__setattr__(name, value)
 
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
+import functools
+import re
+from types import MappingProxyType
 from typing import ClassVar
 
 from service_for_my_projects import InvalidValue, InvalidTypeValue
@@ -13,7 +16,7 @@ class StringValue:
     """Для определения полей, значение которых должны быть строго строковыми"""
 
     @classmethod
-    def validate(cls, value):
+    def validate(cls, value, info=None):
         if not isinstance(value, str):
             raise InvalidTypeValue(f'Ожидается строковое значение. Тип полученного значение {type(value)}')
         return value
@@ -23,25 +26,47 @@ class StringValue:
         yield cls.validate
 
 
+# Признак отсутствия значения в словаре (None - допустимое значение словаря, например, в ACCURACY_CLASS_STANDARDS)
+_MISSING = object()
+
+
 class ValueFromDict:
-    """Для определения полей, значение которых должны быть из словаря доступных значений"""
-    AVAILABLE_VALUES: ClassVar[dict] = {}
+    """Для определения полей, значение которых должны быть из словаря доступных значений.
+
+    Словари строятся один раз при создании класса и не изменяются: AVAILABLE_VALUES {строка: число} - прямой,
+    KEYS_BY_VALUE {число: строка} - обратный. Если одно число соответствует нескольким строкам (например, в
+    TYPES_OF_MILLING_CUTTER), обратный словарь возвращает первую из них в порядке AVAILABLE_VALUES."""
+    AVAILABLE_VALUES: ClassVar[MappingProxyType] = MappingProxyType({})
+    KEYS_BY_VALUE: ClassVar[MappingProxyType] = MappingProxyType({})
+    # Результат проверки по допустимому значению (строке или числу), общий для обоих словарей
+    _LOOKUP: ClassVar[dict] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.AVAILABLE_VALUES = MappingProxyType(dict(cls.AVAILABLE_VALUES))
+        keys_by_value = {}
+        for key, value in cls.AVAILABLE_VALUES.items():
+            keys_by_value.setdefault(value, key)
+        cls.KEYS_BY_VALUE = MappingProxyType(keys_by_value)
+        cls._LOOKUP = {key: key for key in cls.AVAILABLE_VALUES} | keys_by_value
+
+    @classmethod
+    def convert(cls, value) -> tuple:
+        """ Возвращает кортеж (допустимо ли значение, преобразованное значение) без возбуждения исключений. """
+        key = cls._LOOKUP.get(value, _MISSING) if isinstance(value, (str, int)) else _MISSING
+        return (False, None) if key is _MISSING else (True, key)
 
     @classmethod
-    def validate(cls, value):
-        if not isinstance(value, (int, str)):
-            raise ValueError(f"Ожидается целое число или строка, получено: {type(value)}")
-        elif isinstance(value, str):
-            if value not in cls.AVAILABLE_VALUES:
+    def validate(cls, value, info=None):
+        if isinstance(value, (str, int)):
+            key = cls._LOOKUP.get(value, _MISSING)
+            if key is not _MISSING:
+                return key
+            if isinstance(value, str):
                 raise InvalidValue(f"Строковое значение должно быть из списка {list(cls.AVAILABLE_VALUES.keys())}, "
                                    f"получено: {value}")
-            return value
-        elif isinstance(value, int):
-            if value not in cls.AVAILABLE_VALUES.values():
-                raise InvalidValue(f"Значение должно быть из списка {list(cls.AVAILABLE_VALUES.values())}, "
-                                   f"получено: {value}")
-            index = list(cls.AVAILABLE_VALUES.values()).index(value)
-            return list(cls.AVAILABLE_VALUES.keys())[index]
+            raise InvalidValue(f"Значение должно быть из списка {list(cls.KEYS_BY_VALUE.keys())}, получено: {value}")
+        raise ValueError(f"Ожидается целое число или строка, получено: {type(value)}")
 
     @classmethod
     def __get_validators__(cls):
@@ -82,3 +107,24 @@ class InTypesOfLargeTooth(ValueFromDict):
 
 class InAccuracyClassStandards(ValueFromDict):
     AVAILABLE_VALUES = ACCURACY_CLASS_STANDARDS
+
+
+# Квалитет в обозначении допуска (первая группа цифр)
+TOLERANCE_GRADE = re.compile(r'\d+')
+# Разобранные допуски {допуск: (поле допуска, квалитет)} для всех сочетаний TOLERANCE_FIELDS и ACCURACY_STANDARDS
+TOLERANCES = MappingProxyType({field + grade: (field, grade) for field in InToleranceField.AVAILABLE_VALUES
+                               for grade in InAccuracyStandards.AVAILABLE_VALUES})
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_other_tolerance(value: str) -> tuple:
+    grade = TOLERANCE_GRADE.findall(value)[0]
+    return InToleranceField.validate(value.replace(grade, "")), InAccuracyStandards.validate(grade)
+
+
+def parse_tolerance(value: str) -> tuple:
+    """ Возвращает кортеж (поле допуска, квалитет) допуска value (например, 'H8' -> ('H', '8')). Допуски из
+    сочетаний TOLERANCE_FIELDS и ACCURACY_STANDARDS берутся из таблицы TOLERANCES, остальные записи (например,
+    '8H') разбираются и проверяются один раз. """
+    parsed = TOLERANCES.get(value)
+    return _parse_other_tolerance(value) if isinstance(parsed, type(None)) else parsed
@@ -1,47 +1,59 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
+import asyncio
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from typing import Optional, Any
+from typing import Callable, Optional, Any, Iterable, Iterator
 
-from service_for_my_projects import RecordRequester, logged
+from service_for_my_projects import RecordRequester, InvalidValue, logged
 from service_for_my_projects import output_debug_message_for_init_method as debug_for_init
 
+from tools.obj.caches import LRUCache, cached, copy_frame
 from tools.obj.fields_types import InGroupsTool
+from tools.obj.indexes import SortedIndex
+from tools.obj.instrumentation import INSTRUMENTATION, instrumented
+from tools.obj.queries import ToolQuery
+from tools.obj.search import ToolSearchIndex
 
-
-def output_debug_message_with_kwargs_and_length(message: str):
-    """ Выводит в лог сообщение message"""
-    def decorator(func):
-        def wrapper(self, *args, **kwargs):
-            result = func(self, *args, **kwargs)
-            self.debug(message) if message.find("{") == -1 else self.debug(
-                message.format('; '.join([f'{k}= {v}' for k, v in kwargs.items()]), len(result)))
-            return result
-        return wrapper
-    return decorator
-
-
-def output_debug_message_with_with_length(message: str):
-    """ Выводит в лог сообщение message"""
-    def decorator(func):
-        def wrapper(self, *args, **kwargs):
-            result = func(self, *args, **kwargs)
-            self.debug(message) if message.find("{") == -1 else self.debug(
-                message.format(len(result)))
-            return result
-        return wrapper
-    return decorator
+# Результат пакетного поиска: найденные значения по ключам {ключ: значение} и список ненайденных ключей (в порядке
+# исходного набора ключей)
+BatchResult = namedtuple('BatchResult', ['found', 'missing'])
 
 
 @logged
 class ToolFinder:
     """ Содержит список методов поиска в БД, обязательных для поиска при любом типе БД """
+    # Столбцы с префиксными индексами (поиск по началу значения)
+    PREFIX_COLUMNS = ("Обозначение", "Стандарт")
+
     @debug_for_init()
-    def __init__(self, record_requester: RecordRequester) -> None:
+    def __init__(self, record_requester: RecordRequester, cache: Optional[LRUCache] = None,
+                 search_index: Optional[ToolSearchIndex] = None) -> None:
         self._requester = record_requester
+        self._cache = cache
+        # Полнотекстовый индекс (см. search). По умолчанию строится в памяти при первом поиске
+        self._search_index = search_index
 
-    @output_debug_message_with_kwargs_and_length("По ключам {0}  найдено записей: {1}")
+    def close(self) -> None:
+        """ Закрывает соединение источника записей (если источник поддерживает закрытие). """
+        if hasattr(self._requester, "close"):
+            self._requester.close()
+
+    def invalidate(self) -> None:
+        """ Очищает кеш результатов поиска и кешированные индексы источника записей (после изменения БД). """
+        if not isinstance(self._cache, type(None)):
+            self._cache.invalidate()
+        if hasattr(self._requester, "invalidate"):
+            self._requester.invalidate()
+        if not isinstance(self._search_index, type(None)):
+            self._search_index.clear()
+
+    @instrumented("query", "По ключам {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_dia(self, dia: float, dia_out: float = None) -> pd.DataFrame:
         """ Возвращает найденные записи по значению диаметра в виде таблицы pd.DataFrame.
 
@@ -56,7 +68,8 @@ class ToolFinder:
         records = df.dropna(how='any', axis=1)
         return records if not records.empty else None
 
-    @output_debug_message_with_kwargs_and_length("По ключу {0} найдено записей: {1}")
+    @instrumented("query", "По ключу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_type(self, type_tool: str) -> pd.DataFrame:
         """ Возвращает найденные записи по указанному обозначению в виде таблицы pd.DataFrame.
 
@@ -67,7 +80,8 @@ class ToolFinder:
         records = df.dropna(how='any', axis=1)
         return records if not records.empty else None
 
-    @output_debug_message_with_kwargs_and_length("По ключу {0} найдено записей: {1}")
+    @instrumented("query", "По ключу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_marking(self, marking: str) -> pd.DataFrame:
         """ Возвращает найденные записи по указанному обозначению в виде таблицы pd.DataFrame.
 
@@ -78,7 +92,8 @@ class ToolFinder:
         records = df.dropna(how='any', axis=1)
         return records if not records.empty else None
 
-    @output_debug_message_with_kwargs_and_length("По ключу {0} найдено записей: {1}")
+    @instrumented("query", "По ключу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_stand(self, standard: str) -> pd.DataFrame:
         """ Возвращает найденные записи по указанному стандарту в виде таблицы pd.DataFrame.
 
@@ -89,7 +104,102 @@ class ToolFinder:
         records = df.dropna(how='any', axis=1)
         return records if not records.empty else None
 
-    # @output_debug_message_with_kwargs_and_length("По ключу {0} найдено записей: {1}")
+    @instrumented("query", "По префиксу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
+    def by_marking_prefix(self, prefix: str, limit: Optional[int] = 10,
+                          type_tool: Optional[str] = None) -> pd.DataFrame:
+        """ Возвращает записи, обозначение которых начинается с prefix, в виде таблицы pd.DataFrame, упорядоченной по
+        близости обозначения к префиксу (см. PrefixIndex). Регистр, пробелы и знаки препинания не учитываются.
+
+        Parameters:
+            prefix: str : Начало обозначения (например, "2300-00")
+            limit: int : Наибольшее количество записей. None - все записи
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+        """
+        return self._by_prefix("Обозначение", prefix, limit, type_tool)
+
+    @instrumented("query", "По префиксу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
+    def by_stand_prefix(self, prefix: str, limit: Optional[int] = 10,
+                        type_tool: Optional[str] = None) -> pd.DataFrame:
+        """ Возвращает записи, стандарт которых начинается с prefix, в виде таблицы pd.DataFrame, упорядоченной по
+        близости стандарта к префиксу (см. by_marking_prefix).
+
+        Parameters:
+            prefix: str : Начало обозначения стандарта (например, "ГОСТ 886")
+            limit: int : Наибольшее количество записей. None - все записи
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+        """
+        return self._by_prefix("Стандарт", prefix, limit, type_tool)
+
+    def _by_prefix(self, column: str, prefix: str, limit: Optional[int], type_tool: Optional[str]) -> pd.DataFrame:
+        ids = self._prefix_index(column, type_tool).ids(prefix, limit)
+        records = self._requester.get_records_by_ids(ids).dropna(how='any', axis=1)
+        return records if not records.empty else None
+
+    @cached(list)
+    def suggestions(self, prefix: str, column: str = "Обозначение", limit: Optional[int] = 10,
+                    type_tool: Optional[str] = None) -> list:
+        """ Возвращает различные значения столбца column, начинающиеся с prefix (подсказки при вводе), в порядке
+        близости к префиксу. Записи из источника не загружаются.
+
+        Parameters:
+            prefix: str : Начало значения
+            column: str : Столбец из PREFIX_COLUMNS
+            limit: int : Наибольшее количество значений. None - все значения
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+        """
+        return self._prefix_index(column, type_tool).values(prefix, limit)
+
+    def _prefix_index(self, column: str, type_tool: Optional[str]):
+        if column not in self.PREFIX_COLUMNS:
+            raise InvalidValue(f"Поиск по префиксу выполняется по столбцам {self.PREFIX_COLUMNS}, получено: {column}")
+        return self._requester.prefix_index(column, type_tool)
+
+    @instrumented("query", "По тексту {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
+    def search(self, text: str, filters: Optional[dict] = None, limit: Optional[int] = 20) -> pd.DataFrame:
+        """ Возвращает записи, содержащие все слова текста text в описательных столбцах, обозначении или стандарте, в
+        виде таблицы pd.DataFrame, упорядоченной по релевантности (см. ToolSearchIndex). Индекс таблицы -
+        идентификаторы записей (см. records_by_ids). Поиск по наименованиям инструментов выполняется только после
+        построения индекса методом ToolLister.build_search_index (поисковик не создает инструменты, поэтому индекс,
+        построенный при первом поиске, наименований не содержит).
+
+        Parameters:
+            text: str : Искомые слова (например, "фреза концевая", "сверло с коническим хвостовиком")
+            filters: dict : Значения столбцов найденных записей {столбец: значение или список значений} (столбцы -
+                ToolSearchIndex.FILTER_COLUMNS, например, {"Тип_инструмента": "Фреза"})
+            limit: int : Наибольшее количество записей. None - все найденные записи
+        """
+        hits = self.search_index.search(text, filters=filters, limit=limit)
+        records = self._requester.get_records_by_ids(hits.ids).dropna(how='any', axis=1)
+        records.index = pd.Index(hits.ids)
+        return records if not records.empty else None
+
+    @property
+    def search_index(self) -> ToolSearchIndex:
+        """ Возвращает полнотекстовый индекс (построенный по значениям столбцов, без наименований инструментов,
+        если он еще не построен). """
+        if isinstance(self._search_index, type(None)):
+            self._search_index = ToolSearchIndex()
+        if not self._search_index.built:
+            self.build_search_index()
+        return self._search_index
+
+    def build_search_index(self, names: Optional[dict] = None) -> None:
+        """ Строит полнотекстовый индекс заново по значениям столбцов источника записей.
+
+        Parameters:
+            names: dict : Наименования инструментов {идентификатор записи: наименование} (см. column_values,
+                ToolLister.build_search_index)
+        """
+        if isinstance(self._search_index, type(None)):
+            self._search_index = ToolSearchIndex()
+        ids, records = self.column_values(ToolSearchIndex.SOURCE_COLUMNS)
+        self._search_index.build(ids, records, names)
+
+    @instrumented("query")
+    @cached(copy_frame)
     def by_dia_and_type(self, dia: Optional[float], dia_out: Optional[float], type_tool: str) -> pd.DataFrame:
         """ Возвращает найденные записи по значению диаметра в виде таблицы pd.DataFrame.
 
@@ -98,13 +208,91 @@ class ToolFinder:
             dia_out: str : Значение диаметра инструмента (указывается для насадных инструментов)
             type_tool: str : Тип инструмента (Сверло, резец, и т.д.) для поиска в БД
         """
-        df = self.by_dia(dia, dia_out)
-        if not isinstance(df, type(None)):
-            records = df[df["Тип_инструмента"] == type_tool].dropna(how='any', axis=1)
-            self.debug(f"""По ключу {type_tool=} отфильтровано записей: {len(records)}""")
-            return records if not records.empty else None
+        keys = {"D": dia_out} if not isinstance(dia_out, type(None)) else {"d_": dia}
+        df = self._requester.get_records(keys | {"Тип_инструмента": type_tool})
+        records = df.dropna(how='any', axis=1)
+        if INSTRUMENTATION.messages:
+            self.debug(f"""По ключам {keys}, {type_tool=} найдено записей: {len(records)}""")
+        return records if not records.empty else None
+
+    @cached(copy_frame)
+    def by_dia_range(self, dia_min: float, dia_max: float, type_tool: Optional[str] = None,
+                     column: str = "D") -> pd.DataFrame:
+        """ Возвращает записи со значением диаметра в диапазоне [dia_min, dia_max] в виде таблицы pd.DataFrame,
+        упорядоченной по диаметру.
+
+        Parameters:
+            dia_min: float : Минимальное значение диаметра инструмента
+            dia_max: float : Максимальное значение диаметра инструмента
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+            column: str : Столбец диаметра ("D" - диаметр инструмента, "d_" - диаметр отверстия насадного инструмента)
+        """
+        return self.by_dia_ranges([(dia_min, dia_max)], type_tool=type_tool, column=column)[0]
+
+    @instrumented("query")
+    def by_dia_ranges(self, ranges, type_tool: Optional[str] = None, column: str = "D") -> list:
+        """ Возвращает список таблиц pd.DataFrame (или None) с записями для каждого диапазона диаметров из ranges.
+
+        Parameters:
+            ranges : Массив диапазонов диаметров [(dia_min, dia_max), ...]
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+            column: str : Столбец диаметра ("D" - диаметр инструмента, "d_" - диаметр отверстия насадного инструмента)
+        """
+        bounds = np.asarray(ranges, dtype=float).reshape(-1, 2)
+        index = self._requester.sorted_index(column, type_tool)
+        starts, stops = index.between(bounds[:, 0], bounds[:, 1])
+        return self._records_by_slices(index, starts, stops)
+
+    @cached(copy_frame)
+    def by_nearest_dia(self, dia: float, type_tool: Optional[str] = None, column: str = "D",
+                       direction: str = "up") -> pd.DataFrame:
+        """ Возвращает записи с ближайшим к dia значением диаметра в виде таблицы pd.DataFrame.
+
+        Parameters:
+            dia: float : Искомое значение диаметра инструмента
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+            column: str : Столбец диаметра ("D" - диаметр инструмента, "d_" - диаметр отверстия насадного инструмента)
+            direction: str : "up" - ближайший диаметр не меньше dia, "down" - не больше dia, "nearest" - ближайший
+        """
+        return self.by_nearest_dias([dia], type_tool=type_tool, column=column, direction=direction)[0]
 
-    @output_debug_message_with_kwargs_and_length("По ключам {0} найдено записей: {1}")
+    @instrumented("query")
+    def by_nearest_dias(self, dias, type_tool: Optional[str] = None, column: str = "D",
+                        direction: str = "up") -> list:
+        """ Возвращает список таблиц pd.DataFrame (или None) с записями с ближайшим диаметром для каждого значения
+        из dias.
+
+        Parameters:
+            dias : Массив искомых значений диаметра инструмента
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+            column: str : Столбец диаметра ("D" - диаметр инструмента, "d_" - диаметр отверстия насадного инструмента)
+            direction: str : "up" - ближайший диаметр не меньше искомого, "down" - не больше искомого, "nearest" -
+                ближайший
+        """
+        if direction not in SortedIndex.DIRECTIONS:
+            raise InvalidValue(f"Направление поиска должно быть из списка {SortedIndex.DIRECTIONS}, "
+                               f"получено: {direction}")
+        index = self._requester.sorted_index(column, type_tool)
+        starts, stops = index.nearest(np.asarray(dias, dtype=float).reshape(-1), direction=direction)
+        return self._records_by_slices(index, starts, stops)
+
+    def _records_by_slices(self, index: SortedIndex, starts: np.ndarray, stops: np.ndarray) -> list:
+        """ Загружает одним запросом записи всех участков [start, stop) индекса и разделяет их по участкам. Записи
+        совпадающих участков загружаются и обрабатываются один раз. """
+        slices = list(dict.fromkeys(zip(starts.tolist(), stops.tolist())))
+        ids = [index.positions[start:stop] for start, stop in slices]
+        df = self._requester.get_records_by_ids(np.concatenate(ids) if ids else np.empty(0, dtype=np.int64))
+        bounds = np.cumsum([0] + [len(part) for part in ids])
+        found = {}
+        for key, start, stop in zip(slices, bounds[:-1], bounds[1:]):
+            records = df.iloc[start:stop].dropna(how='any', axis=1).reset_index(drop=True)
+            found[key] = records if not records.empty else None
+        if INSTRUMENTATION.messages:
+            self.debug(f"По {len(starts)} значениям диаметра найдено записей: {len(df)}")
+        return [found[key] for key in zip(starts.tolist(), stops.tolist())]
+
+    @instrumented("query", "По ключам {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_marking_and_stand(self, marking: str, standard: str) -> pd.DataFrame:
         """ Возвращает найденные записи по указанному стандарту в виде таблицы pd.DataFrame.
 
@@ -116,19 +304,255 @@ class ToolFinder:
         records = df.dropna(how='any', axis=1)
         return records if not records.empty else None
 
+    @staticmethod
+    def query() -> ToolQuery:
+        """ Возвращает пустой запрос ToolQuery для составления условий отбора, например:
+            finder.select(finder.query().type_tool("Фреза").dia(40, 63).material(1).order_by("D").limit(10))
+        """
+        return ToolQuery()
+
+    @instrumented("query")
+    @cached(copy_frame)
+    def select(self, query: ToolQuery) -> pd.DataFrame:
+        """ Возвращает записи, удовлетворяющие запросу query, в виде таблицы pd.DataFrame. Запрос выполняется
+        источником записей за одно обращение (одним запросом SQL или по индексам снимка в памяти).
+
+        Parameters:
+            query: ToolQuery : Условия отбора, упорядочивание и ограничение количества записей
+        """
+        df = self._requester.select(query)
+        records = df.dropna(how='any', axis=1).reset_index(drop=True)
+        if INSTRUMENTATION.messages:
+            self.debug(f"По запросу {query} найдено записей: {len(records)}")
+        return records if not records.empty else None
+
+    def explain(self, query: ToolQuery) -> str:
+        """ Возвращает описание выполнения запроса query источником записей (запрос SQL и план его выполнения или
+        шаги отбора по индексам снимка). """
+        return self._requester.explain(query)
+
+    def by_markings(self, markings: Iterable[str]) -> BatchResult:
+        """ Возвращает записи по каждому обозначению из markings (BatchResult: {обозначение: pd.DataFrame} и список
+        ненайденных обозначений). Записи всех обозначений загружаются одним обращением к источнику записей.
+
+        Parameters:
+            markings: Iterable[str] : Обозначения для поиска в БД
+        """
+        df, groups = self.records_by_keys(("Обозначение", ), [(marking, ) for marking in markings])
+        result = self._split(df, groups)
+        return BatchResult({key[0]: records for key, records in result.found.items()},
+                           [key[0] for key in result.missing])
+
+    def by_markings_and_stands(self, pairs: Iterable[tuple]) -> BatchResult:
+        """ Возвращает записи по каждой паре (обозначение, стандарт) из pairs (BatchResult: {(обозначение, стандарт):
+        pd.DataFrame} и список ненайденных пар). Записи всех пар загружаются одним обращением к источнику записей.
+
+        Parameters:
+            pairs: Iterable[tuple] : Пары (обозначение, стандарт) для поиска в БД
+        """
+        return self._split(*self.records_by_keys(("Обозначение", "Стандарт"), pairs))
+
+    def records_by_keys(self, columns: tuple, keys: Iterable[tuple]) -> tuple:
+        """ Возвращает записи по набору ключей одним обращением к источнику записей (по значениям первого столбца
+        columns) и позиции записей каждого ключа: (pd.DataFrame, {ключ: [позиции записей]}). Столбцы с пропусками не
+        удаляются, ненайденные ключи имеют пустой список позиций.
+
+        Parameters:
+            columns: tuple : Столбцы ключа
+            keys: Iterable[tuple] : Ключи - кортежи значений столбцов columns
+        """
+        groups = {tuple(key): [] for key in keys}
+        df = self._requester.get_records_by_values(columns[0], list(dict.fromkeys(key[0] for key in groups)))
+        for position, key in enumerate(zip(*(df[column].tolist() for column in columns))):
+            if key in groups:
+                groups[key].append(position)
+        if INSTRUMENTATION.messages:
+            self.debug(f"По {len(groups)} ключам {columns} загружено записей: {len(df)}")
+        return df, groups
+
+    def column_values(self, columns: Iterable[str], type_tool: Optional[str] = None) -> tuple:
+        """ Возвращает идентификаторы записей типа type_tool (или всех записей) и значения их столбцов columns:
+        (np.ndarray, pd.DataFrame). Идентификаторы используются для загрузки записей методом records_by_ids.
+
+        Parameters:
+            columns: Iterable[str] : Столбцы таблицы (в том числе не выбираемые в записях, например, 'Точность')
+            type_tool: str : Тип инструмента (Сверло, резец, и т.д.). None - инструменты всех типов
+        """
+        return self._requester.column_values(columns, type_tool)
+
+    @instrumented("query")
+    def records_by_ids(self, ids: Iterable[int]) -> pd.DataFrame:
+        """ Возвращает записи с идентификаторами ids (см. column_values) одним обращением к источнику записей, в
+        порядке ids. Столбцы с пропусками не удаляются. """
+        return self._requester.get_records_by_ids(np.asarray(list(ids), dtype=np.int64))
+
+    @staticmethod
+    def _split(df: pd.DataFrame, groups: dict) -> BatchResult:
+        """ Разделяет записи df по ключам groups {ключ: [позиции записей]}, удаляя в записях каждого ключа столбцы с
+        пропусками. Записи упорядочиваются по ключам один раз, таблица каждого ключа - участок упорядоченных записей
+        с общим для ключей набором столбцов без пропусков. """
+        found = {key: None for key, positions in groups.items() if positions}
+        missing = [key for key, positions in groups.items() if not positions]
+        if not found:
+            return BatchResult(found, missing)
+        order = np.concatenate([groups[key] for key in found])
+        bounds = np.cumsum([0] + [len(groups[key]) for key in found])
+        notna = df.notna().to_numpy()[order]
+        # Наборы столбцов без пропусков по ключам: {набор столбцов: [номера ключей]}
+        patterns = {}
+        for number, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            patterns.setdefault(notna[start:stop].all(axis=0).tobytes(), []).append(number)
+        keys = list(found)
+        for pattern, numbers in patterns.items():
+            columns = np.flatnonzero(np.frombuffer(pattern, dtype=bool))
+            rows = np.concatenate([order[bounds[n]:bounds[n + 1]] for n in numbers])
+            part = df.iloc[rows, columns].reset_index(drop=True)
+            start = 0
+            for number in numbers:
+                stop = start + bounds[number + 1] - bounds[number]
+                found[keys[number]] = part.iloc[start:stop].reset_index(drop=True)
+                start = stop
+        return BatchResult(found, missing)
+
     @property
-    @output_debug_message_with_with_length("Инициирован поиск всех записей таблицы. Найдено записей: {}")
+    @instrumented("query", "Инициирован поиск всех записей таблицы. Найдено записей: {count}")
     def all(self) -> pd.DataFrame:
         """ Возвращает все записи в виде таблицы pd.DataFrame """
         df = self._requester.get_all_records
         return df if not df.empty else None
 
+    def iter_records(self, keys: Optional[dict] = None, chunksize: int = 1000) -> Iterator[pd.DataFrame]:
+        """ Возвращает записи частями pd.DataFrame по chunksize записей. Части читаются из БД по мере обращения к ним,
+        поэтому объем занимаемой памяти не зависит от количества записей. Столбцы с пропусками не удаляются.
+
+        Parameters:
+            keys: dict : Значения столбцов для поиска {столбец: значение}. None - все записи
+            chunksize: int : Количество записей в части
+        """
+        return self._requester.iter_records(keys, chunksize=chunksize)
+
     @property
     def available_values(self) -> Any:
         """ Возвращает наборы доступных в таблице БД значений по категориям."""
         return self._requester.available_values
 
-    @output_debug_message_with_kwargs_and_length("По ключу {0} найдено записей: {1}")
+    @instrumented("query", "По ключу {kwargs} найдено записей: {count}")
+    @cached(copy_frame)
     def by_group(self, group: InGroupsTool = "Фреза") -> list:
         df = self._requester.get_records({"Тип_инструмента": group})
         return df if not df.empty else None
+
+
+@logged
+class AsyncToolFinder:
+    """ Асинхронный поиск в БД для приложений asyncio. Запросы выполняются в пуле из workers потоков, у каждого потока
+    собственный поисковик ToolFinder (поисковики используют общий источник записей контейнера), поэтому цикл событий не
+    блокируется. Одновременные одинаковые запросы объединяются: к БД выполняется один запрос, каждый ожидающий получает
+    копию результата.
+
+    Parameters:
+        finder: Callable[..., ToolFinder] : Фабрика поисковиков (вызывается один раз в каждом потоке пула).
+        workers: int : Количество потоков (соединений с БД).
+        shared: bool : Поисковик общий (принадлежит контейнеру, см. shared_async_finder): close и выход из блока
+            async with не останавливают пул потоков, его останавливает владелец методом shutdown.
+    """
+    @debug_for_init()
+    def __init__(self, finder: Callable[..., ToolFinder], workers: int = 4, shared: bool = False) -> None:
+        self._finder_factory = finder
+        self._shared = shared
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AsyncToolFinder")
+        self._local = threading.local()
+        # Выполняемые запросы: {(цикл событий, метод, аргументы): asyncio.Future}
+        self._pending = {}
+
+    def _thread_finder(self) -> ToolFinder:
+        finder = getattr(self._local, "finder", None)
+        if isinstance(finder, type(None)):
+            finder = self._finder_factory()
+            self._local.finder = finder
+        return finder
+
+    def _call(self, name: str, kwargs: dict):
+        return getattr(self._thread_finder(), name)(**kwargs) if kwargs else getattr(self._thread_finder(), name)
+
+    async def run(self, func: Callable, *args):
+        """ Выполняет func(*args) в пуле потоков поисковика. """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _query(self, name: str, **kwargs) -> Optional[pd.DataFrame]:
+        loop = asyncio.get_running_loop()
+        key = (loop, name, tuple(sorted(kwargs.items())))
+        try:
+            future = self._pending.get(key)
+        except TypeError:
+            # Нехешируемые аргументы - запрос не объединяется с другими
+            return await loop.run_in_executor(self._executor, self._call, name, kwargs)
+        if isinstance(future, type(None)):
+            future = loop.run_in_executor(self._executor, self._call, name, kwargs)
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Отмена одного ожидающего не отменяет запрос для остальных
+        return copy_frame(await asyncio.shield(future))
+
+    async def by_marking(self, marking: str) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по обозначению (см. ToolFinder.by_marking). """
+        return await self._query("by_marking", marking=marking)
+
+    async def by_stand(self, standard: str) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по стандарту (см. ToolFinder.by_stand). """
+        return await self._query("by_stand", standard=standard)
+
+    async def by_marking_prefix(self, prefix: str, limit: Optional[int] = 10,
+                                type_tool: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по началу обозначения (см. ToolFinder.by_marking_prefix). """
+        return await self._query("by_marking_prefix", prefix=prefix, limit=limit, type_tool=type_tool)
+
+    async def suggestions(self, prefix: str, column: str = "Обозначение", limit: Optional[int] = 10,
+                          type_tool: Optional[str] = None) -> list:
+        """ Возвращает значения столбца по началу значения (см. ToolFinder.suggestions). """
+        return await self._query("suggestions", prefix=prefix, column=column, limit=limit, type_tool=type_tool)
+
+    async def search(self, text: str, filters: Optional[dict] = None,
+                     limit: Optional[int] = 20) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по словам текста (см. ToolFinder.search). """
+        return await self._query("search", text=text, filters=filters, limit=limit)
+
+    async def by_marking_and_stand(self, marking: str, standard: str) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по обозначению и стандарту (см. ToolFinder.by_marking_and_stand). """
+        return await self._query("by_marking_and_stand", marking=marking, standard=standard)
+
+    async def by_dia_and_type(self, dia: Optional[float], dia_out: Optional[float],
+                              type_tool: str) -> Optional[pd.DataFrame]:
+        """ Возвращает записи по диаметру и типу инструмента (см. ToolFinder.by_dia_and_type). """
+        return await self._query("by_dia_and_type", dia=dia, dia_out=dia_out, type_tool=type_tool)
+
+    async def all(self) -> Optional[pd.DataFrame]:
+        """ Возвращает все записи (см. ToolFinder.all). """
+        return await self._query("all")
+
+    def close(self) -> None:
+        """ Дожидается выполнения запросов и останавливает пул потоков (у общего поисковика - ничего не делает, см.
+        shared). Поисковики и их общий источник записей не закрываются: источник записей принадлежит контейнеру и
+        используется другими поисковиками. """
+        if not self._shared:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """ Дожидается выполнения запросов и останавливает пул потоков (в том числе общего поисковика). """
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncToolFinder":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def shared_async_finder(finder: Callable[..., ToolFinder], workers: int = 4) -> Iterator[AsyncToolFinder]:
+    """ Создает общий асинхронный поисковик контейнера (ресурс providers.Resource): пул потоков остается открытым
+    после выхода из блоков async with и останавливается при container.shutdown_resources(). """
+    async_finder = AsyncToolFinder(finder, workers=workers, shared=True)
+    try:
+        yield async_finder
+    finally:
+        async_finder.shutdown()
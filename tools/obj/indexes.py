@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import bisect
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class HashIndex:
+    """ Хеш-индекс столбца, закодированного категориями: по значению возвращает позиции записей.
+
+    Parameters:
+        codes: np.ndarray : Коды категорий для каждой записи (-1 - пропуск).
+        categories: np.ndarray : Значения категорий.
+    """
+    def __init__(self, codes: np.ndarray, categories: np.ndarray) -> None:
+        # Позиции записей, упорядоченные по кодам (внутри кода - по возрастанию), и границы кодов в этом порядке
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        offsets = np.concatenate(([0], np.cumsum(counts))) + np.count_nonzero(codes < 0)
+        self._order = order
+        self._offsets = offsets
+        self._codes = {value: code for code, value in enumerate(categories)}
+        for array in (self._order, self._offsets):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_arrays(cls, order: np.ndarray, offsets: np.ndarray, categories: np.ndarray) -> "HashIndex":
+        """ Возвращает индекс по массивам другого индекса (см. arrays) без копирования и упорядочивания. """
+        index = cls.__new__(cls)
+        index._order = order
+        index._offsets = offsets
+        index._codes = {value: code for code, value in enumerate(categories)}
+        return index
+
+    @property
+    def arrays(self) -> dict:
+        """ Возвращает массивы индекса {имя: массив} (позиции записей по кодам и границы кодов). """
+        return {"order": self._order, "offsets": self._offsets}
+
+    def code(self, value) -> int:
+        """ Возвращает код значения value (-1, если значения нет в индексе). """
+        return self._codes.get(value, -1)
+
+    def positions(self, value) -> np.ndarray:
+        """ Возвращает упорядоченные позиции записей со значением value. """
+        code = self.code(value)
+        if code < 0:
+            return self._order[:0]
+        return self._order[self._offsets[code]:self._offsets[code + 1]]
+
+    def __contains__(self, value) -> bool:
+        return value in self._codes
+
+
+class SortedIndex:
+    """ Упорядоченный индекс числового столбца: идентификаторы записей, отсортированные по значению (пропуски
+    исключены). Поиск выполняется двоичным поиском, в том числе сразу для массива искомых значений.
+
+    Parameters:
+        values: np.ndarray : Числовые значения столбца для каждой записи (np.nan - пропуск).
+        ids: np.ndarray : Идентификаторы записей (по умолчанию - позиции значений в values).
+    """
+    DIRECTIONS = ("up", "down", "nearest")
+
+    def __init__(self, values: np.ndarray, ids: Optional[np.ndarray] = None) -> None:
+        values = np.asarray(values, dtype=float)
+        ids = np.arange(len(values)) if isinstance(ids, type(None)) else np.asarray(ids)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind="stable")]
+        self.positions = ids[order]
+        self.values = values[order]
+        for array in (self.positions, self.values):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_arrays(cls, positions: np.ndarray, values: np.ndarray) -> "SortedIndex":
+        """ Возвращает индекс по упорядоченным массивам другого индекса (positions, values) без копирования. """
+        index = cls.__new__(cls)
+        index.positions = positions
+        index.values = values
+        return index
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def equal(self, value: float) -> np.ndarray:
+        """ Возвращает упорядоченные идентификаторы записей со значением, равным value. """
+        lo = np.searchsorted(self.values, value, side="left")
+        hi = np.searchsorted(self.values, value, side="right")
+        return np.sort(self.positions[lo:hi])
+
+    def between(self, lo, hi) -> tuple:
+        """ Возвращает границы (starts, stops) участков индекса со значениями в диапазонах [lo, hi]. lo и hi - числа
+        или массивы чисел одинаковой длины. """
+        starts = np.searchsorted(self.values, lo, side="left")
+        stops = np.searchsorted(self.values, hi, side="right")
+        return starts, np.maximum(starts, stops)
+
+    def nearest(self, targets, direction: str = "up") -> tuple:
+        """ Возвращает границы (starts, stops) участков индекса с ближайшим к targets значением. targets - число или
+        массив чисел.
+
+        Parameters:
+            targets: float, np.ndarray : Искомые значения.
+            direction: str : "up" - ближайшее значение не меньше искомого, "down" - не больше искомого, "nearest" -
+                ближайшее значение (при равном удалении - большее).
+        """
+        if direction not in self.DIRECTIONS:
+            raise ValueError(f"Направление поиска должно быть из списка {self.DIRECTIONS}, получено: {direction}")
+        targets = np.asarray(targets, dtype=float)
+        size = len(self.values)
+        if not size:
+            empty = np.zeros(targets.shape, dtype=np.intp)
+            return empty, empty
+        up = np.searchsorted(self.values, targets, side="left")
+        down = np.searchsorted(self.values, targets, side="right") - 1
+        if direction == "nearest":
+            up_distance = np.where(up < size, self.values[np.minimum(up, size - 1)] - targets, np.inf)
+            down_distance = np.where(down >= 0, targets - self.values[np.maximum(down, 0)], np.inf)
+            found = np.where(up_distance <= down_distance, up, down)
+        else:
+            found = up if direction == "up" else down
+        exists = (found >= 0) & (found < size)
+        value = self.values[np.clip(found, 0, size - 1)]
+        starts = np.where(exists, np.searchsorted(self.values, value, side="left"), 0)
+        stops = np.where(exists, np.searchsorted(self.values, value, side="right"), 0)
+        return starts, stops
+
+
+class PrefixIndex:
+    """ Префиксный индекс текстового столбца для поиска по началу значения (например, подсказок при вводе обозначения).
+    Значения приводятся к ключам: нижний регистр без пробелов и знаков препинания ("2300-0041" -> "23000041"), поэтому
+    префиксы "2300-00", "230000" и "2300 00" равнозначны. Ключи хранятся упорядоченными списками по длине ключа: поиск
+    выполняется двоичным поиском в каждом списке, не просматривая все значения с префиксом.
+
+    Результаты упорядочены по близости к префиксу: сначала значения с ключом, равным префиксу, далее - по возрастанию
+    длины ключа (количеству недостающих символов), при равной длине - по возрастанию ключа и по порядку записей.
+
+    Parameters:
+        values: Iterable : Значения столбца для каждой записи (None - пропуск).
+        ids: np.ndarray : Идентификаторы записей (по умолчанию - позиции значений в values).
+    """
+    def __init__(self, values: Iterable, ids: Optional[np.ndarray] = None) -> None:
+        values = list(values)
+        ids = np.arange(len(values)) if isinstance(ids, type(None)) else np.asarray(ids)
+        entries = sorted(entry for entry in ((self.key(value), position) for position, value in enumerate(values)
+                                             if isinstance(value, str)) if entry[0])
+        # Списки по длине ключа: {длина: (ключи, идентификаторы записей, значения)}
+        self._lengths = {}
+        for key, position in entries:
+            keys, positions, _ = self._lengths.setdefault(len(key), ([], [], []))
+            keys.append(key)
+            positions.append(position)
+        for length, (keys, positions, found) in self._lengths.items():
+            found.extend(values[position] for position in positions)
+            self._lengths[length] = (keys, ids[np.asarray(positions, dtype=np.intp)], found)
+        self._order = sorted(self._lengths)
+        self._size = len(entries)
+
+    @staticmethod
+    def key(value: str) -> str:
+        """ Возвращает ключ значения value: символы в нижнем регистре без пробелов и знаков препинания. """
+        return "".join(char for char in value.casefold() if char.isalnum())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _spans(self, prefix: str) -> Iterator[tuple]:
+        """ Возвращает участки (длина ключа, начало, конец) списков с ключами, начинающимися с prefix, в порядке
+        упорядочивания результатов. """
+        key = self.key(prefix)
+        for length in self._order[bisect.bisect_left(self._order, len(key)):]:
+            keys = self._lengths[length][0]
+            start = bisect.bisect_left(keys, key)
+            stop = bisect.bisect_right(keys, key + "\U0010ffff", lo=start)
+            if start < stop:
+                yield length, start, stop
+
+    def ids(self, prefix: str, limit: Optional[int] = None) -> np.ndarray:
+        """ Возвращает идентификаторы не более limit записей (None - всех записей) со значением, начинающимся с
+        prefix, в порядке близости к префиксу. """
+        parts, count = [], 0
+        for length, start, stop in self._spans(prefix):
+            if not isinstance(limit, type(None)):
+                stop = min(stop, start + limit - count)
+            parts.append(self._lengths[length][1][start:stop])
+            count += stop - start
+            if not isinstance(limit, type(None)) and count >= limit:
+                break
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def values(self, prefix: str, limit: Optional[int] = None) -> list:
+        """ Возвращает не более limit различных значений (None - все значения), начинающихся с prefix, в порядке
+        близости к префиксу. """
+        found = {}
+        for length, start, stop in self._spans(prefix):
+            for value in self._lengths[length][2][start:stop]:
+                found[value] = None
+                if not isinstance(limit, type(None)) and len(found) >= limit:
+                    return list(found)
+        return list(found)
+
+    def count(self, prefix: str) -> int:
+        """ Возвращает количество записей со значением, начинающимся с prefix. """
+        return sum(stop - start for _, start, stop in self._spans(prefix))
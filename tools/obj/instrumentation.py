@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from typing import Optional
+
+
+class Histogram:
+    """ Гистограмма длительностей (в секундах) с фиксированными границами интервалов.
+
+    Parameters:
+        buckets: tuple : Верхние границы интервалов по возрастанию (значение попадает в интервал, если не больше его
+            границы). Значения больше последней границы учитываются в интервале +Inf.
+    """
+    BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple = BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def cumulative(self) -> list:
+        """ Возвращает количество значений не больше каждой границы (последний элемент - все значения). """
+        result, total = [], 0
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class Instrumentation:
+    """ Счетчики и гистограммы длительностей этапов поиска и создания инструментов: query (поиск записей), prepare
+    (подготовка данных), construct (создание экземпляров моделей), name (определение наименований) и list (создание
+    списков инструментов). Значения доступны методом stats и в текстовом формате Prometheus (to_prometheus).
+
+    Отключенный сбор значений (enabled = False) сводится к проверке одного атрибута: замеры времени и подсчет не
+    выполняются. Сообщения в лог о результатах поиска и создания списков (messages) по умолчанию отключены и
+    формируются, только если они включены.
+
+    Parameters:
+        enabled: bool : Собирать значения счетчиков и гистограмм.
+        messages: bool : Выводить в лог сообщения о результатах методов (ключи поиска и количество записей).
+        buckets: tuple : Границы интервалов гистограмм (в секундах).
+    """
+    PHASES = ("query", "prepare", "construct", "name", "list")
+    # Описания счетчиков: {имя счетчика: описание}
+    COUNTERS = {"items": "Количество записей (объектов), обработанных на этапе.",
+                "errors": "Количество ошибок создания экземпляров моделей."}
+
+    def __init__(self, enabled: bool = False, messages: bool = False, buckets: tuple = Histogram.BUCKETS) -> None:
+        self.enabled = enabled
+        self.messages = messages
+        # Выполняется ли хотя бы одно действие инструментирования (проверяется при каждом вызове метода)
+        self.active = enabled or messages
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def configure(self, enabled: Optional[bool] = None, messages: Optional[bool] = None) -> "Instrumentation":
+        """ Включает или отключает сбор значений и сообщения в лог (None - без изменений). """
+        if not isinstance(enabled, type(None)):
+            self.enabled = enabled
+        if not isinstance(messages, type(None)):
+            self.messages = messages
+        self.active = self.enabled or self.messages
+        return self
+
+    def clock(self) -> Optional[float]:
+        """ Возвращает время начала замера (None, если сбор значений отключен). """
+        return time.perf_counter() if self.enabled else None
+
+    def record(self, phase: str, operation: str, started: Optional[float], items: int = 1) -> None:
+        """ Учитывает этап phase операции operation, начатый в момент started (см. clock), обработавший items
+        объектов. """
+        if isinstance(started, type(None)):
+            return
+        elapsed = time.perf_counter() - started
+        key = (phase, operation)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if isinstance(histogram, type(None)):
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            histogram.observe(elapsed)
+            self._counters[("items", ) + key] = self._counters.get(("items", ) + key, 0) + items
+
+    def count(self, name: str, phase: str, operation: str, value: int = 1) -> None:
+        """ Увеличивает счетчик name этапа phase операции operation на value. """
+        if not self.enabled:
+            return
+        key = (name, phase, operation)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        """ Обнуляет счетчики и гистограммы. """
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+    def stats(self) -> dict:
+        """ Возвращает значения по этапам и операциям: {этап: {операция: {"count", "sum_s", "mean_ms", "buckets",
+        счетчики}}}. buckets - накопленное количество замеров не больше каждой границы. """
+        with self._lock:
+            histograms = {key: (histogram.count, histogram.sum, dict(zip(histogram.buckets + (float("inf"), ),
+                                                                          histogram.cumulative)))
+                          for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+        result = {}
+        for (phase, operation), (count, total, buckets) in histograms.items():
+            result.setdefault(phase, {})[operation] = {"count": count, "sum_s": total,
+                                                       "mean_ms": total / count * 1000 if count else None,
+                                                       "buckets": buckets}
+        for (name, phase, operation), value in counters.items():
+            result.setdefault(phase, {}).setdefault(operation, {})[name] = value
+        return result
+
+    def to_prometheus(self, prefix: str = "tools") -> str:
+        """ Возвращает значения в текстовом формате экспозиции Prometheus. """
+        def labels(phase: str, operation: str, **extra) -> str:
+            pairs = {"phase": phase, "operation": operation} | extra
+            return ",".join(f'{key}="{escape(value)}"' for key, value in pairs.items())
+
+        with self._lock:
+            histograms = sorted((key, histogram.buckets, histogram.cumulative, histogram.sum, histogram.count)
+                                for key, histogram in self._histograms.items())
+            counters = sorted(self._counters.items())
+        lines = [f"# HELP {prefix}_phase_seconds Длительность этапов поиска и создания инструментов.",
+                 f"# TYPE {prefix}_phase_seconds histogram"]
+        for (phase, operation), buckets, cumulative, total, count in histograms:
+            for bound, value in zip(buckets + (float("inf"), ), cumulative):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{prefix}_phase_seconds_bucket{{{labels(phase, operation, le=le)}}} {value}")
+            lines.append(f"{prefix}_phase_seconds_sum{{{labels(phase, operation)}}} {total!r}")
+            lines.append(f"{prefix}_phase_seconds_count{{{labels(phase, operation)}}} {count}")
+        for name in sorted({key[0] for key, _ in counters}):
+            lines.extend([f"# HELP {prefix}_{name}_total {self.COUNTERS.get(name, name)}",
+                          f"# TYPE {prefix}_{name}_total counter"])
+            lines.extend(f"{prefix}_{name}_total{{{labels(phase, operation)}}} {value}"
+                         for (counter, phase, operation), value in counters if counter == name)
+        return "\n".join(lines) + "\n"
+
+
+def escape(value) -> str:
+    """ Экранирует значение метки Prometheus. """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Общий для пакета сбор значений (настройки контейнера: config.instrumentation)
+INSTRUMENTATION = Instrumentation()
+
+
+def configure(enabled: Optional[bool] = None, messages: Optional[bool] = None) -> Instrumentation:
+    """ Настраивает и возвращает общий сбор значений INSTRUMENTATION. """
+    return INSTRUMENTATION.configure(enabled=enabled, messages=messages)
+
+
+def instrumented(phase: str, message: Optional[str] = None):
+    """ Учитывает длительность вызовов метода и количество записей (объектов) в результатах как этап phase операции
+    с именем метода. Если сообщения в лог включены, выводит message с подстановкой {kwargs} - аргументов метода и
+    {count} - количества записей в результате. При отключенных сборе значений и сообщениях метод вызывается без
+    дополнительных действий. """
+    def decorator(func):
+        operation = func.__name__
+
+        def report(self, kwargs: dict, started: Optional[float], result) -> None:
+            count = 0 if isinstance(result, type(None)) else len(result)
+            INSTRUMENTATION.record(phase, operation, started, count)
+            if INSTRUMENTATION.messages and not isinstance(message, type(None)):
+                self.debug(message.format(kwargs='; '.join([f'{k}= {v}' for k, v in kwargs.items()]), count=count))
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not INSTRUMENTATION.active:
+                    return await func(self, *args, **kwargs)
+                started = INSTRUMENTATION.clock()
+                result = await func(self, *args, **kwargs)
+                report(self, kwargs, started, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not INSTRUMENTATION.active:
+                return func(self, *args, **kwargs)
+            started = INSTRUMENTATION.clock()
+            result = func(self, *args, **kwargs)
+            report(self, kwargs, started, result)
+            return result
+        return wrapper
+    return decorator
@@ -1,59 +1,197 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------------------------------------------------
-from typing import Callable
-from service_for_my_projects import logged
+from typing import Callable, Iterator, Optional
+
+from service_for_my_projects import InvalidValue, logged
 from service_for_my_projects import output_debug_message_for_init_method as debug_for_init
 
-from tools.obj.creators import ToolCreator
-from tools.obj.finders import ToolFinder
+from tools.obj.creators import ToolCreator, report_error
+from tools.obj.disk_caches import DiskToolCache
+from tools.obj.entities import ErrorWithData
+from tools.obj.finders import AsyncToolFinder, BatchResult, ToolFinder
 from tools.obj.fields_types import InGroupsTool
-
-
-def output_debug_message(message: str):
-    """ Выводит в лог сообщение message"""
-    def decorator(func):
-        def wrapper(self, *args, **kwargs):
-            self.debug(message) if message.find("{") == -1 else self.debug(
-                message.format('; '.join([f'{k}= {v}' for k, v in kwargs.items()])))
-            return func(self, *args, **kwargs)
-        return wrapper
-    return decorator
+from tools.obj.instrumentation import INSTRUMENTATION, instrumented
+from tools.obj.parallel import build_in_pool, tool_from_record
+from tools.obj.records import to_record
 
 
 @logged
 class ToolLister:
     @debug_for_init()
-    def __init__(self, tool_creator: Callable[..., ToolCreator], finder: Callable[..., ToolFinder]):
+    def __init__(self, tool_creator: Callable[..., ToolCreator], finder: Callable[..., ToolFinder],
+                 db_path: Optional[str] = None, tablename: str = "tools", slim: bool = False,
+                 disk_cache: Optional[DiskToolCache] = None):
         self._tool_creator = tool_creator()
         self._finder = finder()
+        # Путь к БД нужен процессам-исполнителям для открытия собственных соединений (см. all_parallel)
+        self._db_path = db_path
+        self._tablename = tablename
+        # Возвращать облегченные неизменяемые записи ToolRecord вместо моделей (полная модель - record.to_model())
+        self._slim = slim
+        # Кеш всех инструментов БД на диске (см. all)
+        self._disk_cache = disk_cache
 
-    @output_debug_message("Создаем список инструментов по ключам: {}.")
+    def _output(self, tools: list) -> list:
+        return [to_record(tool) for tool in tools] if self._slim else tools
+
+    @instrumented("list", "Создан список инструментов по ключам: {kwargs}. Инструментов: {count}.")
     def by_marking_and_stand(self, marking: str, standard: str) -> list:
         table_records = self._finder.by_marking_and_stand(marking=marking, standard=standard)
         self._tool_creator._verbose = True
-        return [self._tool_creator.create_tool(row) for index, row in table_records.iterrows()]
+        return self._output(self._tool_creator.create_many(table_records))
+
+    def by_marking_and_stand_many(self, pairs) -> BatchResult:
+        """ Возвращает списки инструментов по каждой паре (обозначение, стандарт) из pairs (BatchResult:
+        {(обозначение, стандарт): список инструментов} и список ненайденных пар). Записи всех пар загружаются одним
+        обращением к БД, инструменты по всем записям создаются одним вызовом create_many.
 
-    @output_debug_message("Создаем список инструментов по ключу: {}.")
+        Parameters:
+            pairs : Пары (обозначение, стандарт)
+        """
+        records, groups = self._finder.records_by_keys(("Обозначение", "Стандарт"), pairs)
+        if INSTRUMENTATION.messages:
+            self.debug(f"Создаем списки инструментов по {len(groups)} парам (обозначение, стандарт).")
+        self._tool_creator._verbose = False
+        tools = self._output(self._tool_creator.create_many(records))
+        result, missing = {}, []
+        for key, positions in groups.items():
+            if positions:
+                result[key] = [tools[position] for position in positions]
+            else:
+                missing.append(key)
+        return BatchResult(result, missing)
+
+    @instrumented("list", "Создан список инструментов по ключу: {kwargs}. Инструментов: {count}.")
     def by_marking(self, marking: str) -> list:
         table_records = self._finder.by_marking(marking=marking)
         self._tool_creator._verbose = True
-        return [self._tool_creator.create(row) for index, row in table_records.iterrows()]
+        return self._output(self._tool_creator.create_many(table_records))
 
-    @output_debug_message("Создаем список инструментов по ключу: {}.")
+    @instrumented("list", "Создан список инструментов по ключу: {kwargs}. Инструментов: {count}.")
     def by_stand(self, standard: str) -> list:
         table_records = self._finder.by_stand(standard=standard)
         self._tool_creator._verbose = True
-        return [self._tool_creator.create(row) for index, row in table_records.iterrows()]
+        return self._output(self._tool_creator.create_many(table_records))
 
     @property
-    @output_debug_message("Создаем список всех инструментов БД.")
+    @instrumented("list", "Создан список всех инструментов БД. Инструментов: {count}.")
     def all(self) -> list:
+        if isinstance(self._disk_cache, type(None)):
+            return self._output(self._create_all())
+        return self._output(self._disk_cache.tools(self._create_all))
+
+    def build_search_index(self) -> None:
+        """ Строит полнотекстовый индекс поисковика (ToolFinder.search) с наименованиями инструментов: инструменты
+        создаются по всем записям одним вызовом create_many. """
+        ids, _ = self._finder.column_values(["Обозначение"])
+        self._tool_creator._verbose = False
+        tools = self._tool_creator.create_many(self._finder.records_by_ids(ids))
+        names = {record_id: tool.name for record_id, tool in zip(ids.tolist(), tools)
+                 if not isinstance(tool, (type(None), ErrorWithData))}
+        self._finder.build_search_index(names)
+
+    def _create_all(self) -> list:
         table_records = self._finder.all
         self._tool_creator._verbose = False
-        return [self._tool_creator.create(row) for index, row in table_records.iterrows()]
+        return self._tool_creator.create_many(table_records)
 
-    @output_debug_message("Создаем список инструментов по ключу: {}.")
+    @instrumented("list", "Создан список инструментов по ключу: {kwargs}. Инструментов: {count}.")
     def by_group(self, group: InGroupsTool = "Фреза") -> list:
         table_records = self._finder.by_group(group=group)
-        return [self._tool_creator.create(row) for index, row in table_records.iterrows()]
+        return self._output(self._tool_creator.create_many(table_records))
+
+    @instrumented("list", "Создан список всех инструментов БД в пуле процессов: {kwargs}. Инструментов: {count}.")
+    def all_parallel(self, workers: Optional[int] = None, shards: Optional[int] = None) -> list:
+        """ Возвращает список всех инструментов БД (как all), создавая инструменты в пуле из workers процессов.
+        Записи делятся на shards частей по rowid, каждый процесс читает свои части через собственное соединение с БД
+        только для чтения. Порядок инструментов соответствует порядку записей в БД.
+
+        Parameters:
+            workers: int : Количество процессов. По умолчанию - количество процессоров.
+            shards: int : Количество частей. По умолчанию - по 4 на процесс.
+        """
+        if isinstance(self._db_path, type(None)):
+            raise InvalidValue("Для создания инструментов в пуле процессов необходимо указать путь к БД (db_path)")
+        tools = []
+        for record in build_in_pool(self._db_path, self._tablename, workers=workers, shards=shards):
+            if isinstance(record, ErrorWithData):
+                report_error(self._tool_creator, record)
+                tools.append(None)
+            else:
+                tools.append(tool_from_record(record))
+        return self._output(tools)
+
+    def iter_all(self, chunksize: int = 1000) -> Iterator:
+        """ Возвращает генератор всех инструментов БД. Записи читаются из БД частями по chunksize записей, инструменты
+        создаются по мере обращения к ним. Вместо неудачно созданных инструментов возвращается ErrorWithData."""
+        self._tool_creator._verbose = False
+        return self._iter_tools(None, chunksize)
+
+    def iter_by_marking(self, marking: str, chunksize: int = 1000) -> Iterator:
+        """ Возвращает генератор инструментов с обозначением marking (см. iter_all). """
+        return self._iter_tools({"Обозначение": marking}, chunksize)
+
+    def iter_by_stand(self, standard: str, chunksize: int = 1000) -> Iterator:
+        """ Возвращает генератор инструментов стандарта standard (см. iter_all). """
+        return self._iter_tools({"Стандарт": standard}, chunksize)
+
+    def iter_by_marking_and_stand(self, marking: str, standard: str, chunksize: int = 1000) -> Iterator:
+        """ Возвращает генератор инструментов с обозначением marking стандарта standard (см. iter_all). """
+        return self._iter_tools({"Обозначение": marking, "Стандарт": standard}, chunksize)
+
+    def iter_by_group(self, group: InGroupsTool = "Фреза", chunksize: int = 1000) -> Iterator:
+        """ Возвращает генератор инструментов группы group (см. iter_all). """
+        return self._iter_tools({"Тип_инструмента": group}, chunksize)
+
+    def _iter_tools(self, keys: Optional[dict], chunksize: int) -> Iterator:
+        if INSTRUMENTATION.messages:
+            self.debug(f"Создаем генератор инструментов по ключам: {keys}, размер части: {chunksize}.")
+        for records in self._finder.iter_records(keys, chunksize=chunksize):
+            yield from self._output(self._tool_creator.create_many(records, with_errors=True))
+
+
+@logged
+class AsyncToolLister:
+    """ Асинхронное создание списков инструментов для приложений asyncio. Записи ищутся асинхронным поисковиком
+    (одинаковые одновременные запросы объединяются), инструменты создаются в пуле потоков поисковика.
+
+    Parameters:
+        tool_creator: Callable[..., ToolCreator] : Фабрика создателей инструментов.
+        finder: AsyncToolFinder : Асинхронный поисковик.
+        slim: bool : Возвращать облегченные неизменяемые записи ToolRecord вместо моделей.
+    """
+    @debug_for_init()
+    def __init__(self, tool_creator: Callable[..., ToolCreator], finder: AsyncToolFinder, slim: bool = False):
+        self._tool_creator = tool_creator()
+        self._finder = finder
+        self._slim = slim
+
+    def _create_tools(self, table_records) -> list:
+        tools = self._tool_creator.create_many(table_records)
+        return [to_record(tool) for tool in tools] if self._slim else tools
+
+    async def _create_many(self, table_records) -> list:
+        return await self._finder.run(self._create_tools, table_records)
+
+    @instrumented("list", "Создан список инструментов по ключу: {kwargs}. Инструментов: {count}.")
+    async def by_marking(self, marking: str) -> list:
+        return await self._create_many(await self._finder.by_marking(marking=marking))
+
+    @instrumented("list", "Создан список инструментов по ключу: {kwargs}. Инструментов: {count}.")
+    async def by_stand(self, standard: str) -> list:
+        return await self._create_many(await self._finder.by_stand(standard=standard))
+
+    @instrumented("list", "Создан список инструментов по ключам: {kwargs}. Инструментов: {count}.")
+    async def by_marking_and_stand(self, marking: str, standard: str) -> list:
+        return await self._create_many(await self._finder.by_marking_and_stand(marking=marking, standard=standard))
+
+    @instrumented("list", "Создан список инструментов по ключам: {kwargs}. Инструментов: {count}.")
+    async def by_dia_and_type(self, dia: Optional[float], dia_out: Optional[float], type_tool: str) -> list:
+        return await self._create_many(await self._finder.by_dia_and_type(dia=dia, dia_out=dia_out,
+                                                                          type_tool=type_tool))
+
+    @instrumented("list", "Создан список всех инструментов БД. Инструментов: {count}.")
+    async def all(self) -> list:
+        self._tool_creator._verbose = False
+        return await self._create_many(await self._finder.all())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from tools.obj import entities
+from tools.obj.constants import COLUMNS_FOR_PREPARERS, TOOLS_CLASSES_BY_TYPE
+from tools.obj.data_preparers import ToolDataPreparer
+from tools.obj.entities import ErrorWithData
+from tools.obj.requesters import connect_read_only, quote
+from tools.scr.fun import get_name
+
+
+def split_into_shards(path: str, tablename: str = "tools", shards: int = 8) -> list:
+    """ Делит записи таблицы на shards частей с примерно равным количеством записей. Возвращает список границ частей
+    [(первый rowid, последний rowid), ...] в порядке rowid."""
+    connection = connect_read_only(path)
+    try:
+        rowids = np.array([row[0] for row in connection.execute(
+            f"SELECT rowid FROM {quote(tablename)} ORDER BY rowid")], dtype=np.int64)
+    finally:
+        connection.close()
+    return [(int(part[0]), int(part[-1])) for part in np.array_split(rowids, shards) if len(part)]
+
+
+def build_shard(path: str, tablename: str, bounds: tuple, columns: Iterable[str] = COLUMNS_FOR_PREPARERS) -> list:
+    """ Создает инструменты по записям таблицы с rowid в диапазоне bounds. Выполняется в процессе-исполнителе: читает
+    записи через собственное соединение только для чтения. Возвращает компактное представление инструментов
+    [(имя класса, параметры, наименование), ...] в порядке rowid, вместо неудачно созданных - ErrorWithData. """
+    connection = connect_read_only(path)
+    try:
+        records = pd.read_sql_query(f"SELECT {', '.join(quote(column) for column in columns)} "
+                                    f"FROM {quote(tablename)} WHERE rowid BETWEEN ? AND ? ORDER BY rowid",
+                                    connection, params=list(bounds))
+    finally:
+        connection.close()
+    result = [None] * len(records)
+    for type_tool, positions in records.groupby("Тип_инструмента", sort=False).indices.items():
+        class_name = TOOLS_CLASSES_BY_TYPE[type_tool]
+        cutter_class = getattr(entities, class_name)
+        params_list = ToolDataPreparer.frame_to_generate(records.iloc[positions], type_tool)
+        for position, params in zip(positions, params_list):
+            try:
+                tool = cutter_class.construct(**params)
+                get_name(tool)
+            except Exception as error:
+                result[position] = ErrorWithData(err=error, name=class_name, params=params,
+                                                 raw_data=records.iloc[position].dropna().to_dict())
+                continue
+            result[position] = (class_name, params, tool.name)
+    return result
+
+
+def tool_from_record(record: tuple):
+    """ Создает инструмент по компактному представлению (имя класса, параметры, наименование). """
+    class_name, params, name = record
+    tool = getattr(entities, class_name).construct(**params)
+    tool.name = name
+    return tool
+
+
+def build_in_pool(path: str, tablename: str = "tools", workers: Optional[int] = None,
+                  shards: Optional[int] = None) -> list:
+    """ Создает компактные представления всех инструментов таблицы в пуле из workers процессов. Записи делятся на
+    shards частей (по умолчанию - по 4 на процесс), результаты возвращаются в порядке rowid. """
+    workers = workers or os.cpu_count() or 1
+    bounds = split_into_shards(path, tablename, shards or 4 * workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(build_shard, [path] * len(bounds), [tablename] * len(bounds), bounds)
+        return [record for part in parts for record in part]
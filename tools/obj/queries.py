@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+from collections import namedtuple
+from typing import ClassVar, Optional
+
+from service_for_my_projects import InvalidValue
+
+Predicate = namedtuple('Predicate', ['column', 'operator', 'value'])   # условие отбора записей по столбцу
+
+
+class ToolQuery:
+    """ Составной запрос к таблице инструментов: условия отбора по столбцам, упорядочивание и ограничение количества
+    записей. Запрос неизменяемый: каждый метод возвращает новый запрос, поэтому запросы можно составлять из общих
+    частей и использовать как ключи кеша. Запрос выполняется источником записей (ToolRecordRequester - одним
+    SQL-запросом с параметрами, ToolSnapshot - по индексам в памяти) через ToolFinder.select.
+
+    Операторы условий:
+        eq : значение столбца равно value (None - пропуск).
+        in : значение столбца из набора value.
+        between : значение столбца в диапазоне value = (min, max), границы включаются, None - без границы.
+        contains : столбец со списком значений через запятую (например, 'Торцовая, Цилиндрическая') содержит value.
+
+    Пример:
+        ToolQuery().type_tool("Фреза").dia(40, 63).z(8, None).order_by("D").limit(10)
+    """
+    OPERATORS: ClassVar[tuple] = ("eq", "in", "between", "contains")
+
+    def __init__(self, predicates: tuple = (), ordering: Optional[tuple] = None,
+                 max_count: Optional[int] = None) -> None:
+        self._predicates = tuple(predicates)
+        self._ordering = ordering
+        self._max_count = max_count
+
+    @property
+    def predicates(self) -> tuple:
+        """ Возвращает условия отбора (Predicate). """
+        return self._predicates
+
+    @property
+    def ordering(self) -> Optional[tuple]:
+        """ Возвращает упорядочивание (столбец, по убыванию) или None - в порядке записей таблицы. """
+        return self._ordering
+
+    @property
+    def max_count(self) -> Optional[int]:
+        """ Возвращает максимальное количество записей (None - не ограничено). """
+        return self._max_count
+
+    def where(self, column: str, operator: str, value) -> "ToolQuery":
+        """ Возвращает запрос с дополнительным условием operator(column, value). """
+        if operator not in self.OPERATORS:
+            raise InvalidValue(f"Оператор условия должен быть из списка {self.OPERATORS}, получено: {operator}")
+        if operator == "in":
+            value = tuple(value)
+        elif operator == "between":
+            value = tuple(value)
+            if len(value) != 2:
+                raise InvalidValue(f"Для оператора between ожидается диапазон (min, max), получено: {value}")
+        elif operator == "contains" and isinstance(value, type(None)):
+            raise InvalidValue("Для оператора contains ожидается значение, получено: None")
+        return ToolQuery(self._predicates + (Predicate(column, operator, value),), self._ordering, self._max_count)
+
+    def _equal(self, column: str, values: tuple) -> "ToolQuery":
+        return self.where(column, "eq", values[0]) if len(values) == 1 else self.where(column, "in", values)
+
+    def type_tool(self, *values: str) -> "ToolQuery":
+        """ Тип инструмента (одно из значений values). """
+        return self._equal("Тип_инструмента", values)
+
+    def standard(self, *values: str) -> "ToolQuery":
+        """ Стандарт инструмента (одно из значений values). """
+        return self._equal("Стандарт", values)
+
+    def marking(self, *values: str) -> "ToolQuery":
+        """ Обозначение инструмента (одно из значений values). """
+        return self._equal("Обозначение", values)
+
+    def dia(self, dia_min: Optional[float] = None, dia_max: Optional[float] = None) -> "ToolQuery":
+        """ Диаметр инструмента в диапазоне [dia_min, dia_max]. """
+        return self.where("D", "between", (dia_min, dia_max))
+
+    def inner_dia(self, dia_min: Optional[float] = None, dia_max: Optional[float] = None) -> "ToolQuery":
+        """ Диаметр отверстия (насадного инструмента) в диапазоне [dia_min, dia_max]. """
+        return self.where("d_", "between", (dia_min, dia_max))
+
+    def length(self, length_min: Optional[float] = None, length_max: Optional[float] = None) -> "ToolQuery":
+        """ Длина инструмента в диапазоне [length_min, length_max]. """
+        return self.where("L", "between", (length_min, length_max))
+
+    def z(self, z_min: Optional[float] = None, z_max: Optional[float] = None) -> "ToolQuery":
+        """ Количество зубьев (режущих граней) в диапазоне [z_min, z_max]. """
+        return self.where("z", "between", (z_min, z_max))
+
+    def material(self, value) -> "ToolQuery":
+        """ Допустимый материал режущей части (код типа материала). """
+        return self.where("mat_", "contains", value)
+
+    def tolerance(self, value: str) -> "ToolQuery":
+        """ Точность инструмента (одно из значений столбца 'Точность'). """
+        return self.where("Точность", "contains", value)
+
+    def type_cutter(self, value: str) -> "ToolQuery":
+        """ Тип фрезы (одно из значений столбца 'type_cutter_'). """
+        return self.where("type_cutter_", "contains", value)
+
+    def order_by(self, column: str, descending: bool = False) -> "ToolQuery":
+        """ Возвращает запрос с упорядочиванием записей по столбцу column (пропуски - в конце). """
+        return ToolQuery(self._predicates, (column, descending), self._max_count)
+
+    def limit(self, count: Optional[int]) -> "ToolQuery":
+        """ Возвращает запрос с ограничением количества записей (None - без ограничения). """
+        if not isinstance(count, type(None)) and count < 0:
+            raise InvalidValue(f"Количество записей должно быть неотрицательным, получено: {count}")
+        return ToolQuery(self._predicates, self._ordering, count)
+
+    @property
+    def columns(self) -> list:
+        """ Возвращает столбцы, используемые запросом. """
+        columns = [predicate.column for predicate in self._predicates]
+        if not isinstance(self._ordering, type(None)):
+            columns.append(self._ordering[0])
+        return list(dict.fromkeys(columns))
+
+    def _key(self) -> tuple:
+        return self._predicates, self._ordering, self._max_count
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ToolQuery) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        conditions = " AND ".join(f"{p.column} {p.operator} {p.value!r}" for p in self._predicates) or "все записи"
+        ordering = "" if isinstance(self._ordering, type(None)) else \
+            f", ORDER BY {self._ordering[0]}{' DESC' if self._ordering[1] else ''}"
+        limit = "" if isinstance(self._max_count, type(None)) else f", LIMIT {self._max_count}"
+        return f"ToolQuery({conditions}{ordering}{limit})"
+
+
+def list_tokens(value) -> tuple:
+    """ Возвращает варианты записи значения value в списке значений через запятую (без пробелов). Числа в таблице
+    записаны в разном виде ('1' и '1.0'). """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return tuple(dict.fromkeys([f"{float(value):g}", str(float(value))]))
+    return (str(value).replace(" ", ""), )
+
+
+def list_contains(cell, tokens: tuple) -> bool:
+    """ Проверяет, содержит ли список значений через запятую cell один из вариантов tokens. """
+    if not isinstance(cell, str):
+        return False
+    return any(item in tokens for item in cell.replace(" ", "").split(","))
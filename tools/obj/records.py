@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+from typing import ClassVar, Optional
+
+from tools.obj.entities import Tool, AxialSizes, PrismaticSizes, BladeMaterial, Tolerance, DrillingCutter, \
+    MillingCutter, TurningCutter
+
+
+class ToolRecord:
+    """ Облегченная неизменяемая запись инструмента для хранения результатов поиска (например, всего каталога) в
+    памяти. Значения полей модели хранятся в слотах, свойства и словарь параметров вычисляются теми же методами, что и
+    у модели. Полная модель инструмента создается методом to_model.
+
+    Parameters:
+        model: type : Класс модели инструмента.
+        values: dict : Значения полей модели {поле: значение}.
+        name: str : Собственное наименование инструмента (None - наименование по умолчанию).
+    """
+    __slots__ = ("_model", "_name")
+    # Поля модели, хранимые записью
+    FIELDS: ClassVar[tuple] = ()
+
+    def __init__(self, model, values: dict, name: Optional[str] = None) -> None:
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_name", name)
+        for field in self.FIELDS:
+            object.__setattr__(self, field, values[field])
+
+    @classmethod
+    def from_tool(cls, tool: Tool) -> "ToolRecord":
+        """ Возвращает запись с полями и наименованием экземпляра модели tool. """
+        return cls(type(tool), {field: getattr(tool, field) for field in cls.FIELDS}, getattr(tool, "_name", None))
+
+    def to_model(self) -> Tool:
+        """ Возвращает экземпляр модели инструмента с полями и наименованием записи. """
+        tool = self._model.construct(**self.values)
+        if not isinstance(self._name, type(None)):
+            tool.name = self._name
+        return tool
+
+    @property
+    def values(self) -> dict:
+        """ Возвращает значения полей модели {поле: значение}. """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @property
+    def model(self) -> type:
+        return self._model
+
+    name = property(Tool.name.fget)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"Запись {self.__class__.__name__} не изменяется. Используйте to_model().")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError(f"Запись {self.__class__.__name__} не изменяется. Используйте to_model().")
+
+    def __reduce__(self):
+        return self.__class__, (self._model, self.values, self._name)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ToolRecord):
+            return NotImplemented
+        return (self.__class__, self._model, self._name, self.values) == \
+            (other.__class__, other._model, other._name, other.values)
+
+    def __hash__(self) -> int:
+        return hash((self.__class__, self._model, self._name, tuple(self.values.values())))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._model.__name__}: {self.name})"
+
+
+class DrillingCutterRecord(ToolRecord):
+    """ Запись сверла (зенкера, развертки). """
+    FIELDS = tuple(DrillingCutter.model_fields)
+    __slots__ = FIELDS
+
+    gabarit_volume = AxialSizes.gabarit_volume
+    gabarit_str = AxialSizes.gabarit_str
+    type_of_mat = BladeMaterial.type_of_mat
+    tolerance = property(Tolerance.tolerance.fget)
+    parameters = DrillingCutter.parameters
+    _parameters = DrillingCutter._parameters
+
+
+class MillingCutterRecord(DrillingCutterRecord):
+    """ Запись фрезы. """
+    FIELDS = tuple(MillingCutter.model_fields)
+    __slots__ = tuple(field for field in FIELDS if field not in DrillingCutterRecord.FIELDS)
+
+    _parameters = MillingCutter._parameters
+
+
+class TurningCutterRecord(ToolRecord):
+    """ Запись резца. """
+    FIELDS = tuple(TurningCutter.model_fields)
+    __slots__ = FIELDS
+
+    gabarit_volume = PrismaticSizes.gabarit_volume
+    gabarit_str = PrismaticSizes.gabarit_str
+    type_of_mat = BladeMaterial.type_of_mat
+    tolerance = property(Tolerance.tolerance.fget)
+    parameters = TurningCutter.parameters
+    _parameters = TurningCutter._parameters
+
+
+# Классы записей по классам моделей (наследники классов моделей получают запись родителя)
+RECORDS_BY_MODEL = {
+    MillingCutter: MillingCutterRecord,
+    TurningCutter: TurningCutterRecord,
+    DrillingCutter: DrillingCutterRecord,
+}
+
+
+def to_record(tool):
+    """ Возвращает запись ToolRecord для экземпляра модели tool. Инструменты без класса записи (например, протяжки),
+    None и ErrorWithData возвращаются без изменений. """
+    for model, record_class in RECORDS_BY_MODEL.items():
+        if isinstance(tool, model):
+            return record_class.from_tool(tool)
+    return tool
@@ -0,0 +1,442 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import contextlib
+import pathlib
+import sqlite3
+import threading
+from typing import ClassVar, Optional, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from service_for_my_projects import logged
+from service_for_my_projects import output_debug_message_for_init_method as debug_for_init
+
+from tools.obj.constants import COLUMNS_FOR_PREPARERS, INDEXES_FOR_TOOLS
+from tools.obj.indexes import PrefixIndex, SortedIndex
+from tools.obj.queries import ToolQuery, list_tokens
+
+
+def quote(name: str) -> str:
+    """ Возвращает имя столбца (таблицы, индекса) в кавычках для подстановки в SQL-запрос. """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def connect_read_only(path: str, immutable: bool = False, mmap_size: int = 0,
+                      cached_statements: int = 128) -> sqlite3.Connection:
+    """ Открывает соединение с БД path только для чтения.
+
+    Parameters:
+        path: str : Путь к файлу БД.
+        immutable: bool : Считать файл БД неизменяемым (SQLite не проверяет изменения файла и не блокирует его).
+        mmap_size: int : Объем файла БД в байтах, читаемый через отображение в память (0 - не отображать).
+        cached_statements: int : Количество подготовленных запросов, хранимых соединением для повторного использования.
+    """
+    uri = f"{pathlib.Path(path).resolve().as_uri()}?mode=ro{'&immutable=1' if immutable else ''}"
+    connection = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=cached_statements)
+    if mmap_size:
+        connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return connection
+
+
+class ConnectionPool:
+    """ Потокобезопасный пул соединений с БД только для чтения. Соединения открываются по мере необходимости (не более
+    size), возвращаются в пул после использования и повторно используются вместе с подготовленными запросами. Файл БД
+    читается через отображение в память, поэтому страницы берутся из кеша ОС. Если соединений не хватает, поток ожидает
+    освобождения соединения.
+
+    Parameters:
+        path: str : Путь к файлу БД.
+        size: int : Максимальное количество соединений.
+        mmap_size: int : Объем файла БД в байтах, читаемый через отображение в память.
+        immutable: bool : Считать файл БД неизменяемым. Изменения БД, сделанные после открытия соединений, не видны.
+        cached_statements: int : Количество подготовленных запросов, хранимых каждым соединением.
+        timeout: float : Время ожидания свободного соединения в секундах (None - не ограничено). По истечении
+            возбуждается TimeoutError.
+    """
+    def __init__(self, path: str, size: int = 4, mmap_size: int = 64 * 1024 * 1024, immutable: bool = True,
+                 cached_statements: int = 256, timeout: Optional[float] = 30.0) -> None:
+        self._path = path
+        self._size = max(1, size)
+        self._mmap_size = mmap_size
+        self._immutable = immutable
+        self._cached_statements = cached_statements
+        self._timeout = timeout
+        self._idle = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.acquired = 0
+        self.reused = 0
+        self.waits = 0
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """ Выдает соединение из пула на время блока with. """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._release(connection)
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._condition:
+            waited = False
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError(f"Пул соединений с БД {self._path} закрыт")
+                if self._idle:
+                    self.acquired += 1
+                    self.reused += 1
+                    return self._idle.pop()
+                if self.created < self._size:
+                    self.created += 1
+                    self.acquired += 1
+                    break
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                if not self._condition.wait(self._timeout):
+                    raise TimeoutError(f"Нет свободных соединений с БД {self._path} в течение {self._timeout} с "
+                                       f"(соединений: {self._size}, все заняты). Увеличьте размер пула или закройте "
+                                       f"незавершенные запросы.")
+        try:
+            return connect_read_only(self._path, immutable=self._immutable, mmap_size=self._mmap_size,
+                                     cached_statements=self._cached_statements)
+        except Exception:
+            with self._condition:
+                self.created -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, connection: sqlite3.Connection) -> None:
+        with self._condition:
+            if self._closed:
+                connection.close()
+                self.created -= 1
+                return
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """ Закрывает свободные соединения пула. Выданные соединения закрываются при возврате в пул. """
+        with self._condition:
+            self._closed = True
+            for connection in self._idle:
+                connection.close()
+            self.created -= len(self._idle)
+            self._idle = []
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> dict:
+        """ Возвращает счетчики пула: открыто соединений, выдано соединений, из них повторно, ожиданий свободного
+        соединения, свободных соединений и максимальное количество соединений. """
+        with self._condition:
+            return {"created": self.created, "acquired": self.acquired, "reused": self.reused, "waits": self.waits,
+                    "idle": len(self._idle), "size": self._size}
+
+
+def missing_indexes(connection: sqlite3.Connection, indexes: Optional[dict] = None) -> dict:
+    """ Возвращает отсутствующие в БД индексы {имя индекса: индексируемые столбцы}.
+
+    Parameters:
+        connection: sqlite3.Connection : Соединение с БД (в том числе только для чтения).
+        indexes: dict : Индексы {имя индекса: индексируемые столбцы}. По умолчанию: INDEXES_FOR_TOOLS.
+    """
+    indexes = INDEXES_FOR_TOOLS if isinstance(indexes, type(None)) else indexes
+    existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    return {name: columns for name, columns in indexes.items() if name not in existing}
+
+
+def create_indexes(connection: sqlite3.Connection, tablename: str = "tools", indexes: Optional[dict] = None) -> list:
+    """ Создает отсутствующие индексы таблицы tablename (только командой python -m tools.scr.migrate: во время
+    работы пакета БД открывается только для чтения). Возвращает список имен созданных индексов.
+
+    Parameters:
+        connection: sqlite3.Connection : Соединение с БД с правами на запись.
+        tablename: str : Имя таблицы инструментов.
+        indexes: dict : Индексы {имя индекса: индексируемые столбцы}. По умолчанию: INDEXES_FOR_TOOLS.
+    """
+    created = []
+    with connection:
+        for name, columns in missing_indexes(connection, indexes).items():
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {quote(name)} ON {quote(tablename)} "
+                               f"({', '.join(quote(column) for column in columns)})")
+            created.append(name)
+        if created:
+            connection.execute("ANALYZE")
+    return created
+
+
+@logged
+class ToolRecordRequester:
+    """ Выполняет запросы к таблице инструментов SQLite по индексированным столбцам. Выбирает из таблицы только
+    столбцы columns (по умолчанию - используемые при подготовке данных для классов инструментов). Реализует методы
+    RecordRequester, используемые ToolFinder.
+
+    Parameters:
+        path: str : Путь к файлу БД.
+        tablename: str : Имя таблицы инструментов.
+        columns: Iterable[str] : Выбираемые столбцы. None - выбирать все столбцы.
+        with_indexes: bool : Проверять при первом подключении к БД наличие индексов INDEXES_FOR_TOOLS и сообщать об
+            отсутствующих. Индексы создаются командой python -m tools.scr.migrate: БД открывается только для чтения.
+        pool: ConnectionPool : Пул соединений. Если указан, запросы выполняются через соединения пула (одновременно
+            из нескольких потоков).
+    """
+    # Текстовые столбцы таблицы, содержащие числовые значения
+    TEXT_NUMERIC_COLUMNS: ClassVar[tuple] = ("d_", )
+    # Имя столбца с rowid записи и максимальное количество параметров в одном запросе
+    ROWID: ClassVar[str] = "_rowid"
+    MAX_VARIABLES: ClassVar[int] = 900
+
+    @debug_for_init()
+    def __init__(self, path: str, tablename: str = "tools", columns: Optional[Iterable[str]] = COLUMNS_FOR_PREPARERS,
+                 with_indexes: bool = False, pool: Optional[ConnectionPool] = None) -> None:
+        self._path = path
+        self._tablename = tablename
+        self._columns = None if isinstance(columns, type(None)) else list(columns)
+        self._with_indexes = with_indexes
+        self._pool = pool
+        self._connection = None
+        self._lock = threading.Lock()
+        self._sorted_indexes = {}
+        self._prefix_indexes = {}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """ Возвращает соединение с БД только для чтения (открывается при первом обращении). """
+        if isinstance(self._connection, type(None)):
+            connection = connect_read_only(self._path)
+            self._check_indexes(connection)
+            self._connection = connection
+        return self._connection
+
+    def _check_indexes(self, connection: sqlite3.Connection) -> None:
+        if not self._with_indexes:
+            return
+        self._with_indexes = False
+        missing = missing_indexes(connection)
+        if missing:
+            self.error(f"В таблице {self._tablename} отсутствуют индексы {', '.join(missing)}: поиск выполняется "
+                       f"без них. Создайте индексы командой 'python -m tools.scr.migrate' с правами на запись в БД.")
+
+    @contextlib.contextmanager
+    def _connected(self) -> Iterator[sqlite3.Connection]:
+        """ Выдает соединение для выполнения запроса: из пула или собственное (под блокировкой). """
+        if isinstance(self._pool, type(None)):
+            with self._lock:
+                yield self.connection
+            return
+        with self._pool.connection() as connection:
+            if self._with_indexes:
+                with self._lock:
+                    self._check_indexes(connection)
+            yield connection
+
+    @property
+    def _select(self) -> str:
+        columns = "*" if isinstance(self._columns, type(None)) else ", ".join(quote(c) for c in self._columns)
+        return f"SELECT {columns} FROM {quote(self._tablename)}"
+
+    @property
+    def _select_with_rowid(self) -> str:
+        return self._select.replace("SELECT ", f"SELECT rowid AS {quote(self.ROWID)}, ", 1)
+
+    def _read(self, query: str, params: Optional[list] = None) -> pd.DataFrame:
+        with self._connected() as connection:
+            return pd.read_sql_query(query, connection, params=params)
+
+    def _conditions(self, keys: Optional[dict]) -> tuple:
+        """ Возвращает условия SQL равенства значений столбцов значениям словаря keys и их параметры. """
+        conditions, params = [], []
+        for column, value in ({} if isinstance(keys, type(None)) else keys).items():
+            if column in self.TEXT_NUMERIC_COLUMNS:
+                # Числа в текстовом столбце записаны в разном виде ('16' и '16.0')
+                conditions.append(f"{quote(column)} IN (?, ?)")
+                params.extend([str(float(value)), f"{float(value):g}"])
+            else:
+                conditions.append(f"{quote(column)} = ?")
+                params.append(value)
+        return conditions, params
+
+    def _query(self, keys: Optional[dict]) -> tuple:
+        """ Возвращает запрос записей, значения столбцов которых равны значениям словаря keys, и его параметры. """
+        conditions, params = self._conditions(keys)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"{self._select}{where} ORDER BY rowid", params
+
+    def get_records(self, keys: dict) -> pd.DataFrame:
+        """ Возвращает записи, значения столбцов которых равны значениям словаря keys {столбец: значение}. """
+        return self._read(*self._query(keys))
+
+    def _numeric(self, column: str) -> str:
+        """ Возвращает выражение SQL со значением столбца column в виде числа (NULL - нечисловые значения). """
+        if column in self.TEXT_NUMERIC_COLUMNS:
+            return f"(CASE WHEN {quote(column)} GLOB '[0-9]*' THEN CAST({quote(column)} AS REAL) END)"
+        return quote(column)
+
+    def _condition(self, column: str, operator: str, value) -> tuple:
+        """ Возвращает условие SQL для условия запроса ToolQuery и его параметры. """
+        if operator == "eq" and isinstance(value, type(None)):
+            return f"{quote(column)} IS NULL", []
+        if operator in ("eq", "in"):
+            values = [value] if operator == "eq" else list(value)
+            if column in self.TEXT_NUMERIC_COLUMNS:
+                values = [spelling for number in values for spelling in (str(float(number)), f"{float(number):g}")]
+            if not values:
+                return "0", []
+            if len(values) == 1:
+                return f"{quote(column)} = ?", values
+            return f"{quote(column)} IN ({', '.join('?' * len(values))})", values
+        if operator == "between":
+            expression = self._numeric(column)
+            conditions, params = [f"{expression} IS NOT NULL"], []
+            for sign, bound in zip((">=", "<="), value):
+                if not isinstance(bound, type(None)):
+                    conditions.append(f"{expression} {sign} ?")
+                    params.append(float(bound))
+            return " AND ".join(conditions), params
+        # contains: значение в списке значений через запятую (пробелы в списке не учитываются)
+        tokens = list_tokens(value)
+        item_list = f"(',' || REPLACE({quote(column)}, ' ', '') || ',')"
+        return "(" + " OR ".join([f"instr({item_list}, ?) > 0"] * len(tokens)) + ")", [f",{t}," for t in tokens]
+
+    def _compile(self, query: ToolQuery) -> tuple:
+        """ Возвращает запрос SQL с параметрами, выполняющий запрос query. """
+        conditions, params = [], []
+        for predicate in query.predicates:
+            condition, condition_params = self._condition(*predicate)
+            conditions.append(condition)
+            params.extend(condition_params)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "rowid"
+        if not isinstance(query.ordering, type(None)):
+            column, descending = query.ordering
+            expression = self._numeric(column)
+            order = f"{expression} IS NULL, {expression}{' DESC' if descending else ''}, rowid"
+        limit = ""
+        if not isinstance(query.max_count, type(None)):
+            limit = " LIMIT ?"
+            params.append(query.max_count)
+        return f"{self._select}{where} ORDER BY {order}{limit}", params
+
+    def select(self, query: ToolQuery) -> pd.DataFrame:
+        """ Возвращает записи, удовлетворяющие запросу query, одним запросом SQL с параметрами. """
+        return self._read(*self._compile(query))
+
+    def explain(self, query: ToolQuery) -> str:
+        """ Возвращает описание выполнения запроса query: запрос SQL, параметры и план выполнения SQLite. """
+        sql, params = self._compile(query)
+        with self._connected() as connection:
+            plan = [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        return "\n".join([sql, f"Параметры: {params}"] + [f"  {step}" for step in plan])
+
+    def iter_records(self, keys: Optional[dict] = None, chunksize: int = 1000) -> Iterator[pd.DataFrame]:
+        """ Возвращает записи (все или со значениями столбцов, равными значениям словаря keys) частями по chunksize
+        записей. Очередная часть читается из БД только при обращении к ней отдельным запросом (по rowid после
+        последней прочитанной записи): соединение не удерживается между частями, поэтому незавершенные генераторы не
+        занимают соединения пула. """
+        conditions, params = self._conditions(keys)
+        last = None
+        while True:
+            where = conditions if isinstance(last, type(None)) else conditions + ["rowid > ?"]
+            where = f" WHERE {' AND '.join(where)}" if where else ""
+            query = f"{self._select_with_rowid}{where} ORDER BY rowid LIMIT ?"
+            records = self._read(query, params + ([] if isinstance(last, type(None)) else [last]) + [chunksize])
+            if records.empty:
+                break
+            last = int(records[self.ROWID].iloc[-1])
+            yield records.drop(columns=self.ROWID)
+            if len(records) < chunksize:
+                break
+
+    def sorted_index(self, column: str, type_tool: Optional[str] = None) -> SortedIndex:
+        """ Возвращает упорядоченный индекс числового столбца column (по записям типа type_tool или по всем записям).
+        Индекс загружается из БД при первом обращении. Идентификаторы записей в индексе - rowid таблицы. """
+        key = (column, type_tool)
+        if key not in self._sorted_indexes:
+            query = f"SELECT rowid, {quote(column)} FROM {quote(self._tablename)}"
+            params = []
+            if not isinstance(type_tool, type(None)):
+                query += f" WHERE {quote('Тип_инструмента')} = ?"
+                params.append(type_tool)
+            with self._connected() as connection:
+                rows = connection.execute(query, params).fetchall()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            values = pd.to_numeric(pd.Series([row[1] for row in rows], dtype=object), errors="coerce")
+            self._sorted_indexes[key] = SortedIndex(values.to_numpy(dtype=float), ids)
+        return self._sorted_indexes[key]
+
+    def prefix_index(self, column: str, type_tool: Optional[str] = None) -> PrefixIndex:
+        """ Возвращает префиксный индекс текстового столбца column (по записям типа type_tool или по всем записям).
+        Индекс загружается из БД при первом обращении. Идентификаторы записей в индексе - rowid таблицы. """
+        key = (column, type_tool)
+        if key not in self._prefix_indexes:
+            ids, df = self.column_values([column], type_tool)
+            self._prefix_indexes[key] = PrefixIndex(df[column].tolist(), ids)
+        return self._prefix_indexes[key]
+
+    def column_values(self, columns: Iterable[str], type_tool: Optional[str] = None) -> tuple:
+        """ Возвращает идентификаторы (rowid) записей типа type_tool (или всех записей) и значения их столбцов
+        columns одним запросом: (np.ndarray, pd.DataFrame). Столбцы выбираются из таблицы независимо от выбираемых
+        в записях (например, столбцы условий запросов). """
+        columns = list(columns)
+        query = f"SELECT rowid AS {quote(self.ROWID)}, {', '.join(quote(c) for c in columns)} " \
+                f"FROM {quote(self._tablename)}"
+        params = []
+        if not isinstance(type_tool, type(None)):
+            query += f" WHERE {quote('Тип_инструмента')} = ?"
+            params.append(type_tool)
+        df = self._read(f"{query} ORDER BY rowid", params)
+        return df.pop(self.ROWID).to_numpy(dtype=np.int64), df
+
+    def get_records_by_ids(self, ids: np.ndarray) -> pd.DataFrame:
+        """ Возвращает записи с идентификаторами (rowid) ids в порядке ids. """
+        ids = [int(i) for i in ids]
+        unique = list(dict.fromkeys(ids))
+        frames = [self._read(f"{self._select_with_rowid} WHERE rowid IN ({', '.join('?' * len(chunk))})", chunk)
+                  for chunk in (unique[i:i + self.MAX_VARIABLES] for i in range(0, len(unique), self.MAX_VARIABLES))]
+        if not frames:
+            return self._read(f"{self._select} LIMIT 0")
+        records = pd.concat(frames, ignore_index=True).set_index(self.ROWID)
+        return records.loc[ids].reset_index(drop=True)
+
+    def get_records_by_values(self, column: str, values: Iterable) -> pd.DataFrame:
+        """ Возвращает записи, значение столбца column которых входит в набор values, в порядке записей таблицы.
+        Значения передаются частями по MAX_VARIABLES через одно соединение с БД. """
+        values = list(dict.fromkeys(values))
+        with self._connected() as connection:
+            frames = [pd.read_sql_query(f"{self._select_with_rowid} WHERE {quote(column)} IN "
+                                        f"({', '.join('?' * len(chunk))})", connection, params=chunk)
+                      for chunk in (values[i:i + self.MAX_VARIABLES]
+                                    for i in range(0, len(values), self.MAX_VARIABLES))]
+        if not frames:
+            return self._read(f"{self._select} LIMIT 0")
+        records = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return records.sort_values(self.ROWID, kind="stable").drop(columns=self.ROWID).reset_index(drop=True)
+
+    @property
+    def get_all_records(self) -> pd.DataFrame:
+        """ Возвращает все записи таблицы. """
+        return self._read(*self._query(None))
+
+    @property
+    def available_values(self) -> dict:
+        """ Возвращает наборы доступных в таблице значений по категориям (типам инструментов и стандартам). """
+        with self._connected() as connection:
+            return {column: [row[0] for row in connection.execute(
+                        f"SELECT DISTINCT {quote(column)} FROM {quote(self._tablename)} ORDER BY 1")]
+                    for column in ("Тип_инструмента", "Стандарт")}
+
+    def invalidate(self) -> None:
+        """ Удаляет загруженные упорядоченные и префиксные индексы (после изменения БД). """
+        self._sorted_indexes = {}
+        self._prefix_indexes = {}
+
+    def close(self) -> None:
+        """ Закрывает соединение с БД. """
+        if not isinstance(self._connection, type(None)):
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import ClassVar, Optional
+
+import numpy as np
+import pandas as pd
+
+from service_for_my_projects import InvalidValue, logged
+
+from tools.obj.constants import COLUMNS_FOR_SEARCH, COLUMNS_FOR_SHANK
+from tools.obj.requesters import quote
+
+# Результат полнотекстового поиска: идентификаторы записей и их оценки релевантности (по убыванию)
+Hits = namedtuple('Hits', ['ids', 'scores'])
+
+
+def normalize(text: str) -> str:
+    """ Приводит текст к виду, в котором он индексируется и ищется: нижний регистр, "ё" заменяется на "е". """
+    return text.casefold().replace("ё", "е")
+
+
+def stem(word: str, endings: tuple, minimum: int = 3) -> str:
+    """ Возвращает основу слова word без окончания из endings (самого длинного из подходящих), если длина основы не
+    меньше minimum. Слова из цифр и короткие слова не изменяются. """
+    if word.isdigit():
+        return word
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= minimum:
+            return word[:-len(ending)]
+    return word
+
+
+@logged
+class ToolSearchIndex:
+    """ Полнотекстовый индекс таблицы инструментов в SQLite FTS5 (в памяти или в файле path) для поиска по словам
+    описательных столбцов, обозначению, стандарту и наименованиям инструментов.
+
+    Текст разбивается на слова токенизатором unicode61 (регистр и диакритические знаки не учитываются, "ё" заменяется
+    на "е"). Для поиска по словоформам русского языка у слов запроса отбрасываются окончания, а основы ищутся как
+    префиксы: "коническим хвостовиком" находит "конический хвостовик", "левое" - "Левые" и "Леворежущие". Все слова
+    запроса должны встречаться в записи, записи упорядочиваются по релевантности (bm25).
+
+    Parameters:
+        path: str : Файл индекса (по умолчанию - в памяти процесса).
+    """
+    # Индексируемые столбцы таблицы
+    COLUMNS: ClassVar[tuple] = tuple(COLUMNS_FOR_SEARCH)
+    # Столбцы, по значениям которых отбираются найденные записи (filters)
+    FILTER_COLUMNS: ClassVar[tuple] = ("Тип_инструмента", "Стандарт", "Обозначение")
+    # Столбцы конусов хвостовика и описание хвостовика, добавляемое в индекс при заполненном значении
+    SHANK_COLUMNS: ClassVar[tuple] = tuple(COLUMNS_FOR_SHANK)
+    SHANK: ClassVar[str] = "конический хвостовик"
+    # Столбцы таблицы, значения которых нужны для построения индекса
+    SOURCE_COLUMNS: ClassVar[tuple] = COLUMNS + SHANK_COLUMNS
+    # Окончания, отбрасываемые у слов запроса (более длинные - раньше)
+    ENDINGS: ClassVar[tuple] = ("ыми", "ими", "ого", "его", "ому", "ему", "ами", "ями", "ая", "яя", "ое", "ее", "ые",
+                                "ие", "ый", "ий", "ой", "ей", "ым", "им", "ом", "ем", "ую", "юю", "ых", "их", "ах",
+                                "ях", "ов", "ев", "ам", "ям", "а", "я", "о", "е", "ы", "и", "у", "ю", "ь")
+    TABLENAME: ClassVar[str] = "tools_search"
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._built = self._exists()
+
+    @property
+    def columns(self) -> tuple:
+        """ Возвращает столбцы индекса: наименование, описание хвостовика и индексируемые столбцы таблицы. """
+        return ("name", "shank", *self.COLUMNS)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def _exists(self) -> bool:
+        with self._lock:
+            row = self._connection.execute("SELECT count(*) FROM sqlite_master WHERE name = ?",
+                                           [self.TABLENAME]).fetchone()
+        return bool(row[0])
+
+    def build(self, ids: np.ndarray, records: pd.DataFrame, names: Optional[dict] = None) -> None:
+        """ Строит индекс заново по значениям столбцов записей.
+
+        Parameters:
+            ids: np.ndarray : Идентификаторы записей (возвращаются при поиске).
+            records: pd.DataFrame : Значения столбцов COLUMNS и SHANK_COLUMNS записей (отсутствующие столбцы
+                пропускаются).
+            names: dict : Наименования инструментов {идентификатор записи: наименование}.
+        """
+        names = {} if isinstance(names, type(None)) else names
+        texts = [[normalize(value) if isinstance(value, str) else None
+                  for value in (records[column] if column in records else [None] * len(records))]
+                 for column in self.COLUMNS]
+        shank = np.zeros(len(records), dtype=bool)
+        for column in self.SHANK_COLUMNS:
+            if column in records:
+                shank |= records[column].notna().to_numpy()
+        rows = [(int(record_id), normalize(names[record_id]) if record_id in names else None,
+                 self.SHANK if has_shank else None, *values)
+                for record_id, has_shank, *values in zip(ids.tolist(), shank.tolist(), *texts)]
+        columns = ", ".join(quote(column) for column in self.columns)
+        with self._lock, self._connection:
+            self._connection.execute(f"DROP TABLE IF EXISTS {self.TABLENAME}")
+            self._connection.execute(f"CREATE VIRTUAL TABLE {self.TABLENAME} USING fts5({columns}, "
+                                     f"tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')")
+            self._connection.executemany(f"INSERT INTO {self.TABLENAME} (rowid, {columns}) "
+                                         f"VALUES ({', '.join('?' * (len(self.columns) + 1))})", rows)
+            self._connection.execute(f"INSERT INTO {self.TABLENAME} ({self.TABLENAME}) VALUES ('optimize')")
+        self._built = True
+        self.debug(f"Построен полнотекстовый индекс: записей {len(rows)}, наименований {len(names)}.")
+
+    def expression(self, text: str) -> str:
+        """ Возвращает выражение запроса FTS5 по тексту text: основы всех слов текста как префиксы. """
+        words = re.findall(r"\w+", normalize(text))
+        return " ".join(f'"{stem(word, self.ENDINGS)}"*' for word in words)
+
+    def search(self, text: str, filters: Optional[dict] = None, limit: Optional[int] = 20) -> Hits:
+        """ Возвращает идентификаторы записей, содержащих все слова текста text, и их оценки релевантности
+        (по убыванию оценки).
+
+        Parameters:
+            text: str : Искомые слова (например, "фреза концевая")
+            filters: dict : Значения столбцов FILTER_COLUMNS найденных записей {столбец: значение или список значений}
+            limit: int : Наибольшее количество записей. None - все найденные записи
+        """
+        expression = self.expression(text)
+        if not expression:
+            return Hits(np.empty(0, dtype=np.int64), np.empty(0))
+        query = f"SELECT rowid, bm25({self.TABLENAME}) FROM {self.TABLENAME} WHERE {self.TABLENAME} MATCH ?"
+        params = [expression]
+        for column, values in ({} if isinstance(filters, type(None)) else filters).items():
+            if column not in self.FILTER_COLUMNS:
+                raise InvalidValue(f"Найденные записи отбираются по столбцам {self.FILTER_COLUMNS}, получено: {column}")
+            values = [values] if isinstance(values, str) else list(values)
+            query += f" AND {quote(column)} IN ({', '.join('?' * len(values))})"
+            params += [normalize(value) for value in values]
+        query += f" ORDER BY bm25({self.TABLENAME}), rowid"
+        if not isinstance(limit, type(None)):
+            query += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return Hits(np.array([row[0] for row in rows], dtype=np.int64), np.array([-row[1] for row in rows]))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def clear(self) -> None:
+        """ Удаляет индекс (после изменения БД индекс строится заново при следующем поиске). """
+        with self._lock, self._connection:
+            self._connection.execute(f"DROP TABLE IF EXISTS {self.TABLENAME}")
+        self._built = False
+
+    def __len__(self) -> int:
+        if not self._built:
+            return 0
+        with self._lock:
+            return self._connection.execute(f"SELECT count(*) FROM {self.TABLENAME}").fetchone()[0]
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+from collections import namedtuple
+from typing import Callable, ClassVar, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from service_for_my_projects import InvalidValue, logged
+from service_for_my_projects import output_debug_message_for_init_method as debug_for_init
+
+from tools.obj.constants import ACCURACY_CLASSES_OF_DRILLS, DEFAULT_SETTINGS_FOR_TOOL, MATERIALS_OF_CUTTING_PART
+from tools.obj.creators import ToolCreator
+from tools.obj.fields_types import InAccuracyStandards, parse_tolerance
+from tools.obj.finders import ToolFinder
+from tools.obj.instrumentation import INSTRUMENTATION, instrumented
+
+# Описание отверстия: диаметр (мм), допуск (например, 'H8'; None - допуск по умолчанию типа инструмента), глубина
+# (мм; None - не учитывается), предпочтительный материал режущей части (наименование или код
+# MATERIALS_OF_CUTTING_PART), тип инструмента (None - по допуску) и предпочтительные стандарты (по убыванию
+# предпочтения)
+HoleSpec = namedtuple('HoleSpec', ['dia', 'tolerance', 'depth', 'material', 'type_tool', 'standards'],
+                      defaults=(None, None, None, None, ()))
+# Результат подбора для отверстия: идентификаторы записей и оценки кандидатов (по убыванию оценки)
+Ranking = namedtuple('Ranking', ['ids', 'scores'])
+# Массивы кандидатов одного типа, упорядоченные по диаметру: идентификаторы записей, диаметр, длина, точность
+# (1 - наиболее точный класс, 0 - наименее точный или неизвестный), коды стандартов и их значения, допустимые
+# материалы режущей части (по кодам MATERIALS_OF_CUTTING_PART) и наличие списка материалов
+Candidates = namedtuple('Candidates', ['ids', 'dia', 'length', 'precision', 'standard_codes', 'standards',
+                                       'materials', 'with_materials'])
+
+
+def grade_rank(tolerance: str) -> int:
+    """ Возвращает номер квалитета допуска tolerance в ACCURACY_STANDARDS (меньше - точнее). """
+    return InAccuracyStandards.AVAILABLE_VALUES[parse_tolerance(tolerance)[1]]
+
+
+def drill_precision(value) -> float:
+    """ Возвращает точность по наиболее точному из классов в значении столбца 'Точность' (например, 'B, B1'): 1 -
+    наиболее точный класс, 0 - наименее точный или неизвестный. """
+    worst = max(ACCURACY_CLASSES_OF_DRILLS.values())
+    if not isinstance(value, str):
+        return 0.0
+    ranks = [ACCURACY_CLASSES_OF_DRILLS[item] for item in value.replace(" ", "").split(",")
+             if item in ACCURACY_CLASSES_OF_DRILLS]
+    return 1 - min(ranks) / worst if ranks else 0.0
+
+
+@logged
+class ToolSelector:
+    """ Подбор инструментов для обработки отверстий по описаниям HoleSpec. Кандидаты нужного типа оцениваются по
+    соответствию диаметра, длины глубине отверстия, точности сверла требуемому допуску, предпочтительным стандартам и
+    материалу режущей части. Оценки (от 0 до 1) складываются с весами weights.
+
+    Значения столбцов кандидатов каждого типа загружаются один раз и хранятся массивами numpy, упорядоченными по
+    диаметру: для отверстия оцениваются сразу все кандидаты в пределах dia_window от его диаметра. Инструменты по
+    лучшим кандидатам всех отверстий создаются одним вызовом create_many.
+
+    Если тип инструмента не указан, он определяется по квалитету допуска: выбирается тип с наиболее грубым
+    допуском по умолчанию (DEFAULT_SETTINGS_FOR_TOOL), не превышающим требуемого (сверло - H14, зенкер - H10,
+    развертка - H8 и точнее).
+
+    Parameters:
+        tool_creator: Callable[..., ToolCreator] : Фабрика создателей инструментов.
+        finder: Callable[..., ToolFinder] : Фабрика поисковиков.
+        dia_window: float : Наибольшее отклонение диаметра инструмента от диаметра отверстия (мм).
+        weights: dict : Веса оценок {оценка: вес} (по умолчанию - WEIGHTS).
+    """
+    TYPES: ClassVar[tuple] = ("Сверло", "Зенкер", "Развертка")
+    WEIGHTS: ClassVar[dict] = {"dia": 0.4, "length": 0.2, "tolerance": 0.2, "standard": 0.1, "material": 0.1}
+    COLUMNS: ClassVar[tuple] = ("D", "L", "Стандарт", "Точность", "mat_")
+
+    @debug_for_init()
+    def __init__(self, tool_creator: Callable[..., ToolCreator], finder: Callable[..., ToolFinder],
+                 dia_window: float = 0.5, weights: Optional[dict] = None) -> None:
+        weights = {} if isinstance(weights, type(None)) else dict(weights)
+        unknown = [name for name in weights if name not in self.WEIGHTS]
+        if unknown:
+            raise InvalidValue(f"Веса оценок должны быть из списка {list(self.WEIGHTS)}, получено: {unknown}")
+        if dia_window < 0:
+            raise InvalidValue(f"Отклонение диаметра должно быть неотрицательным, получено: {dia_window}")
+        self._tool_creator = tool_creator()
+        self._finder = finder()
+        self._dia_window = dia_window
+        self._weights = self.WEIGHTS | weights
+        self._candidates = {}
+        # Номера квалитетов допусков по умолчанию: {тип инструмента: номер}
+        self._grades = {type_tool: grade_rank(DEFAULT_SETTINGS_FOR_TOOL[type_tool]["tolerance"])
+                        for type_tool in self.TYPES}
+
+    def invalidate(self) -> None:
+        """ Удаляет загруженные массивы кандидатов (после изменения БД). """
+        self._candidates = {}
+
+    def type_for(self, tolerance: Optional[str]) -> str:
+        """ Возвращает тип инструмента для обработки отверстия с допуском tolerance (None - сверло). """
+        if isinstance(tolerance, type(None)):
+            return max(self._grades, key=self._grades.get)
+        rank = grade_rank(tolerance)
+        suitable = [type_tool for type_tool, grade in self._grades.items() if grade <= rank]
+        if not suitable:
+            return min(self._grades, key=self._grades.get)
+        return max(suitable, key=self._grades.get)
+
+    def candidates(self, type_tool: str) -> Candidates:
+        """ Возвращает массивы кандидатов типа type_tool (загружаются из БД при первом обращении). """
+        if type_tool not in self.TYPES:
+            raise InvalidValue(f"Тип инструмента должен быть из списка {self.TYPES}, получено: {type_tool}")
+        if type_tool not in self._candidates:
+            self._candidates[type_tool] = self._load(type_tool)
+        return self._candidates[type_tool]
+
+    def _load(self, type_tool: str) -> Candidates:
+        ids, df = self._finder.column_values(self.COLUMNS, type_tool)
+        dia = pd.to_numeric(df["D"], errors="coerce").to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(dia))
+        order = valid[np.argsort(dia[valid], kind="stable")]
+        df = df.iloc[order].reset_index(drop=True)
+        codes, standards = pd.factorize(df["Стандарт"])
+        materials = np.zeros((len(df), max(MATERIALS_OF_CUTTING_PART.values()) + 1), dtype=bool)
+        with_materials = df["mat_"].notna().to_numpy()
+        for row, value in zip(np.flatnonzero(with_materials), df["mat_"][with_materials]):
+            items = [int(item) for item in str(value).replace(" ", "").split(",") if item.isdigit()]
+            materials[row, [item for item in items if item < materials.shape[1]]] = True
+        candidates = Candidates(ids=np.asarray(ids)[order], dia=dia[order],
+                                length=pd.to_numeric(df["L"], errors="coerce").to_numpy(dtype=float),
+                                precision=np.array([drill_precision(value) for value in df["Точность"]], dtype=float),
+                                standard_codes=codes, standards={value: code for code, value in enumerate(standards)},
+                                materials=materials, with_materials=with_materials)
+        for array in (candidates.ids, candidates.dia, candidates.length, candidates.precision,
+                      candidates.standard_codes, candidates.materials, candidates.with_materials):
+            array.flags.writeable = False
+        if INSTRUMENTATION.messages:
+            self.debug(f"Загружены кандидаты типа {type_tool}: {len(order)}.")
+        return candidates
+
+    @staticmethod
+    def spec(hole) -> HoleSpec:
+        """ Возвращает описание отверстия HoleSpec по описанию hole (HoleSpec, словарь или диаметр). """
+        if isinstance(hole, HoleSpec):
+            spec = hole
+        elif isinstance(hole, dict):
+            spec = HoleSpec(**hole)
+        else:
+            spec = HoleSpec(dia=hole)
+        if isinstance(spec.dia, type(None)) or spec.dia <= 0:
+            raise InvalidValue(f"Диаметр отверстия должен быть положительным, получено: {spec.dia}")
+        return spec
+
+    def _scores(self, spec: HoleSpec, candidates: Candidates, type_tool: str) -> Ranking:
+        """ Возвращает оценки кандидатов candidates для отверстия spec, упорядоченные по убыванию. """
+        window = self._dia_window
+        start = np.searchsorted(candidates.dia, spec.dia - window, side="left")
+        stop = np.searchsorted(candidates.dia, spec.dia + window, side="right")
+        dia = candidates.dia[start:stop]
+        weights = self._weights
+        # Соответствие диаметра
+        scores = weights["dia"] * (1 - np.abs(dia - spec.dia) / window if window else np.ones(len(dia)))
+        # Длина инструмента не меньше глубины отверстия, более короткий инструмент - жестче
+        feasible = np.ones(len(dia), dtype=bool)
+        if not isinstance(spec.depth, type(None)):
+            length = candidates.length[start:stop]
+            feasible = length >= spec.depth
+            scores += weights["length"] * np.divide(spec.depth, length, out=np.zeros(len(dia)), where=feasible)
+        else:
+            scores += weights["length"]
+        # Точность: требуемая точность - положение квалитета между допусками по умолчанию сверла и развертки
+        coarse, fine = max(self._grades.values()), min(self._grades.values())
+        tolerance = spec.tolerance if not isinstance(spec.tolerance, type(None)) else \
+            DEFAULT_SETTINGS_FOR_TOOL[type_tool]["tolerance"]
+        required = min(max((coarse - grade_rank(tolerance)) / (coarse - fine), 0.0), 1.0)
+        scores += weights["tolerance"] * (1 - np.clip(required - candidates.precision[start:stop], 0, 1))
+        # Предпочтительные стандарты: первый - 1, последний - 1 / len, остальные - 0
+        standards = tuple(spec.standards)
+        if standards:
+            preference = np.zeros(len(candidates.standards) + 1)
+            for number, standard in enumerate(standards):
+                if standard in candidates.standards and not preference[candidates.standards[standard]]:
+                    preference[candidates.standards[standard]] = 1 - number / len(standards)
+            scores += weights["standard"] * preference[candidates.standard_codes[start:stop]]
+        else:
+            scores += weights["standard"]
+        # Материал режущей части: допустим - 1, не указан в БД - 0.5, недопустим - 0
+        if not isinstance(spec.material, type(None)):
+            code = MATERIALS_OF_CUTTING_PART.get(spec.material, spec.material)
+            if code not in MATERIALS_OF_CUTTING_PART.values():
+                raise InvalidValue(f"Материал режущей части должен быть из списка "
+                                   f"{list(MATERIALS_OF_CUTTING_PART)}, получено: {spec.material}")
+            scores += weights["material"] * np.where(candidates.with_materials[start:stop],
+                                                     candidates.materials[start:stop, code], 0.5)
+        else:
+            scores += weights["material"]
+        positions = np.flatnonzero(feasible)
+        order = positions[np.argsort(-scores[positions], kind="stable")]
+        return Ranking(candidates.ids[start:stop][order], scores[order])
+
+    def rank(self, holes: Iterable, k: Optional[int] = 5) -> list:
+        """ Возвращает для каждого отверстия из holes идентификаторы записей и оценки k лучших кандидатов (Ranking,
+        по убыванию оценки; k = None - всех кандидатов). Инструменты не создаются.
+
+        Parameters:
+            holes : Описания отверстий (HoleSpec, словари с полями HoleSpec или диаметры)
+            k: int : Количество кандидатов для каждого отверстия
+        """
+        if not isinstance(k, type(None)) and k < 0:
+            raise InvalidValue(f"Количество кандидатов должно быть неотрицательным, получено: {k}")
+        result = []
+        for hole in holes:
+            spec = self.spec(hole)
+            type_tool = spec.type_tool if not isinstance(spec.type_tool, type(None)) else self.type_for(spec.tolerance)
+            ranking = self._scores(spec, self.candidates(type_tool), type_tool)
+            result.append(Ranking(ranking.ids[:k], ranking.scores[:k]))
+        return result
+
+    @instrumented("list", "Подобраны инструменты для отверстий. Отверстий: {count}.")
+    def select(self, holes: Iterable, k: Optional[int] = 5) -> list:
+        """ Возвращает для каждого отверстия из holes список k лучших инструментов (по убыванию оценки). Записи
+        лучших кандидатов всех отверстий загружаются одним обращением к БД, инструменты создаются одним вызовом
+        create_many (одинаковые кандидаты разных отверстий - один раз).
+
+        Parameters:
+            holes : Описания отверстий (HoleSpec, словари с полями HoleSpec или диаметры)
+            k: int : Количество инструментов для каждого отверстия
+        """
+        rankings = self.rank(holes, k)
+        ids = list(dict.fromkeys(int(i) for ranking in rankings for i in ranking.ids))
+        if not ids:
+            return [[] for _ in rankings]
+        self._tool_creator._verbose = False
+        tools = dict(zip(ids, self._tool_creator.create_many(self._finder.records_by_ids(ids))))
+        return [[tools[int(i)] for i in ranking.ids] for ranking in rankings]
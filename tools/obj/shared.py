@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import json
+import struct
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import ClassVar, Optional
+
+import numpy as np
+
+from service_for_my_projects import logged
+
+from tools.obj.snapshots import ToolSnapshot
+
+
+@logged
+class SharedCatalog:
+    """ Снимок таблицы инструментов в разделяемой памяти (multiprocessing.shared_memory) для нескольких процессов
+    (например, исполнителей веб-сервера). Числовые столбцы, коды категорий и массивы индексов снимка располагаются в
+    одном сегменте, значения категорий и расположение массивов - в его заголовке. Процессы строят ToolSnapshot на
+    массивах сегмента без копирования и без упорядочивания индексов. Собственными в каждом процессе остаются значения
+    категорий текстовых столбцов (читаются из заголовка) и словари кодов хеш-индексов: их объем пропорционален
+    количеству различных значений текстовых столбцов (для поставляемой БД - около 2 Мб на процесс при сегменте около
+    4 Мб).
+
+    Жизненный цикл сегмента:
+        create(snapshot, name) - процесс-загрузчик публикует снимок и становится владельцем сегмента;
+        attach(name) - процессы подключаются к опубликованному сегменту (снимок - свойство snapshot);
+        close() - процесс отключается от сегмента (после прекращения работы поисковиков со снимком);
+        unlink() - владелец удаляет сегмент (подключенные процессы продолжают работу до close).
+    В контекстном менеджере при выходе сегмент закрывается, а владельцем - и удаляется.
+
+    Parameters:
+        memory: shared_memory.SharedMemory : Сегмент разделяемой памяти.
+        owner: bool : Процесс - владелец сегмента (удаляет сегмент методом unlink).
+    """
+    # Выравнивание массивов в сегменте (байт)
+    ALIGNMENT: ClassVar[int] = 64
+    # Заголовок сегмента: длина описания (в байтах), далее - описание JSON
+    HEADER: ClassVar[struct.Struct] = struct.Struct("<Q")
+    # Блокировка на время подключения к сегменту без регистрации в resource_tracker (до Python 3.13)
+    _attach_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False) -> None:
+        self._memory = memory
+        self._owner = owner
+        self._snapshot = None
+
+    @classmethod
+    def _aligned(cls, offset: int) -> int:
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @classmethod
+    def create(cls, snapshot: ToolSnapshot, name: Optional[str] = None) -> "SharedCatalog":
+        """ Публикует снимок snapshot в новом сегменте разделяемой памяти с именем name (None - имя выбирается
+        автоматически, см. свойство name). Возвращает каталог-владелец сегмента. """
+        arrays = [(["column", column, None, None], values) for column, values in snapshot.arrays().items()]
+        arrays += [(["index", *key], values) for key, values in snapshot.index_arrays().items()]
+        layout, offset = [], 0
+        for key, values in arrays:
+            offset = cls._aligned(offset)
+            layout.append({"key": key, "dtype": values.dtype.str, "shape": list(values.shape), "offset": offset})
+            offset += values.nbytes
+        manifest = json.dumps({"version": snapshot.FORMAT_VERSION, "length": len(snapshot),
+                               "columns": snapshot.names, "output": snapshot.columns,
+                               "categories": snapshot.categories(), "arrays": layout},
+                              ensure_ascii=False).encode("utf-8")
+        start = cls._aligned(cls.HEADER.size + len(manifest))
+        memory = shared_memory.SharedMemory(name=name, create=True, size=max(start + offset, 1))
+        try:
+            cls.HEADER.pack_into(memory.buf, 0, len(manifest))
+            memory.buf[cls.HEADER.size:cls.HEADER.size + len(manifest)] = manifest
+            for item, (_, values) in zip(layout, arrays):
+                target = np.ndarray(values.shape, dtype=values.dtype, buffer=memory.buf, offset=start + item["offset"])
+                target[...] = values
+                del target
+        except Exception:
+            memory.close()
+            memory.unlink()
+            raise
+        catalog = cls(memory, owner=True)
+        catalog.debug(f"Опубликован снимок таблицы в разделяемой памяти {memory.name}: записей {len(snapshot)}, "
+                      f"{memory.size} байт.")
+        return catalog
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedCatalog":
+        """ Подключается к сегменту name, опубликованному методом create. Сегмент не удаляется при завершении
+        подключившегося процесса: его удаляет владелец (unlink). """
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # До Python 3.13 подключившийся процесс регистрирует сегмент в resource_tracker и удаляет его при
+            # завершении. Отмена регистрации после подключения удалила бы и регистрацию владельца: процессы,
+            # запущенные через multiprocessing, используют resource_tracker загрузчика. Поэтому регистрация сегмента
+            # на время подключения отключается
+            with cls._attach_lock:
+                register = resource_tracker.register
+
+                def register_other(resource: str, rtype: str) -> None:
+                    if rtype != "shared_memory":
+                        register(resource, rtype)
+
+                resource_tracker.register = register_other
+                try:
+                    memory = shared_memory.SharedMemory(name=name)
+                finally:
+                    resource_tracker.register = register
+        return cls(memory)
+
+    @property
+    def name(self) -> str:
+        """ Возвращает имя сегмента (для подключения других процессов методом attach). """
+        return self._memory.name
+
+    @property
+    def size(self) -> int:
+        """ Возвращает размер сегмента (байт). """
+        return self._memory.size
+
+    @property
+    def owner(self) -> bool:
+        return self._owner
+
+    @property
+    def snapshot(self) -> ToolSnapshot:
+        """ Возвращает снимок на массивах сегмента (создается при первом обращении, массивы только для чтения). """
+        if isinstance(self._snapshot, type(None)):
+            self._snapshot = self._read()
+        return self._snapshot
+
+    def _read(self) -> ToolSnapshot:
+        buffer = self._memory.buf
+        size, = self.HEADER.unpack_from(buffer, 0)
+        manifest = json.loads(bytes(buffer[self.HEADER.size:self.HEADER.size + size]).decode("utf-8"))
+        if manifest.get("version") != ToolSnapshot.FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка {manifest.get('version')} в разделяемой памяти "
+                             f"{self.name}")
+        start = self._aligned(self.HEADER.size + size)
+        columns, indexes = {}, {}
+        for item in manifest["arrays"]:
+            values = np.ndarray(tuple(item["shape"]), dtype=np.dtype(item["dtype"]), buffer=buffer,
+                                offset=start + item["offset"])
+            values.flags.writeable = False
+            kind, *key = item["key"]
+            if kind == "column":
+                columns[key[0]] = values
+            else:
+                indexes[tuple(key)] = values
+        snapshot = ToolSnapshot.from_arrays(manifest["columns"], manifest["output"], manifest["length"], columns,
+                                            manifest["categories"], indexes)
+        self.debug(f"Подключен снимок таблицы в разделяемой памяти {self.name}: записей {len(snapshot)}.")
+        return snapshot
+
+    def close(self) -> None:
+        """ Отключает процесс от сегмента. Снимок и поисковики, использующие его, после этого не работают; если на
+        массивы снимка остались ссылки, возбуждается BufferError. """
+        self._snapshot = None
+        self._memory.close()
+
+    def unlink(self) -> None:
+        """ Удаляет сегмент (только владелец). Память освобождается после отключения всех процессов. """
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+        self.unlink()
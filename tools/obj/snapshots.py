@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import json
+import os
+from typing import ClassVar, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from service_for_my_projects import logged
+
+from tools.obj.constants import COLUMNS_FOR_PREPARERS, COLUMNS_FOR_QUERIES
+from tools.obj.indexes import HashIndex, PrefixIndex, SortedIndex
+from tools.obj.queries import ToolQuery, list_contains, list_tokens
+from tools.obj.requesters import ToolRecordRequester
+
+
+@logged
+class ToolSnapshot:
+    """ Снимок таблицы инструментов в памяти, хранящийся по столбцам: числовые столбцы - массивами numpy, остальные -
+    кодами категорий. По обозначению, стандарту и типу инструмента строятся хеш-индексы, по диаметрам - упорядоченные
+    индексы (по всем записям и отдельно по каждому типу инструмента). После создания снимок не изменяется, поэтому
+    может использоваться несколькими потоками одновременно. Реализует методы RecordRequester, используемые ToolFinder.
+
+    Parameters:
+        records: pd.DataFrame : Записи таблицы инструментов.
+        columns: Iterable[str] : Столбцы, возвращаемые в записях. Остальные столбцы records используются только в
+            условиях запросов ToolQuery. None - возвращать все столбцы.
+    """
+    HASH_COLUMNS: ClassVar[tuple] = ("Обозначение", "Стандарт", "Тип_инструмента")
+    SORTED_COLUMNS: ClassVar[tuple] = ("D", "d_")
+    # Версия формата каталога снимка (см. save, load)
+    FORMAT_VERSION: ClassVar[int] = 2
+
+    def __init__(self, records: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> None:
+        self._names = list(records.columns)
+        self._output = self._names if isinstance(columns, type(None)) else [c for c in columns if c in self._names]
+        self._length = len(records)
+        self._numeric = {}
+        self._categories = {}
+        for name in self._names:
+            column = records[name]
+            if pd.api.types.is_numeric_dtype(column):
+                values = column.to_numpy(copy=True)
+                values.flags.writeable = False
+                self._numeric[name] = values
+            else:
+                categorical = pd.Categorical(column)
+                codes = categorical.codes.astype(np.int32)
+                categories = categorical.categories.to_numpy(dtype=object)
+                codes.flags.writeable = False
+                categories.flags.writeable = False
+                self._categories[name] = (codes, categories)
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        # Префиксные индексы строятся при первом обращении (см. prefix_index)
+        self._prefix_indexes = {}
+        self._hash_indexes = {name: HashIndex(*self._categories[name])
+                              for name in self.HASH_COLUMNS if name in self._categories}
+        # Упорядоченные индексы диаметров: по всем записям (ключ (столбец, None)) и по каждому типу инструмента
+        self._sorted_indexes = {}
+        types = self._hash_indexes.get("Тип_инструмента")
+        for name in self.SORTED_COLUMNS:
+            if name not in self._names:
+                continue
+            values = self._float_values(name)
+            self._sorted_indexes[(name, None)] = SortedIndex(values)
+            for type_tool in ([] if isinstance(types, type(None)) else self._categories["Тип_инструмента"][1]):
+                positions = types.positions(type_tool)
+                self._sorted_indexes[(name, type_tool)] = SortedIndex(values[positions], positions)
+
+    def index_arrays(self) -> dict:
+        """ Возвращает массивы индексов снимка {(вид индекса, столбец, тип инструмента, имя массива): массив} для
+        восстановления индексов без построения (см. from_arrays). """
+        arrays = {}
+        for name, index in self._hash_indexes.items():
+            for part, array in index.arrays.items():
+                arrays[("hash", name, None, part)] = array
+        for (name, type_tool), index in self._sorted_indexes.items():
+            arrays[("sorted", name, type_tool, "positions")] = index.positions
+            arrays[("sorted", name, type_tool, "values")] = index.values
+        return arrays
+
+    def _restore_indexes(self, arrays: dict) -> None:
+        self._prefix_indexes = {}
+        self._hash_indexes = {name: HashIndex.from_arrays(arrays[("hash", name, None, "order")],
+                                                          arrays[("hash", name, None, "offsets")],
+                                                          self._categories[name][1])
+                              for name in self.HASH_COLUMNS if name in self._categories}
+        self._sorted_indexes = {}
+        for (kind, name, type_tool, part), array in arrays.items():
+            if kind == "sorted" and part == "positions":
+                values = arrays[("sorted", name, type_tool, "values")]
+                self._sorted_indexes[(name, type_tool)] = SortedIndex.from_arrays(array, values)
+
+    @classmethod
+    def from_arrays(cls, names: list, output: list, length: int, arrays: dict, categories: dict,
+                    indexes: Optional[dict] = None) -> "ToolSnapshot":
+        """ Возвращает снимок по готовым массивам столбцов без их копирования (например, отображенным в память или
+        расположенным в разделяемой памяти).
+
+        Parameters:
+            names: list : Имена столбцов снимка.
+            output: list : Столбцы, возвращаемые в записях.
+            length: int : Количество записей.
+            arrays: dict : Массивы столбцов {столбец: значения (числовые столбцы) или коды категорий}.
+            categories: dict : Значения категорий текстовых столбцов {столбец: список значений}.
+            indexes: dict : Массивы индексов (см. index_arrays). None - индексы строятся по столбцам.
+        """
+        snapshot = cls.__new__(cls)
+        snapshot._names = list(names)
+        snapshot._output = list(output)
+        snapshot._length = length
+        snapshot._numeric = {}
+        snapshot._categories = {}
+        for name in snapshot._names:
+            if name in categories:
+                values = np.empty(len(categories[name]), dtype=object)
+                values[:] = categories[name]
+                values.flags.writeable = False
+                snapshot._categories[name] = (arrays[name], values)
+            else:
+                snapshot._numeric[name] = arrays[name]
+        if isinstance(indexes, type(None)):
+            snapshot._build_indexes()
+        else:
+            snapshot._restore_indexes(indexes)
+        return snapshot
+
+    def _float_values(self, name: str) -> np.ndarray:
+        """ Возвращает значения столбца name в виде чисел (нечисловые значения и пропуски - np.nan). """
+        if name in self._numeric:
+            return self._numeric[name].astype(float)
+        codes, categories = self._categories[name]
+        # Код пропуска (-1) указывает на последний элемент - np.nan
+        numbers = np.append(pd.to_numeric(pd.Series(categories, dtype=object), errors="coerce").to_numpy(dtype=float),
+                            np.nan)
+        return numbers[codes]
+
+    @classmethod
+    def from_database(cls, path: str, tablename: str = "tools",
+                      columns: Optional[Iterable[str]] = COLUMNS_FOR_PREPARERS,
+                      query_columns: Iterable[str] = COLUMNS_FOR_QUERIES) -> "ToolSnapshot":
+        """ Загружает снимок из таблицы tablename БД path (одним запросом). Столбцы query_columns загружаются
+        только для условий запросов ToolQuery и не возвращаются в записях. """
+        loaded = None if isinstance(columns, type(None)) else list(dict.fromkeys([*columns, *query_columns]))
+        requester = ToolRecordRequester(path=path, tablename=tablename, columns=loaded, with_indexes=False)
+        try:
+            snapshot = cls(requester.get_all_records, columns)
+        finally:
+            requester.close()
+        snapshot.debug(f"Загружен снимок таблицы {tablename}: записей {len(snapshot)}, {snapshot.nbytes} байт.")
+        return snapshot
+
+    def save(self, path: str, source: Optional[dict] = None) -> None:
+        """ Сохраняет снимок в каталог path: массивы столбцов - в файлы .npy, имена столбцов и значения категорий - в
+        файл meta.json. Сохраненный снимок загружается методом load без копирования массивов.
+
+        Parameters:
+            path: str : Каталог снимка (создается, если отсутствует).
+            source: dict : Сведения об источнике снимка, сохраняемые в meta.json.
+        """
+        os.makedirs(path, exist_ok=True)
+        meta = {"version": self.FORMAT_VERSION, "length": self._length, "columns": self._names,
+                "output": self._output, "files": {}, "source": {} if isinstance(source, type(None)) else source}
+        meta["categories"] = self.categories()
+        for number, (name, values) in enumerate(self.arrays().items()):
+            filename = f"column_{number}.npy"
+            np.save(os.path.join(path, filename), values)
+            meta["files"][name] = filename
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ToolSnapshot":
+        """ Загружает снимок, сохраненный методом save в каталог path. Массивы столбцов отображаются в память (mmap)
+        только для чтения: страницы файлов читаются по мере обращения и разделяются процессами через кеш ОС. """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка {meta.get('version')} в каталоге {path}")
+        arrays = {name: np.load(os.path.join(path, meta["files"][name]), mmap_mode="r" if mmap else None)
+                  for name in meta["columns"]}
+        snapshot = cls.from_arrays(meta["columns"], meta["output"], meta["length"], arrays, meta["categories"])
+        snapshot.debug(f"Загружен снимок из каталога {path}: записей {len(snapshot)}, {snapshot.nbytes} байт.")
+        return snapshot
+
+    @classmethod
+    def from_columnar(cls, path: str, db_path: Optional[str] = None, tablename: str = "tools") -> "ToolSnapshot":
+        """ Загружает снимок из каталога path (см. load). Если указана БД db_path, а снимок отсутствует, старше
+        файла БД или сохранен в другой версии формата, снимок предварительно выгружается из таблицы tablename. """
+        meta_path = os.path.join(path, "meta.json")
+        if not isinstance(db_path, type(None)) and (not os.path.exists(meta_path) or
+                                                     os.path.getmtime(meta_path) < os.path.getmtime(db_path) or
+                                                     cls._version(meta_path) != cls.FORMAT_VERSION):
+            cls.export(db_path, path, tablename)
+        return cls.load(path)
+
+    @staticmethod
+    def _version(meta_path: str) -> Optional[int]:
+        with open(meta_path, encoding="utf-8") as file:
+            return json.load(file).get("version")
+
+    @classmethod
+    def export(cls, db_path: str, path: str, tablename: str = "tools",
+               columns: Optional[Iterable[str]] = COLUMNS_FOR_PREPARERS,
+               query_columns: Iterable[str] = COLUMNS_FOR_QUERIES) -> "ToolSnapshot":
+        """ Выгружает столбцы columns (и столбцы условий запросов query_columns) таблицы tablename БД db_path в
+        столбцовый снимок в каталоге path. """
+        snapshot = cls.from_database(db_path, tablename, columns, query_columns)
+        snapshot.save(path, source={"path": os.path.abspath(db_path), "tablename": tablename,
+                                    "mtime": os.path.getmtime(db_path)})
+        return snapshot
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def columns(self) -> list:
+        """ Возвращает имена столбцов, возвращаемых в записях снимка. """
+        return list(self._output)
+
+    @property
+    def names(self) -> list:
+        """ Возвращает имена всех столбцов снимка (в том числе столбцов условий запросов). """
+        return list(self._names)
+
+    def arrays(self) -> dict:
+        """ Возвращает массивы столбцов {столбец: значения (числовые столбцы) или коды категорий} (см. from_arrays). """
+        return {name: self._numeric[name] if name in self._numeric else self._categories[name][0]
+                for name in self._names}
+
+    def categories(self) -> dict:
+        """ Возвращает значения категорий текстовых столбцов {столбец: список значений}. """
+        return {name: [value.item() if isinstance(value, np.generic) else value for value in categories]
+                for name, (_, categories) in self._categories.items()}
+
+    @property
+    def nbytes(self) -> int:
+        """ Возвращает объем памяти, занимаемый массивами столбцов снимка. """
+        return sum(values.nbytes for values in self._numeric.values()) + \
+            sum(codes.nbytes for codes, _ in self._categories.values())
+
+    def _positions_by(self, column: str, value) -> np.ndarray:
+        if column in self._hash_indexes:
+            return self._hash_indexes[column].positions(value)
+        if (column, None) in self._sorted_indexes:
+            return self._sorted_indexes[(column, None)].equal(float(value))
+        if column in self._numeric:
+            return np.flatnonzero(self._numeric[column] == value)
+        codes, categories = self._categories[column]
+        code = np.flatnonzero(categories == value)
+        return np.flatnonzero(codes == code[0]) if len(code) else np.empty(0, dtype=np.intp)
+
+    def positions(self, keys: dict) -> np.ndarray:
+        """ Возвращает упорядоченные позиции записей, значения столбцов которых равны значениям словаря keys. """
+        result = None
+        for column, value in keys.items():
+            positions = self._positions_by(column, value)
+            result = positions if isinstance(result, type(None)) else np.intersect1d(result, positions,
+                                                                                    assume_unique=True)
+            if not len(result):
+                break
+        return np.arange(self._length) if isinstance(result, type(None)) else result
+
+    def frame(self, positions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """ Возвращает записи снимка с позициями positions (по умолчанию - все записи) в виде таблицы pd.DataFrame. """
+        return pd.DataFrame({name: self._column(name, positions) for name in self._output}, columns=self._output)
+
+    def _column(self, name: str, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """ Возвращает значения столбца name в записях с позициями positions (по умолчанию - во всех записях).
+        Значения отсутствующего в снимке столбца - пропуски. """
+        length = self._length if isinstance(positions, type(None)) else len(positions)
+        if name in self._numeric:
+            values = self._numeric[name]
+            return values.copy() if isinstance(positions, type(None)) else values[positions]
+        if name not in self._categories:
+            return np.full(length, None, dtype=object)
+        codes, categories = self._categories[name]
+        codes = codes if isinstance(positions, type(None)) else codes[positions]
+        column = categories.take(np.maximum(codes, 0)) if len(categories) else np.empty(length, dtype=object)
+        column[codes < 0] = None
+        return column
+
+    def sorted_index(self, column: str, type_tool: Optional[str] = None) -> SortedIndex:
+        """ Возвращает упорядоченный индекс числового столбца column (по записям типа type_tool или по всем записям).
+        Идентификаторы записей в индексе - позиции записей в снимке. """
+        if (column, type_tool) not in self._sorted_indexes:
+            return SortedIndex(np.empty(0))
+        return self._sorted_indexes[(column, type_tool)]
+
+    def prefix_index(self, column: str, type_tool: Optional[str] = None) -> PrefixIndex:
+        """ Возвращает префиксный индекс текстового столбца column (по записям типа type_tool или по всем записям),
+        построенный при первом обращении. Идентификаторы записей в индексе - позиции записей в снимке. """
+        key = (column, type_tool)
+        if key not in self._prefix_indexes:
+            positions, df = self.column_values([column], type_tool)
+            self._prefix_indexes[key] = PrefixIndex(df[column].tolist(), positions)
+        return self._prefix_indexes[key]
+
+    def column_values(self, columns: Iterable[str], type_tool: Optional[str] = None) -> tuple:
+        """ Возвращает идентификаторы (позиции) записей типа type_tool (или всех записей) и значения их столбцов
+        columns, в том числе столбцов условий запросов: (np.ndarray, pd.DataFrame). """
+        columns = list(columns)
+        positions = self.positions({} if isinstance(type_tool, type(None)) else {"Тип_инструмента": type_tool})
+        return positions, pd.DataFrame({name: self._column(name, positions) for name in columns}, columns=columns)
+
+    def get_records_by_ids(self, ids: np.ndarray) -> pd.DataFrame:
+        """ Возвращает записи с идентификаторами (позициями) ids в порядке ids. """
+        return self.frame(np.asarray(ids, dtype=np.intp))
+
+    def get_records(self, keys: dict) -> pd.DataFrame:
+        """ Возвращает записи, значения столбцов которых равны значениям словаря keys {столбец: значение}. """
+        return self.frame(self.positions(keys))
+
+    def get_records_by_values(self, column: str, values: Iterable) -> pd.DataFrame:
+        """ Возвращает записи, значение столбца column которых входит в набор values, в порядке записей снимка. """
+        positions = [self._positions_by(column, value) for value in dict.fromkeys(values)]
+        return self.frame(np.unique(np.concatenate(positions)) if positions else np.empty(0, dtype=np.intp))
+
+    def iter_records(self, keys: Optional[dict] = None, chunksize: int = 1000) -> Iterator[pd.DataFrame]:
+        """ Возвращает записи (все или со значениями столбцов, равными значениям словаря keys) частями по chunksize
+        записей. """
+        positions = self.positions({} if isinstance(keys, type(None)) else keys)
+        for start in range(0, len(positions), chunksize):
+            yield self.frame(positions[start:start + chunksize])
+
+    @property
+    def get_all_records(self) -> pd.DataFrame:
+        """ Возвращает все записи снимка. """
+        return self.frame()
+
+    @property
+    def available_values(self) -> dict:
+        """ Возвращает наборы доступных в снимке значений по категориям (типам инструментов и стандартам). """
+        return {name: sorted(self._categories[name][1]) for name in ("Тип_инструмента", "Стандарт")
+                if name in self._categories}
+
+    def _sorted_index_for(self, column: str, query: ToolQuery) -> Optional[tuple]:
+        """ Возвращает ключ упорядоченного индекса для условия between по столбцу column: по типу инструмента, если
+        запрос отбирает записи одного типа, иначе - по всем записям (None - индекса нет). """
+        types = [p.value for p in query.predicates if p.column == "Тип_инструмента" and p.operator == "eq"]
+        for key in ([(column, types[0])] if len(types) == 1 else []) + [(column, None)]:
+            if key in self._sorted_indexes:
+                return key
+        return None
+
+    def _match(self, predicate, query: ToolQuery) -> tuple:
+        """ Возвращает упорядоченные позиции записей, удовлетворяющих условию predicate, и описание способа отбора. """
+        column, operator, value = predicate
+        if column not in self._names:
+            raise KeyError(f"Столбец {column} отсутствует в снимке")
+        if operator == "eq" and isinstance(value, type(None)):
+            missing = np.isnan(self._numeric[column]) if column in self._numeric else self._categories[column][0] < 0
+            return np.flatnonzero(missing), "просмотр пропусков"
+        if operator in ("eq", "in"):
+            values = [value] if operator == "eq" else list(value)
+            positions = [self._positions_by(column, item) for item in values]
+            positions = positions[0] if len(positions) == 1 else \
+                np.unique(np.concatenate(positions)) if positions else np.empty(0, dtype=np.intp)
+            way = "хеш-индекс" if column in self._hash_indexes else \
+                "упорядоченный индекс" if (column, None) in self._sorted_indexes else "просмотр значений"
+            return positions, way
+        if operator == "between":
+            lo, hi = (default if isinstance(bound, type(None)) else float(bound)
+                      for bound, default in zip(value, (-np.inf, np.inf)))
+            key = self._sorted_index_for(column, query)
+            if not isinstance(key, type(None)):
+                index = self._sorted_indexes[key]
+                start, stop = index.between(lo, hi)
+                way = "упорядоченный индекс" + ("" if isinstance(key[1], type(None)) else f" по типу {key[1]}")
+                return np.sort(index.positions[start:stop]), way
+            values = self._float_values(column)
+            return np.flatnonzero((values >= lo) & (values <= hi)), "просмотр значений"
+        # contains: условие проверяется один раз для каждого различного значения столбца
+        tokens = list_tokens(value)
+        if column in self._numeric:
+            values = self._numeric[column]
+            return np.flatnonzero([list_contains(str(item), tokens) for item in values]), "просмотр значений"
+        codes, categories = self._categories[column]
+        matched = np.flatnonzero([list_contains(item, tokens) for item in categories])
+        return np.flatnonzero(np.isin(codes, matched)), f"просмотр {len(categories)} категорий"
+
+    def _plan(self, query: ToolQuery) -> tuple:
+        """ Выполняет отбор записей по запросу query. Возвращает позиции записей и описание шагов отбора. """
+        result, steps = None, []
+        # Условия по индексам проверяются первыми: они сужают набор записей дешевле просмотра значений
+        predicates = sorted(query.predicates, key=lambda p: p.column not in self._hash_indexes)
+        for predicate in predicates:
+            positions, way = self._match(predicate, query)
+            result = positions if isinstance(result, type(None)) else np.intersect1d(result, positions,
+                                                                                    assume_unique=True)
+            steps.append(f"{predicate.column} {predicate.operator} {predicate.value!r}: {way}, "
+                         f"осталось записей {len(result)}")
+        result = np.arange(self._length) if isinstance(result, type(None)) else result
+        if not isinstance(query.ordering, type(None)):
+            column, descending = query.ordering
+            if column in self._numeric or column in ToolRecordRequester.TEXT_NUMERIC_COLUMNS:
+                keys = self._float_values(column)[result]
+                missing = np.isnan(keys)
+            else:
+                # Категории упорядочены по значению, поэтому записи упорядочиваются по кодам категорий
+                keys = self._categories[column][0][result].astype(float)
+                missing = keys < 0
+            keys = -keys if descending else keys
+            result = result[np.lexsort((result, keys, missing))]
+            steps.append(f"упорядочивание по {column}{' по убыванию' if descending else ''}")
+        if not isinstance(query.max_count, type(None)):
+            result = result[:query.max_count]
+            steps.append(f"ограничение {query.max_count} записей")
+        return result, steps
+
+    def select(self, query: ToolQuery) -> pd.DataFrame:
+        """ Возвращает записи, удовлетворяющие запросу query. Условия проверяются по индексам снимка, остальные - по
+        массивам значений отобранных записей. """
+        return self.frame(self._plan(query)[0])
+
+    def explain(self, query: ToolQuery) -> str:
+        """ Возвращает описание выполнения запроса query: шаги отбора записей и количество отобранных записей. """
+        positions, steps = self._plan(query)
+        return "\n".join([repr(query)] + [f"  {step}" for step in steps] + [f"Найдено записей: {len(positions)}"])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------------------------------------------------
+import dataclasses
+import math
+from typing import Callable, Optional, Union, get_args, get_origin
+
+import numpy as np
+import pandas as pd
+from pydantic.fields import FieldInfo
+
+from tools.obj.constants import TYPES_STANDARD
+from tools.obj.entities import CustomTool
+from tools.obj.fields_types import StringValue, ValueFromDict
+
+# Валидаторы моделей инструментов, проверки которых повторяет BatchValidator
+KNOWN_FIELD_VALIDATORS = {"validate_standard", "validate_marking"}
+KNOWN_MODEL_VALIDATORS = {"check_group"}
+
+
+def to_float(value) -> tuple:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return True, float(value)
+    return False, None
+
+
+def to_int(value) -> tuple:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return True, int(value)
+    if isinstance(value, float) and value.is_integer():
+        return True, int(value)
+    return False, None
+
+
+def to_str(value) -> tuple:
+    return (True, value) if isinstance(value, str) else (False, None)
+
+
+def lower_bound_only(constraint) -> bool:
+    """ Проверяет, что ограничение constraint из FieldInfo.metadata поля модели задает только нижнюю границу
+    (Field(ge=...)). """
+    return (dataclasses.is_dataclass(constraint)
+            and [item.name for item in dataclasses.fields(constraint)] == ["ge"])
+
+
+def field_converter(field: FieldInfo) -> Optional[Callable]:
+    """ Возвращает функцию проверки и преобразования значения поля модели: value -> (допустимо ли, значение). Для
+    полей неподдерживаемых типов возвращает None. """
+    annotation, optional = field.annotation, False
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation, optional = args[0], True
+    bounds = [item.ge for item in field.metadata if lower_bound_only(item)]
+    if len(bounds) != len(field.metadata):
+        return None
+    if annotation is float:
+        base = to_float
+    elif annotation is int:
+        base = to_int
+    elif annotation is str or (isinstance(annotation, type) and issubclass(annotation, StringValue)):
+        base = to_str
+    elif isinstance(annotation, type) and issubclass(annotation, ValueFromDict):
+        base = annotation.convert
+    else:
+        return None
+
+    def convert(value) -> tuple:
+        if value is None:
+            return optional, None
+        valid, value = base(value)
+        if valid and any(not value >= bound for bound in bounds):
+            return False, None
+        return valid, value
+    return convert
+
+
+def is_standard(value) -> tuple:
+    """ Повторяет проверку Tool.validate_standard. """
+    valid = isinstance(value, str) and any(substring in value for substring in TYPES_STANDARD)
+    return (True, value) if valid else (False, None)
+
+
+class BatchValidator:
+    """ Проверяет и преобразует параметры группы инструментов одного класса по столбцам, повторяя проверки
+    конструктора модели model (типы и ограничения полей, словари допустимых значений, стандарт, группа). Проверка
+    выполняется один раз для каждого различного значения столбца. Значения, которые не удалось проверить быстро
+    (допустимые для модели в том числе), отмечаются как непроверенные - такие параметры следует передать
+    конструктору модели.
+
+    Parameters:
+        model: type : Класс инструмента (наследник pydantic.BaseModel).
+    """
+    def __init__(self, model) -> None:
+        self._model = model
+        decorators = model.__pydantic_decorators__
+        self._converters = {name: field_converter(field) for name, field in model.model_fields.items()}
+        if "standard" in self._converters:
+            self._converters["standard"] = is_standard
+        if "group" in self._converters:
+            group = model.model_fields["group"].default
+            self._converters["group"] = lambda value: (True, value) if value == group else (False, None)
+        self.supported = (not issubclass(model, CustomTool)
+                          and set(decorators.field_validators) <= KNOWN_FIELD_VALIDATORS
+                          and set(decorators.model_validators) <= KNOWN_MODEL_VALIDATORS)
+
+    def validate(self, params: pd.DataFrame) -> tuple:
+        """ Возвращает массив признаков успешной проверки и список словарей преобразованных параметров для каждой
+        строки таблицы params. """
+        valid = np.full(len(params), self.supported)
+        columns = {}
+        for name in params.columns:
+            converter = self._converters.get(name, False)
+            if converter is False:
+                # Дополнительные поля модели (extra = "allow") не проверяются
+                columns[name] = params[name].to_numpy(dtype=object)
+                continue
+            if isinstance(converter, type(None)):
+                valid[:] = False
+                columns[name] = params[name].to_numpy(dtype=object)
+                continue
+            codes, uniques = pd.factorize(params[name].to_numpy(dtype=object), use_na_sentinel=True)
+            results = [converter(value) for value in uniques] + [converter(None)]
+            valid &= np.array([result[0] for result in results], dtype=bool)[codes]
+            converted = np.empty(len(results), dtype=object)
+            converted[:] = [result[1] for result in results]
+            columns[name] = converted[codes]
+        names = list(columns)
+        return valid, [dict(zip(names, row)) for row in zip(*columns.values())]
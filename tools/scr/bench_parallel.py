@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Сравнивает время создания всех инструментов БД в одном процессе и в пуле из 1/2/4/8 процессов.
+# Запуск: python -m tools.scr.bench_parallel
+import time
+
+from tools.obj.containers import ToolContainer
+
+WORKERS = (1, 2, 4, 8)
+
+
+def measure(func, *args, **kwargs) -> tuple:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(workers=WORKERS) -> dict:
+    lister = ToolContainer().lister()
+    serial, tools = measure(lambda: lister.all)
+    print(f"Один процесс: {serial:.3f} с ({len(tools)} инструментов)")
+    timings = {0: serial}
+    for count in workers:
+        elapsed, parallel_tools = measure(lister.all_parallel, workers=count)
+        assert [tool.name for tool in parallel_tools if tool] == [tool.name for tool in tools if tool]
+        timings[count] = elapsed
+        print(f"Процессов: {count}: {elapsed:.3f} с, ускорение: {serial / elapsed:.2f}")
+    return timings
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Замеры производительности поиска, создания и перечисления инструментов на поставляемой БД tools/data/tools.db.
+# Для каждого замера выводятся задержки p50/p95, пропускная способность, а также пиковый объем памяти процесса.
+# Время импорта пакета замеряется в отдельных процессах. Результаты сохраняются в JSON для сравнения между коммитами.
+# Запуск: python -m tools.scr.benchmarks [--storage sql|snapshot|columnar] [--repeat N] [--output results.json]
+#         [--import-budget-ms MS]
+import argparse
+import json
+import os.path
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Optional
+
+from tools.obj.containers import ToolContainer
+from tools.obj.constants import DEFAULT_SETTINGS_FOR_TOOL, GROUPS_TOOL
+from tools.obj.data_preparers import ToolDataPreparer
+from tools.obj.fields_types import InAccuracyStandards, InToleranceField, InTypesOfMillingCutter, TOLERANCES
+from tools.obj.instrumentation import INSTRUMENTATION, instrumented
+from tools.scr.fun import get_name
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(values: list, part: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(part * (len(ordered) - 1))))]
+
+
+def measure(func: Callable, repeat: int, items: int = 1) -> dict:
+    """ Выполняет func repeat раз. Возвращает задержки (мс) и пропускную способность (items обработанных объектов за
+    вызов, в секунду). """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    total = sum(timings)
+    return {"n": repeat,
+            "p50_ms": percentile(timings, 0.50) * 1000,
+            "p95_ms": percentile(timings, 0.95) * 1000,
+            "mean_ms": statistics.fmean(timings) * 1000,
+            "throughput_per_s": repeat * items / total if total else None}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """ Возвращает пиковый объем резидентной памяти процесса в МБ (None, если недоступно). """
+    if isinstance(resource, type(None)):
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+# Тяжелые зависимости, которые не должны загружаться при импорте констант пакета
+HEAVY_MODULES = ("pandas", "numpy", "pydantic", "dependency_injector", "service_for_my_projects")
+# Каталог, из которого импортируется пакет tools
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Операторы, время выполнения которых замеряется в новом процессе: {название замера: оператор}
+IMPORT_STATEMENTS = {"import[constants]": "from tools import GROUPS_TOOL",
+                     "import[cutter]": "from tools import MillingCutter"}
+
+
+def measure_import(statement: str, repeat: int = 5) -> dict:
+    """ Выполняет statement в repeat новых процессах интерпретатора. Возвращает задержки (мс) и список загруженных
+    тяжелых зависимостей. """
+    code = (f"import sys, time\nstart = time.perf_counter()\n{statement}\n"
+            f"print(time.perf_counter() - start)\n"
+            f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    timings, loaded = [], ""
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=PACKAGE_ROOT).stdout
+        timing, loaded = output.splitlines()[-2:]
+        timings.append(float(timing))
+    return {"n": repeat,
+            "p50_ms": percentile(timings, 0.50) * 1000,
+            "p95_ms": percentile(timings, 0.95) * 1000,
+            "mean_ms": statistics.fmean(timings) * 1000,
+            "throughput_per_s": None,
+            "loaded_modules": [name for name in loaded.split(",") if name]}
+
+
+class InstrumentationProbe:
+    """ Методы без инструментирования и с инструментированием для замера накладных расходов instrumented. """
+    def debug(self, message: str) -> None:
+        pass
+
+    def plain(self, key: str) -> tuple:
+        return (key, )
+
+    @instrumented("query", "По ключу {kwargs} найдено записей: {count}")
+    def instrumented(self, key: str) -> tuple:
+        return (key, )
+
+
+def measure_instrumentation(repeat: int, calls: int = 10000) -> dict:
+    """ Замеряет calls вызовов метода без инструментирования и с инструментированием (отключенным, с сообщениями в
+    лог, со сбором значений). Настройки INSTRUMENTATION восстанавливаются после замера. """
+    probe = InstrumentationProbe()
+    enabled, messages = INSTRUMENTATION.enabled, INSTRUMENTATION.messages
+    modes = {"plain": (probe.plain, False, False), "disabled": (probe.instrumented, False, False),
+             "messages": (probe.instrumented, False, True), "enabled": (probe.instrumented, True, False)}
+    results = {}
+    try:
+        for mode, (method, mode_enabled, mode_messages) in modes.items():
+            INSTRUMENTATION.configure(enabled=mode_enabled, messages=mode_messages)
+            results[f"instrumentation[{mode}]"] = measure(lambda: [method(key="2300-0001") for _ in range(calls)],
+                                                          repeat, items=calls)
+    finally:
+        INSTRUMENTATION.configure(enabled=enabled, messages=messages)
+        INSTRUMENTATION.reset()
+    return results
+
+
+# Типы полей со словарями допустимых значений, проверка которых замеряется (строковые и числовые значения)
+FIELD_TYPES = (InAccuracyStandards, InToleranceField, InTypesOfMillingCutter)
+
+
+def measure_fields(container: ToolContainer, repeat: int, calls: int = 1000000) -> dict:
+    """ Замеряет calls проверок значений типов полей FIELD_TYPES, calls присваиваний полей допуска сверла (с
+    проверкой при присваивании) и calls присваиваний допуска целиком (например, 'H7'). Значения чередуются: все
+    строковые, затем все числовые. """
+    results = {}
+    for field_type in FIELD_TYPES:
+        values = list(field_type.AVAILABLE_VALUES) + list(field_type.KEYS_BY_VALUE)
+        inputs = (values * (calls // len(values) + 1))[:calls]
+        validate = field_type.validate
+        results[f"fields.validate[{field_type.__name__}]"] = measure(lambda: [validate(value) for value in inputs],
+                                                                    repeat, items=calls)
+    tool = container.drilling_cutter()
+    accuracies = list(InAccuracyStandards.AVAILABLE_VALUES) + list(InAccuracyStandards.KEYS_BY_VALUE)
+    fields = list(InToleranceField.AVAILABLE_VALUES) + list(InToleranceField.KEYS_BY_VALUE)
+    pairs = list(zip(accuracies * len(fields), fields * len(accuracies)))
+    pairs = (pairs * (calls // 2 // len(pairs) + 1))[:calls // 2]
+
+    def assign():
+        for accuracy, tolerance_field in pairs:
+            tool.accuracy = accuracy
+            tool.tolerance_field = tolerance_field
+
+    results["fields.assign[accuracy, tolerance_field]"] = measure(assign, repeat, items=len(pairs) * 2)
+    tolerances = (list(TOLERANCES) * (calls // len(TOLERANCES) + 1))[:calls]
+
+    def assign_tolerance():
+        for tolerance in tolerances:
+            tool.tolerance = tolerance
+
+    results["fields.assign[tolerance]"] = measure(assign_tolerance, repeat, items=calls)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(storage: str = "sql", repeat: int = 200, repeat_all: int = 3, field_calls: int = 1000000) -> dict:
+    container = ToolContainer()
+    container.config.tools.storage.from_value(storage)
+    # Кеш отключен, чтобы замерять поиск, а не попадания в кеш
+    container.config.cache.maxsize.from_value(0)
+    finder = container.finder()
+    creator = container.creator()
+    lister = container.lister()
+
+    groups = [group for group in GROUPS_TOOL if group in ToolDataPreparer.SCRIPTS]
+    marking, standard = DEFAULT_SETTINGS_FOR_TOOL["Сверло"]["marking"], DEFAULT_SETTINGS_FOR_TOOL["Сверло"]["Стандарт"]
+    results = {name: measure_import(statement) for name, statement in IMPORT_STATEMENTS.items()}
+    results.update(measure_instrumentation(max(repeat // 10, 5)))
+
+    results["finder.by_marking"] = measure(lambda: finder.by_marking(marking=marking), repeat)
+    results["finder.by_marking_and_stand"] = measure(
+        lambda: finder.by_marking_and_stand(marking=marking, standard=standard), repeat)
+    results["finder.by_stand"] = measure(lambda: finder.by_stand(standard=standard), repeat)
+    results["finder.by_type"] = measure(lambda: finder.by_type(type_tool="Резец"), repeat)
+    results["finder.by_dia_range"] = measure(lambda: finder.by_dia_range(40, 63, type_tool="Фреза"), repeat)
+    results["finder.by_nearest_dia"] = measure(lambda: finder.by_nearest_dia(10.3, type_tool="Сверло"), repeat)
+
+    for group in groups:
+        record = finder.by_group(group=group).iloc[0]
+        results[f"creator.create[{group}]"] = measure(lambda: creator.create(record), repeat)
+        tool = creator.create(record)
+        results[f"get_name[{group}]"] = measure(lambda: get_name(tool), repeat)
+
+    results.update(measure_fields(container, repeat_all, field_calls))
+
+    count = len(lister.all)
+    results["lister.all"] = measure(lambda: lister.all, repeat_all, items=count)
+
+    return {"revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": storage,
+            "results": results,
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def main(argv: Optional[list] = None) -> dict:
+    parser = argparse.ArgumentParser(description="Замеры производительности пакета tools")
+    parser.add_argument("--storage", choices=("sql", "snapshot", "columnar"), default="sql", help="Источник записей")
+    parser.add_argument("--repeat", type=int, default=200, help="Количество повторов точечных замеров")
+    parser.add_argument("--repeat-all", type=int, default=3, help="Количество повторов замера lister.all")
+    parser.add_argument("--field-calls", type=int, default=1000000,
+                        help="Количество проверок (присваиваний) значений полей в замерах fields")
+    parser.add_argument("--output", help="Файл для сохранения результатов в JSON")
+    parser.add_argument("--import-budget-ms", type=float,
+                        help="Допустимое время импорта констант пакета (при превышении или загрузке тяжелых "
+                             "зависимостей - код возврата 1)")
+    args = parser.parse_args(argv)
+
+    report = run(storage=args.storage, repeat=args.repeat, repeat_all=args.repeat_all, field_calls=args.field_calls)
+    for name, result in report["results"].items():
+        print(f"{name:40} p50 {result['p50_ms']:9.3f} мс  p95 {result['p95_ms']:9.3f} мс  "
+              f"{result['throughput_per_s'] or 0:12.1f} /с")
+    plain, disabled = report["results"]["instrumentation[plain]"], report["results"]["instrumentation[disabled]"]
+    print(f"Накладные расходы отключенного инструментирования: "
+          f"{(1 / disabled['throughput_per_s'] - 1 / plain['throughput_per_s']) * 1e9:.1f} нс на вызов")
+    print(f"Пиковый объем памяти: {report['peak_rss_mb']} МБ")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    if not isinstance(args.import_budget_ms, type(None)):
+        result = report["results"]["import[constants]"]
+        if result["p50_ms"] > args.import_budget_ms or result["loaded_modules"]:
+            parser.exit(1, f"Превышен бюджет импорта констант: {result['p50_ms']:.3f} мс "
+                           f"(допустимо {args.import_budget_ms} мс), загружены: {result['loaded_modules']}\n")
+    return report
+
+
+if __name__ == '__main__':
+    main()
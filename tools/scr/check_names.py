@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Проверка наименований инструментов по всем записям поставляемой БД tools/data/tools.db: наименования, определенные
+# при создании списка инструментов (get_names), сравниваются с эталонным файлом JSON ({index записи: наименование}),
+# сохраненным функцией get_name исходной версии пакета (tests/data/tool_names.json), и с наименованиями, которые дают
+# вспомогательные функции get_name_tool_with_* для каждого инструмента в отдельности.
+# Запуск: python -m tools.scr.check_names [--write names.json] [--golden names.json]
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+from tools.obj.containers import ToolContainer
+from tools.scr.fun import NAME_GETTERS
+
+PATH_GOLDEN_NAMES = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                 "tests", "data", "tool_names.json")
+
+
+def reference_name(tool) -> str:
+    """ Возвращает наименование копии инструмента tool, определенное вспомогательной функцией стандарта. """
+    tool = tool.model_copy()
+    tool.name = None
+    name_getter = NAME_GETTERS[tool.standard]
+    if not isinstance(name_getter, type(None)):
+        name_getter(tool)
+    return tool.name
+
+
+def create_tools(container: Optional[ToolContainer] = None) -> tuple:
+    """ Создает инструменты по всем записям БД. Возвращает индексы записей (строками) и список инструментов. """
+    container = ToolContainer() if isinstance(container, type(None)) else container
+    records = container.finder().all
+    tools = container.creator().create_many(records)
+    return [str(index) for index in records["index"]], tools
+
+
+def load_golden(path: str = PATH_GOLDEN_NAMES) -> dict:
+    """ Возвращает эталонные наименования {index записи: наименование} из файла JSON. """
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_names(names: dict, golden: dict) -> dict:
+    """ Возвращает расхождения наименований names с эталонными {index записи: (наименование, эталон)}, в том числе
+    для записей, отсутствующих в одном из словарей. """
+    return {index: (names.get(index), golden.get(index)) for index in {**golden, **names}
+            if names.get(index) != golden.get(index)}
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Проверка наименований инструментов")
+    parser.add_argument("--write", help="Сохранить наименования в эталонный файл JSON")
+    parser.add_argument("--golden", default=PATH_GOLDEN_NAMES, help="Сравнить наименования с эталонным файлом JSON")
+    args = parser.parse_args(argv)
+
+    indexes, tools = create_tools()
+    names = {index: getattr(tool, "name", None) for index, tool in zip(indexes, tools)}
+
+    differences = {}
+    for index, tool in zip(indexes, tools):
+        if not isinstance(tool, type(None)):
+            expected = reference_name(tool)
+            if names[index] != expected:
+                differences[index] = (names[index], expected)
+    if args.golden:
+        differences.update(compare_names(names, load_golden(args.golden)))
+    if args.write:
+        with open(args.write, "w", encoding="utf-8") as file:
+            json.dump(names, file, ensure_ascii=False, indent=0)
+
+    for index, (name, expected) in differences.items():
+        print(f"{index}: {name!r} != {expected!r}")
+    print(f"Проверено наименований: {len(names)}, расхождений: {len(differences)}")
+    return 1 if differences else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Выгружает таблицу инструментов в столбцовый снимок (массивы .npy и meta.json), который загружается процессами без
+# обращения к БД и без копирования массивов (ToolSnapshot.load, настройка контейнера tools.storage = "columnar").
+# Запуск: python -m tools.scr.export [путь к БД] [каталог снимка]
+import sys
+
+from tools.obj.constants import PATH_DB_FOR_TOOLS, PATH_SNAPSHOT_FOR_TOOLS
+from tools.obj.snapshots import ToolSnapshot
+
+
+def main(path: str = PATH_DB_FOR_TOOLS, output: str = PATH_SNAPSHOT_FOR_TOOLS, tablename: str = "tools") -> str:
+    snapshot = ToolSnapshot.export(path, output, tablename)
+    print(f"Выгружено записей: {len(snapshot)}, столбцов: {len(snapshot.columns)}, {snapshot.nbytes} байт: {output}")
+    return output
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -1,19 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 # -------------------------------------------------------------------------------
-import logging.config
-from typing import List
+import logging
+from types import MappingProxyType
+from typing import Iterable, List
 
 from service_for_my_projects.obj.exceptions import InvalidValue
 
 from tools.obj.entities import Tool
-from tools.logger_settings import config
+from tools.logger_settings import setup_logging
 
-import os.path
-if not os.path.exists("logs/"):
-    os.makedirs("logs/")
 
-logging.config.dictConfig(config)
+def get_logger() -> logging.Logger:
+    """Возвращает логгер наименований инструментов (логирование настраивается при первом обращении)"""
+    setup_logging()
+    return logging.getLogger("tool_names")
 
 
 def output_error_message(attr_names: List[str]):
@@ -22,7 +23,7 @@ def output_error_message(attr_names: List[str]):
         def wrapper(tool):
             for name in attr_names:
                 if isinstance(getattr(tool, name, None), type(None)):
-                    log = logging.getLogger("tool_names")
+                    log = get_logger()
                     log.error(f"Поле {name} класса {tool.__class__.__name__} ({tool.name}) не определено.")
             return func(tool)
         return wrapper
@@ -36,7 +37,7 @@ def output_info_message():
             try:
                 return func(tool)
             except TypeError:
-                log = logging.getLogger("tool_names")
+                log = get_logger()
                 log.info(f"Наименование инструмента {tool.name} принято по умолчанию")
         return wrapper
     return decorator
@@ -47,98 +48,41 @@ def get_name(tool: Tool) -> None:
 
     tool : Tool : Класс инструмента.
     """
-    name_getters = {
-        # Сверла
-        'ГОСТ 886-77': get_name_tool_with_accuracy,
-        'ГОСТ 2092-77': get_name_tool_with_accuracy,
-        'ГОСТ 4010-77': get_name_tool_with_accuracy,
-        'ГОСТ 8034-76': None,
-        'ГОСТ 10902-77': get_name_tool_with_accuracy,
-        'ГОСТ 10903-77': get_name_tool_with_accuracy,
-        'ГОСТ 12121-77': get_name_tool_with_accuracy,
-        'ГОСТ 12122-77': get_name_tool_with_accuracy,
-        'ГОСТ 14952-75': None,
-        'ГОСТ 17273-71': get_name_tool_with_material,
-        'ГОСТ 17274-71': get_name_tool_with_material,  # TODO: Т в наименовании
-        'ГОСТ 17275-71': get_name_tool_with_material,  # TODO: Т в наименовании
-        'ГОСТ 17276-71': get_name_tool_with_material,  # TODO: Т в наименовании
-        'ГОСТ 19543-74': None,
-        'ГОСТ 19544-74': None,
-        'ГОСТ 19545-74': None,
-        'ГОСТ 19546-74': None,
-        'ГОСТ 19547-74': None,
-        'ГОСТ 20694-75': None,
-        'ГОСТ 20695-75': None,
-        'ГОСТ 20696-75': None,
-        'ГОСТ 20697-75': None,
-        'ГОСТ 22735-77': get_name_tool_with_accuracy,
-        'ГОСТ 22736-77': get_name_tool_with_accuracy,
-        'ГОСТ 28319-89': None,
-        'ГОСТ 28320-89': None,
-        # Зенкеры
-        'ГОСТ 12489-71': get_name_tool_with_accuracy,
-        'ГОСТ 21584-76': None,
-        # Фрезы
-        'ГОСТ 1336-77': get_name_tool_with_accuracy,
-        'ГОСТ 3964-69': get_name_tool_with_accuracy,
-        'ГОСТ 5348-69': get_name_tool_with_material,
-        'ГОСТ 6396-78': get_name_tool_with_accuracy,
-        'ГОСТ 6469-69': get_name_tool_with_material,
-        'ГОСТ 6637-80': get_name_tool_with_accuracy_class_and_module,
-        'ГОСТ 7063-72': None,
-        'ГОСТ 8027-86': get_name_tool_with_accuracy_class,
-        'ГОСТ 8543-71': get_name_tool_with_accuracy,
-        'ГОСТ 9140-78': get_name_tool_with_accuracy,
-        'ГОСТ 9304-69': None,
-        'ГОСТ 9305-93': None,
-        'ГОСТ 9324-80': get_name_tool_with_accuracy_class,
-        'ГОСТ 9473-80': get_name_tool_with_material,
-        'ГОСТ 10331-81': get_name_tool_with_accuracy_class,
-        'ГОСТ 10673-75': None,
-        'ГОСТ 13838-68': get_name_tool_with_number,
-        'ГОСТ 15086-69': None,
-        'ГОСТ 15127-83': get_name_tool_with_accuracy_class,
-        'ГОСТ 16222-81': None,
-        'ГОСТ 16223-81': None,
-        'ГОСТ 16225-81': None,
-        'ГОСТ 16226-81': None,
-        'ГОСТ 16227-81': get_name_tool_with_accuracy,
-        'ГОСТ 16228-81': None,
-        'ГОСТ 16229-81': None,
-        'ГОСТ 16230-81': None,
-        'ГОСТ 16231-81': None,
-        'ГОСТ 16463-80': get_name_tool_with_accuracy,
-        'ГОСТ 18372-73': get_name_tool_with_material,
-        'ГОСТ 17026-71': None,
-        'ГОСТ 20533-75': None,
-        'ГОСТ 20534-75': None,
-        'ГОСТ 20535-75': None,
-        'ГОСТ 20538-75': None,
-        'ГОСТ 22088-76': None,
-        'ГОСТ 23248-78': None,
-        'ГОСТ 24359-80': None,
-        'ГОСТ 24637-81': None,
-        'ГОСТ 28527-90': get_name_tool_with_accuracy,
-        'ГОСТ 28709-90': None,
-        'ГОСТ 28719-90': None,
-        'ГОСТ Р 50181-92': None,
-        # Развертки
-        'ГОСТ 7722-77': get_name_tool_with_accuracy,
-        'ГОСТ 11179-71': None,
-        'ГОСТ 11180-71': None,
-        'ГОСТ 28321-89': None,
-        'ГОСТ 883-80': get_name_tool_with_accuracy,
-        # Резцы
-        'ГОСТ 10046-72': None,
-        'ГОСТ 18871-73': None,
-        'ГОСТ 18878-73': get_name_tool_with_material,
-        }
-    if tool.standard not in name_getters:
-        raise InvalidValue(f"Необходимо добавить вариант определения наименования инструмента для инструмента "
-                           f"{tool.group} {tool.standard}")
-    name_getter = name_getters[tool.standard]
-    if not isinstance(name_getter, type(None)):
-        name_getter(tool)
+    get_names([tool])
+
+
+def get_names(tools: Iterable[Tool]) -> None:
+    """ Определяет наименования инструментов tools в зависимости от ГОСТа. Инструменты группируются по шаблону
+    наименования (NAME_TEMPLATES), наименования каждой группы составляются одним проходом без декораторов
+    логирования. Результат совпадает с вызовом get_name для каждого инструмента.
+
+    tools : Iterable[Tool] : Инструменты.
+    """
+    by_template = {}
+    for tool in tools:
+        if tool.standard not in NAME_TEMPLATES:
+            raise InvalidValue(f"Необходимо добавить вариант определения наименования инструмента для инструмента "
+                               f"{tool.group} {tool.standard}")
+        fields = NAME_TEMPLATES[tool.standard]
+        if not isinstance(fields, type(None)):
+            by_template.setdefault(fields, []).append(tool)
+    for fields, group in by_template.items():
+        columns = [[getattr(tool, name, None) for tool in group] for name in fields]
+        for tool, values in zip(group, zip(*columns)):
+            parts = (tool.group, tool.marking, *values, tool.standard)
+            if all(isinstance(part, str) for part in parts):
+                tool.name = " ".join(parts)
+            else:
+                _log_default_name(tool, fields, values)
+
+
+def _log_default_name(tool: Tool, fields: tuple, values: tuple) -> None:
+    """ Логирует неопределенные поля и принятие наименования по умолчанию (как декораторы вспомогательных функций). """
+    log = get_logger()
+    for name, value in zip(fields, values):
+        if isinstance(value, type(None)):
+            log.error(f"Поле {name} класса {tool.__class__.__name__} ({tool.name}) не определено.")
+    log.info(f"Наименование инструмента {tool.name} принято по умолчанию")
 
 
 @output_info_message()
@@ -174,3 +118,103 @@ def get_name_tool_with_number(tool: Tool) -> None:
 def get_name_tool_with_accuracy_class_and_module(tool: Tool) -> None:
     """ Наименование состоит из наименования, обозначения, точности(опционально) и стандарта."""
     tool.name = " ".join([tool.group, tool.marking, tool.module, tool.accuracy_class, tool.standard])
+
+
+# Вспомогательные функции определения наименования по стандарту (None - наименование по умолчанию)
+NAME_GETTERS = {
+    # Сверла
+    'ГОСТ 886-77': get_name_tool_with_accuracy,
+    'ГОСТ 2092-77': get_name_tool_with_accuracy,
+    'ГОСТ 4010-77': get_name_tool_with_accuracy,
+    'ГОСТ 8034-76': None,
+    'ГОСТ 10902-77': get_name_tool_with_accuracy,
+    'ГОСТ 10903-77': get_name_tool_with_accuracy,
+    'ГОСТ 12121-77': get_name_tool_with_accuracy,
+    'ГОСТ 12122-77': get_name_tool_with_accuracy,
+    'ГОСТ 14952-75': None,
+    'ГОСТ 17273-71': get_name_tool_with_material,
+    'ГОСТ 17274-71': get_name_tool_with_material,  # TODO: Т в наименовании
+    'ГОСТ 17275-71': get_name_tool_with_material,  # TODO: Т в наименовании
+    'ГОСТ 17276-71': get_name_tool_with_material,  # TODO: Т в наименовании
+    'ГОСТ 19543-74': None,
+    'ГОСТ 19544-74': None,
+    'ГОСТ 19545-74': None,
+    'ГОСТ 19546-74': None,
+    'ГОСТ 19547-74': None,
+    'ГОСТ 20694-75': None,
+    'ГОСТ 20695-75': None,
+    'ГОСТ 20696-75': None,
+    'ГОСТ 20697-75': None,
+    'ГОСТ 22735-77': get_name_tool_with_accuracy,
+    'ГОСТ 22736-77': get_name_tool_with_accuracy,
+    'ГОСТ 28319-89': None,
+    'ГОСТ 28320-89': None,
+    # Зенкеры
+    'ГОСТ 12489-71': get_name_tool_with_accuracy,
+    'ГОСТ 21584-76': None,
+    # Фрезы
+    'ГОСТ 1336-77': get_name_tool_with_accuracy,
+    'ГОСТ 3964-69': get_name_tool_with_accuracy,
+    'ГОСТ 5348-69': get_name_tool_with_material,
+    'ГОСТ 6396-78': get_name_tool_with_accuracy,
+    'ГОСТ 6469-69': get_name_tool_with_material,
+    'ГОСТ 6637-80': get_name_tool_with_accuracy_class_and_module,
+    'ГОСТ 7063-72': None,
+    'ГОСТ 8027-86': get_name_tool_with_accuracy_class,
+    'ГОСТ 8543-71': get_name_tool_with_accuracy,
+    'ГОСТ 9140-78': get_name_tool_with_accuracy,
+    'ГОСТ 9304-69': None,
+    'ГОСТ 9305-93': None,
+    'ГОСТ 9324-80': get_name_tool_with_accuracy_class,
+    'ГОСТ 9473-80': get_name_tool_with_material,
+    'ГОСТ 10331-81': get_name_tool_with_accuracy_class,
+    'ГОСТ 10673-75': None,
+    'ГОСТ 13838-68': get_name_tool_with_number,
+    'ГОСТ 15086-69': None,
+    'ГОСТ 15127-83': get_name_tool_with_accuracy_class,
+    'ГОСТ 16222-81': None,
+    'ГОСТ 16223-81': None,
+    'ГОСТ 16225-81': None,
+    'ГОСТ 16226-81': None,
+    'ГОСТ 16227-81': get_name_tool_with_accuracy,
+    'ГОСТ 16228-81': None,
+    'ГОСТ 16229-81': None,
+    'ГОСТ 16230-81': None,
+    'ГОСТ 16231-81': None,
+    'ГОСТ 16463-80': get_name_tool_with_accuracy,
+    'ГОСТ 18372-73': get_name_tool_with_material,
+    'ГОСТ 17026-71': None,
+    'ГОСТ 20533-75': None,
+    'ГОСТ 20534-75': None,
+    'ГОСТ 20535-75': None,
+    'ГОСТ 20538-75': None,
+    'ГОСТ 22088-76': None,
+    'ГОСТ 23248-78': None,
+    'ГОСТ 24359-80': None,
+    'ГОСТ 24637-81': None,
+    'ГОСТ 28527-90': get_name_tool_with_accuracy,
+    'ГОСТ 28709-90': None,
+    'ГОСТ 28719-90': None,
+    'ГОСТ Р 50181-92': None,
+    # Развертки
+    'ГОСТ 7722-77': get_name_tool_with_accuracy,
+    'ГОСТ 11179-71': None,
+    'ГОСТ 11180-71': None,
+    'ГОСТ 28321-89': None,
+    'ГОСТ 883-80': get_name_tool_with_accuracy,
+    # Резцы
+    'ГОСТ 10046-72': None,
+    'ГОСТ 18871-73': None,
+    'ГОСТ 18878-73': get_name_tool_with_material,
+    }
+# Поля инструмента, добавляемые в наименование вспомогательной функцией (между обозначением и стандартом)
+NAME_FIELDS = {
+    get_name_tool_with_accuracy: ("tolerance", ),
+    get_name_tool_with_accuracy_class: ("accuracy_class", ),
+    get_name_tool_with_material: ("mat_of_cutting_part", ),
+    get_name_tool_with_number: ("cutter_number", ),
+    get_name_tool_with_accuracy_class_and_module: ("module", "accuracy_class"),
+}
+# Шаблоны наименований по стандартам: {стандарт: поля наименования или None - наименование по умолчанию}
+NAME_TEMPLATES = MappingProxyType({standard: None if isinstance(getter, type(None)) else NAME_FIELDS[getter]
+                                   for standard, getter in NAME_GETTERS.items()})
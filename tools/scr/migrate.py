@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Создает индексы таблицы инструментов, используемые ToolFinder.
+# Запуск: python -m tools.scr.migrate [путь к БД]
+import sqlite3
+import sys
+
+from tools.obj.constants import PATH_DB_FOR_TOOLS
+from tools.obj.requesters import create_indexes
+
+
+def main(path: str = PATH_DB_FOR_TOOLS, tablename: str = "tools") -> list:
+    connection = sqlite3.connect(path)
+    try:
+        created = create_indexes(connection, tablename)
+    finally:
+        connection.close()
+    print(f"Созданы индексы: {', '.join(created)}" if created else "Все индексы уже созданы")
+    return created
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
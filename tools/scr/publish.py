@@ -0,0 +1,29 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------------
+# Публикует таблицу инструментов в разделяемой памяти (SharedCatalog) и удерживает сегмент до завершения процесса
+# (Ctrl+C, SIGTERM). Процессы-исполнители подключаются к сегменту настройкой контейнера tools.storage = "shared"
+# (имя сегмента - tools.shared_name).
+# Запуск: python -m tools.scr.publish [путь к БД] [имя сегмента]
+import signal
+import sys
+import time
+
+from tools.obj.constants import PATH_DB_FOR_TOOLS
+from tools.obj.shared import SharedCatalog
+from tools.obj.snapshots import ToolSnapshot
+
+
+def main(path: str = PATH_DB_FOR_TOOLS, name: str = "tools_catalog", tablename: str = "tools") -> None:
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with SharedCatalog.create(ToolSnapshot.from_database(path, tablename), name) as catalog:
+        print(f"Опубликован снимок таблицы {tablename} в разделяемой памяти {catalog.name}: {catalog.size} байт")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])